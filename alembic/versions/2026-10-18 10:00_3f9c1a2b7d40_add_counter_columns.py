@@ -0,0 +1,78 @@
+"""add counter columns
+
+Revision ID: 3f9c1a2b7d40
+Revises:
+Create Date: 2026-10-18 10:00:00.000000
+
+First revision: it expects the tables created so far by
+``Base.metadata.create_all`` to exist already. Databases created from the
+models while workers still ran ``create_all`` at boot may already have
+some of the columns; those are skipped and every counter is recomputed.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9c1a2b7d40'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+COUNTERS = (
+    ('Users', 'courses_count'),
+    ('Users', 'followers_count'),
+    ('Users', 'following_count'),
+    ('Courses', 'subscribers_count'),
+)
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for table, column in COUNTERS:
+        if column in {c['name'] for c in inspector.get_columns(table)}:
+            continue
+        op.add_column(
+            table,
+            sa.Column(column, sa.Integer(), nullable=False, server_default='0'),
+        )
+    op.execute(
+        '''
+        UPDATE "Users" SET courses_count = c.total
+        FROM (SELECT user_id, count(*) AS total FROM "Courses" GROUP BY user_id) c
+        WHERE "Users".id = c.user_id
+        '''
+    )
+    op.execute(
+        '''
+        UPDATE "Users" SET followers_count = c.total
+        FROM (
+            SELECT following_id, count(*) AS total
+            FROM user_following GROUP BY following_id
+        ) c
+        WHERE "Users".id = c.following_id
+        '''
+    )
+    op.execute(
+        '''
+        UPDATE "Users" SET following_count = c.total
+        FROM (SELECT user_id, count(*) AS total FROM user_following GROUP BY user_id) c
+        WHERE "Users".id = c.user_id
+        '''
+    )
+    op.execute(
+        '''
+        UPDATE "Courses" SET subscribers_count = c.total
+        FROM (
+            SELECT "Course_id", count(*) AS total
+            FROM "user-courses" GROUP BY "Course_id"
+        ) c
+        WHERE "Courses".id = c."Course_id"
+        '''
+    )
+
+
+def downgrade():
+    for table, column in reversed(COUNTERS):
+        op.drop_column(table, column)
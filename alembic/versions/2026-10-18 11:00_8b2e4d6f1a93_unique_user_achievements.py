@@ -0,0 +1,36 @@
+"""unique user achievements
+
+Revision ID: 8b2e4d6f1a93
+Revises: 3f9c1a2b7d40
+Create Date: 2026-10-18 11:00:00.000000
+
+Grants used to be appended without a check, so duplicates are removed
+before the constraint that ON CONFLICT DO NOTHING relies on is added.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2e4d6f1a93'
+down_revision = '3f9c1a2b7d40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        '''
+        DELETE FROM "user-achievements" a
+        USING "user-achievements" b
+        WHERE a.ctid < b.ctid
+          AND a."User_id" = b."User_id"
+          AND a."Achievement_id" = b."Achievement_id"
+        '''
+    )
+    op.create_unique_constraint(
+        'uq_user_achievements', 'user-achievements', ['User_id', 'Achievement_id']
+    )
+
+
+def downgrade():
+    op.drop_constraint('uq_user_achievements', 'user-achievements', type_='unique')
@@ -0,0 +1,44 @@
+"""lower login indexes
+
+Revision ID: c41d7e2a9f05
+Revises: 8b2e4d6f1a93
+Create Date: 2026-10-18 12:00:00.000000
+
+Login looks users up by lower(username) or lower(email). The indexes are
+built CONCURRENTLY so the Users table stays writable during the deploy.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41d7e2a9f05'
+down_revision = '8b2e4d6f1a93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_Users_lower_username',
+            'Users',
+            [sa.text('lower(username)')],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_Users_lower_email',
+            'Users',
+            [sa.text('lower(email)')],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_Users_lower_email', table_name='Users', postgresql_concurrently=True
+        )
+        op.drop_index(
+            'ix_Users_lower_username', table_name='Users', postgresql_concurrently=True
+        )
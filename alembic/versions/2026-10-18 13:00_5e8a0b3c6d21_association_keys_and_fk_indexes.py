@@ -0,0 +1,110 @@
+"""association keys and fk indexes
+
+Revision ID: 5e8a0b3c6d21
+Revises: c41d7e2a9f05
+Create Date: 2026-10-18 13:00:00.000000
+
+Association tables get a composite primary key (after dropping NULL and
+duplicate rows) plus an index on the reverse column. Foreign-key columns
+and the listed-courses partial indexes are built CONCURRENTLY.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e8a0b3c6d21'
+down_revision = 'c41d7e2a9f05'
+branch_labels = None
+depends_on = None
+
+ASSOCIATIONS = [
+    ('user-courses', 'User_id', 'Course_id'),
+    ('user-courses-graduated', 'User_id', 'Course_id'),
+    ('user-achievements', 'User_id', 'Achievement_id'),
+    ('course-tags', 'Course_id', 'Tag_id'),
+    ('lessons-tags', 'Lesson_id', 'Tag_id'),
+]
+
+FOREIGN_KEYS = [
+    ('Lessons', 'course_id'),
+    ('Homework', 'lesson_id'),
+    ('Contents', 'lesson_id'),
+    ('Files', 'homework_id'),
+    ('Files', 'course_id'),
+    ('Files', 'user'),
+    ('Files', 'achievement_id'),
+    ('Files', 'content_id'),
+    ('Avatars', 'course_id'),
+    ('Avatars', 'user_id'),
+    ('Avatars', 'achievement_id'),
+    ('Courses', 'user_id'),
+    ('Courses', 'category'),
+]
+
+LISTED_COURSES = sa.text('is_deleted = false AND is_visible = true')
+
+
+def upgrade():
+    for table, left, right in ASSOCIATIONS:
+        op.execute(
+            f'''
+            DELETE FROM "{table}"
+            WHERE "{left}" IS NULL OR "{right}" IS NULL
+            '''
+        )
+        op.execute(
+            f'''
+            DELETE FROM "{table}" a
+            USING "{table}" b
+            WHERE a.ctid < b.ctid
+              AND a."{left}" = b."{left}"
+              AND a."{right}" = b."{right}"
+            '''
+        )
+        op.create_primary_key(f'{table}_pkey', table, [left, right])
+    op.drop_constraint('uq_user_achievements', 'user-achievements', type_='unique')
+
+    with op.get_context().autocommit_block():
+        for table, _, right in ASSOCIATIONS:
+            op.create_index(
+                f'ix_{table}_{right}', table, [right], postgresql_concurrently=True
+            )
+        for table, column in FOREIGN_KEYS:
+            op.create_index(
+                f'ix_{table}_{column}', table, [column], postgresql_concurrently=True
+            )
+        op.create_index(
+            'ix_Courses_listed_created_at',
+            'Courses',
+            [sa.text('created_at DESC'), sa.text('id DESC')],
+            postgresql_where=LISTED_COURSES,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_Courses_listed_title',
+            'Courses',
+            [sa.text('title varchar_pattern_ops')],
+            postgresql_where=LISTED_COURSES,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name in ('ix_Courses_listed_title', 'ix_Courses_listed_created_at'):
+            op.drop_index(name, table_name='Courses', postgresql_concurrently=True)
+        for table, column in FOREIGN_KEYS:
+            op.drop_index(
+                f'ix_{table}_{column}', table_name=table, postgresql_concurrently=True
+            )
+        for table, _, right in ASSOCIATIONS:
+            op.drop_index(
+                f'ix_{table}_{right}', table_name=table, postgresql_concurrently=True
+            )
+
+    op.create_unique_constraint(
+        'uq_user_achievements', 'user-achievements', ['User_id', 'Achievement_id']
+    )
+    for table, _, _ in ASSOCIATIONS:
+        op.drop_constraint(f'{table}_pkey', table, type_='primary')
@@ -0,0 +1,57 @@
+"""notification outbox
+
+Revision ID: 9d3f6a1c2b84
+Revises: 5e8a0b3c6d21
+Create Date: 2026-10-18 14:00:00.000000
+
+Workers created this table with create_all while they still ran it on
+startup, so it is only created where it is missing.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d3f6a1c2b84'
+down_revision = '5e8a0b3c6d21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table('NotificationOutbox'):
+        return
+    op.create_table(
+        'NotificationOutbox',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=50), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column(
+            'next_attempt_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column(
+            'created_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_NotificationOutbox_id', 'NotificationOutbox', ['id'], unique=False
+    )
+    op.create_index(
+        'ix_NotificationOutbox_status', 'NotificationOutbox', ['status'], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index('ix_NotificationOutbox_status', table_name='NotificationOutbox')
+    op.drop_index('ix_NotificationOutbox_id', table_name='NotificationOutbox')
+    op.drop_table('NotificationOutbox')
@@ -0,0 +1,41 @@
+"""courses created_at not null
+
+Revision ID: e27b5c9a4f18
+Revises: 9d3f6a1c2b84
+Create Date: 2026-10-18 15:00:00.000000
+
+The course listing pages by (created_at, id); rows without a creation time
+are backfilled with the epoch so they stay at the end of the listing.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e27b5c9a4f18'
+down_revision = '9d3f6a1c2b84'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        'UPDATE "Courses" SET created_at = to_timestamp(0) WHERE created_at IS NULL'
+    )
+    op.alter_column(
+        'Courses',
+        'created_at',
+        existing_type=sa.DateTime(timezone=True),
+        existing_server_default=sa.text('now()'),
+        nullable=False,
+    )
+
+
+def downgrade():
+    op.alter_column(
+        'Courses',
+        'created_at',
+        existing_type=sa.DateTime(timezone=True),
+        existing_server_default=sa.text('now()'),
+        nullable=True,
+    )
@@ -2,6 +2,7 @@ from sqlalchemy import update, desc, delete, insert
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 from app.achievements.models import Achievement
+from app.achievements.engine import achievement_engine
 from app.users.models import User, user_achievements_association
 from app.database import async_session as session
 import app.achievements.schemas as schemas
@@ -58,6 +59,7 @@ class AchievementDAL:
         )
         self.db_session.add(new_achievement)
         await self.db_session.flush()
+        achievement_engine.invalidate()
         return new_achievement
 
     async def update_achievement(self, achievement_id: int, updated_values):
@@ -65,10 +67,20 @@ class AchievementDAL:
         q = q.values(updated_values)
         q.execution_options(synchronize_session="fetch")
         await self.db_session.execute(q)
+        achievement_engine.invalidate()
+
+    async def get_achievement_user_ids(self, achievement_id: int):
+        q = await self.db_session.execute(
+            select(user_achievements_association.c.User_id).filter_by(
+                Achievement_id=achievement_id
+            )
+        )
+        return q.scalars().all()
 
     async def delete_achievement(self, achievement_id: int):
         q = delete(Achievement).where(Achievement.id == achievement_id)
         await self.db_session.execute(q)
+        achievement_engine.invalidate()
 
     async def achievement_exists(self, user_id, achievement_id: int):
         q = await self.db_session.execute(
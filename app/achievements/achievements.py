@@ -11,7 +11,7 @@ from starlette.responses import Response
 from . import models, schemas
 from app.auth.auth import fastapi_users
 from app.pagination import CustomPage as Page
-from elastic import es
+from app.search.indexer import search_indexer
 
 from app.achievements.achievement_dal import AchievementDAL
 from app.achievements.dependencies import get_achievement_dal
@@ -48,17 +48,9 @@ async def create_achievement(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"message": "Такое достижение уже существует"},
         )
-    try:
-        doc = {
-            "title": new_achievement.title,
-            "description": new_achievement.description,
-        }
-        await es.index("achievements", id=new_achievement.id, body=doc)
-    except Exception as e:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"message": f"Ошибка в апдейте elastic search: {e}"},
-        )
+    search_indexer.enqueue_on_commit(
+        achievement_dal.db_session, "achievements", new_achievement.id
+    )
     return new_achievement
 
 
@@ -85,14 +77,9 @@ async def update_achievement(
     await achievement_dal.update_achievement(
         achievement_id, request.dict(exclude_unset=True)
     )
-    try:
-        doc = {"title": achievement.title, "description": achievement.description}
-        await es.index("achievements", id=achievement_id, body=doc)
-    except Exception as e:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"message": f"Ошибка в апдейте elastic search: {e}"},
-        )
+    search_indexer.enqueue_on_commit(
+        achievement_dal.db_session, "achievements", achievement_id
+    )
     return achievement
 
 
@@ -110,29 +97,12 @@ async def delete_achievement(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"message": "Достижение не найдено"},
         )
+    user_ids = await achievement_dal.get_achievement_user_ids(achievement_id)
     await achievement_dal.delete_achievement(achievement_id)
-    try:
-        await es.delete(index="achievements", id=achievement_id)
-    except Exception as e:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"message": f"Ошибка в апдейте elastic search: {e}"},
-        )
-    try:
-        doc = {
-            "script": {
-                "source": "if (ctx._source.achievements.contains(params.achievement)) { ctx._source.achievements.remove(ctx._source.achievements.indexOf(achievement.tag)) }",
-                "lang": "painless",
-                "params": {"achievement": achievement_id},
-            },
-            "query": {"match": {"achievements": achievement_id}},
-        }
-        await es.update_by_query("users", body=doc)
-    except Exception as e:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"message": f"Ошибка в апдейте elastic search: {e}"},
-        )
+    search_indexer.enqueue_on_commit(
+        achievement_dal.db_session, "achievements", achievement_id
+    )
+    search_indexer.enqueue_on_commit(achievement_dal.db_session, "users", *user_ids)
     return Response(status_code=204)
 
 
@@ -142,29 +112,6 @@ async def bound_or_unbound_user_achievement(
     user: fastapi_model.BaseUserDB = Depends(fastapi_users.current_user()),
     achievement_dal: AchievementDAL = Depends(get_achievement_dal),
 ):
-    checker = await achievement_dal.achievement(user.id, request.achievements_id)
-    try:
-        if checker:
-            body_script = {
-                "script": {
-                    "source": "ctx._source.achievements.add(params.achievement)",
-                    "lang": "painless",
-                    "params": {"achievement": request.achievements_id},
-                }
-            }
-        else:
-            body_script = {
-                "script": {
-                    "source": "if (ctx._source.achievements.contains(params.achievement)) { ctx._source.achievements.remove(ctx._source.achievements.indexOf(params.achievement)) }",
-                    "lang": "painless",
-                    "params": {"achievement": request.achievements_id},
-                }
-            }
-
-        await es.update("users", id=user.id, body=body_script)
-    except Exception as e:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"message": f"Ошибка в апдейте elastic search: {e}"},
-        )
+    await achievement_dal.achievement(user.id, request.achievements_id)
+    search_indexer.enqueue_on_commit(achievement_dal.db_session, "users", user.id)
     return JSONResponse(content={"message": "ОК"})
@@ -0,0 +1,190 @@
+"""Threshold achievements granted from counters.
+
+Rules are declared once in ``RULES``. Every event that can move a counter
+calls ``achievement_engine.evaluate`` with the counters it touched; the
+engine reads them with one aggregate query per counter, or takes a value
+the caller already has. It then grants every reached achievement with a
+single ``INSERT ... ON CONFLICT DO NOTHING``, so re-evaluating a user is
+idempotent and never loads collections.
+
+Usage (re-evaluate every user)::
+
+    python -m app.achievements.engine
+"""
+import asyncio
+import logging
+import time
+from collections import defaultdict
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.future import select
+
+from app.achievements.models import Achievement
+from app.config import ACHIEVEMENT_TITLES_TTL
+from app.courses.models import Course
+from app.database import async_session
+from app.file.models import File
+from app.search.indexer import search_indexer
+from app.users.models import User, user_achievements_association
+
+logger = logging.getLogger(__name__)
+
+
+class ThresholdRule:
+    def __init__(self, counter: str, threshold: int, title: str):
+        self.counter = counter
+        self.threshold = threshold
+        self.title = title
+
+
+RULES = [
+    ThresholdRule("students", 100, '100 студентов на курсах'),
+    ThresholdRule("students", 1000, '1000 студентов на курсах'),
+    ThresholdRule("students", 10000, '10000 студентов на курсах'),
+    ThresholdRule("followers", 1000, '1000 подписчиков'),
+    ThresholdRule("followers", 10000, '10000 подписчиков'),
+    ThresholdRule("followers", 100000, '100000 подписчиков'),
+    ThresholdRule("videos", 1, '1 обучающий ролик'),
+    ThresholdRule("videos", 10, '10 обучающих роликов'),
+    ThresholdRule("videos", 100, '100 обучающих роликов'),
+    ThresholdRule("comments", 1000, '1000 комментариев'),
+    ThresholdRule("comments", 10000, '10000 комментариев'),
+    ThresholdRule("comments", 100000, '100000 комментариев'),
+]
+
+
+async def read_students(db_session, user_ids):
+    q = await db_session.execute(
+        select(Course.user_id, func.sum(Course.subscribers_count))
+        .filter(Course.user_id.in_(user_ids))
+        .group_by(Course.user_id)
+    )
+    return dict(q.all())
+
+
+async def read_followers(db_session, user_ids):
+    q = await db_session.execute(
+        select(User.id, User.followers_count).filter(User.id.in_(user_ids))
+    )
+    return dict(q.all())
+
+
+async def read_videos(db_session, user_ids):
+    q = await db_session.execute(
+        select(File.user, func.count())
+        .filter(File.user.in_(user_ids), File.type == "video")
+        .group_by(File.user)
+    )
+    return dict(q.all())
+
+
+# Comments are counted by another service, which reports the value itself.
+READERS = {
+    "students": read_students,
+    "followers": read_followers,
+    "videos": read_videos,
+}
+
+
+class AchievementEngine:
+    def __init__(self, rules, readers, titles_ttl: float):
+        self.rules = rules
+        self.readers = readers
+        self.titles_ttl = titles_ttl
+        self._titles = {}
+        self._titles_loaded_at = 0.0
+
+    def invalidate(self):
+        self._titles = {}
+        self._titles_loaded_at = 0.0
+
+    async def achievement_ids(self, db_session):
+        """Title -> id of every achievement, cached for ``titles_ttl``."""
+        if time.monotonic() - self._titles_loaded_at > self.titles_ttl:
+            q = await db_session.execute(select(Achievement.title, Achievement.id))
+            self._titles = dict(q.all())
+            self._titles_loaded_at = time.monotonic()
+        return self._titles
+
+    async def evaluate_many(self, db_session, user_ids, counters, known=None):
+        """Grant what ``user_ids`` reached on ``counters``.
+
+        ``known`` maps a counter name to ``{user_id: value}`` for values the
+        caller already has. Returns the newly granted
+        ``(user_id, achievement_id)`` pairs.
+        """
+        user_ids = list(user_ids)
+        if not user_ids:
+            return []
+        known = known or {}
+        values = {}
+        for counter in counters:
+            if counter in known:
+                values[counter] = known[counter]
+            else:
+                values[counter] = await self.readers[counter](db_session, user_ids)
+
+        reached = defaultdict(set)
+        for rule in self.rules:
+            if rule.counter not in values:
+                continue
+            for user_id, value in values[rule.counter].items():
+                if (value or 0) >= rule.threshold:
+                    reached[user_id].add(rule.title)
+        if not reached:
+            return []
+
+        ids = await self.achievement_ids(db_session)
+        rows = []
+        for user_id, titles in reached.items():
+            for title in titles:
+                if title in ids:
+                    rows.append({"User_id": user_id, "Achievement_id": ids[title]})
+                else:
+                    logger.warning("Achievement %r does not exist", title)
+        if not rows:
+            return []
+        table = user_achievements_association
+        q = await db_session.execute(
+            pg_insert(table)
+            .values(rows)
+            .on_conflict_do_nothing()
+            .returning(table.c.User_id, table.c.Achievement_id)
+        )
+        granted = q.all()
+        if granted:
+            search_indexer.enqueue_on_commit(
+                db_session, "users", *{user_id for user_id, _ in granted}
+            )
+        return granted
+
+    async def evaluate(self, db_session, user_id, *counters, **known_values):
+        """Evaluate one user; counters passed as keywords are taken as is."""
+        known = {name: {user_id: value} for name, value in known_values.items()}
+        return await self.evaluate_many(
+            db_session, [user_id], [*counters, *known], known
+        )
+
+
+achievement_engine = AchievementEngine(RULES, READERS, ACHIEVEMENT_TITLES_TTL)
+
+
+async def evaluate_all(batch_size: int = 1000):
+    counters = list(READERS)
+    granted = 0
+    async with async_session() as stream_session:
+        result = await stream_session.stream(select(User.id).order_by(User.id))
+        async for user_ids in result.scalars().partitions(batch_size):
+            async with async_session() as session:
+                async with session.begin():
+                    granted += len(
+                        await achievement_engine.evaluate_many(
+                            session, user_ids, counters
+                        )
+                    )
+    return granted
+
+
+if __name__ == "__main__":
+    print(asyncio.run(evaluate_all()))
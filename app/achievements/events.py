@@ -0,0 +1,63 @@
+import asyncio
+import logging
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import ACHIEVEMENT_STREAM, ACHIEVEMENT_STREAM_MAXLEN
+from redis_conf.redis import redis_cache
+
+logger = logging.getLogger(__name__)
+
+_SESSION_KEY = "achievement_events"
+
+
+class AchievementEvents:
+    """Publishes "counter moved" events to a Redis stream.
+
+    Handlers call ``publish_on_commit``; the events are sent once the
+    session commits, so the worker never evaluates counters the request
+    has not committed yet. Events lost to a Redis outage are recovered by
+    ``python -m app.achievements.engine``.
+    """
+
+    def __init__(self, cache, stream: str, maxlen: int):
+        self.cache = cache
+        self.stream = stream
+        self.maxlen = maxlen
+        self._tasks = set()
+
+    def publish_on_commit(self, db_session, user_id, counter: str, value=None):
+        fields = {"user_id": str(user_id), "counter": counter}
+        if value is not None:
+            fields["value"] = str(value)
+        db_session.sync_session.info.setdefault(_SESSION_KEY, []).append(fields)
+
+    async def publish(self, events):
+        try:
+            for fields in events:
+                await self.cache.xadd(self.stream, fields, maxlen=self.maxlen)
+        except Exception as e:
+            logger.warning("Publishing achievement events failed: %s", e)
+
+    def _schedule(self, events):
+        task = asyncio.get_running_loop().create_task(self.publish(events))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+achievement_events = AchievementEvents(
+    redis_cache, ACHIEVEMENT_STREAM, ACHIEVEMENT_STREAM_MAXLEN
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session):
+    events = session.info.pop(_SESSION_KEY, None)
+    if events:
+        achievement_events._schedule(events)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop(_SESSION_KEY, None)
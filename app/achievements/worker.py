@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+from collections import defaultdict
+
+from app.achievements.engine import achievement_engine
+from app.config import (
+    ACHIEVEMENT_BATCH_SIZE,
+    ACHIEVEMENT_BLOCK_MS,
+    ACHIEVEMENT_CLAIM_IDLE_MS,
+    ACHIEVEMENT_MAX_DELIVERIES,
+    ACHIEVEMENT_STREAM,
+    ACHIEVEMENT_STREAM_GROUP,
+)
+from app.database import async_session
+from redis_conf.redis import redis_cache
+
+logger = logging.getLogger(__name__)
+
+
+def _text(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class AchievementWorker:
+    """Consumes achievement events from a Redis stream consumer group.
+
+    Each read takes up to ``batch_size`` events, merges them per counter and
+    evaluates all affected users with one ``evaluate_many`` call per
+    counter, so a burst of subscriptions to one author costs one grant
+    query. Events are acknowledged only after the transaction commits.
+    Events left pending by a crashed consumer are claimed after
+    ``claim_idle_ms``; after ``max_deliveries`` attempts they are dropped.
+    """
+
+    def __init__(
+        self,
+        cache,
+        stream: str,
+        group: str,
+        batch_size: int,
+        block_ms: int,
+        claim_idle_ms: int,
+        max_deliveries: int,
+    ):
+        self.cache = cache
+        self.stream = stream
+        self.group = group
+        self.consumer = f"{socket.gethostname()}-{os.getpid()}"
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.claim_idle_ms = claim_idle_ms
+        self.max_deliveries = max_deliveries
+        self._task = None
+        self._last_claim = 0.0
+
+    async def _ensure_group(self):
+        try:
+            await self.cache.xgroup_create(
+                self.stream, self.group, id="0", mkstream=True
+            )
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    @staticmethod
+    def _merge(entries):
+        """Group events as ``{counter: {user_id: value or None}}``."""
+        counters = defaultdict(dict)
+        for _, fields in entries:
+            fields = {_text(k): _text(v) for k, v in fields.items()}
+            users = counters[fields["counter"]]
+            value = int(fields["value"]) if "value" in fields else None
+            previous = users.get(fields["user_id"])
+            if value is None or previous is None:
+                users.setdefault(fields["user_id"], value)
+            else:
+                users[fields["user_id"]] = max(previous, value)
+        return counters
+
+    async def process(self, entries):
+        if not entries:
+            return 0
+        granted = 0
+        async with async_session() as session:
+            async with session.begin():
+                for counter, users in self._merge(entries).items():
+                    known = {}
+                    values = {u: v for u, v in users.items() if v is not None}
+                    if len(values) == len(users):
+                        known[counter] = values
+                    granted += len(
+                        await achievement_engine.evaluate_many(
+                            session, list(users), [counter], known
+                        )
+                    )
+        await self.cache.xack(
+            self.stream, self.group, *(entry_id for entry_id, _ in entries)
+        )
+        return granted
+
+    async def claim_stale(self):
+        pending = await self.cache.xpending_range(
+            self.stream, self.group, "-", "+", self.batch_size
+        )
+        stale, dead = [], []
+        for item in pending:
+            if item["time_since_delivered"] < self.claim_idle_ms:
+                continue
+            if item["times_delivered"] >= self.max_deliveries:
+                dead.append(item["message_id"])
+            else:
+                stale.append(item["message_id"])
+        if dead:
+            logger.error("Dropping %s undeliverable achievement events", len(dead))
+            await self.cache.xack(self.stream, self.group, *dead)
+        if stale:
+            entries = await self.cache.xclaim(
+                self.stream, self.group, self.consumer, self.claim_idle_ms, stale
+            )
+            await self.process(entries)
+
+    async def _run(self):
+        await self._ensure_group()
+        while True:
+            try:
+                if time.monotonic() - self._last_claim >= self.claim_idle_ms / 1000:
+                    self._last_claim = time.monotonic()
+                    await self.claim_stale()
+                response = await self.cache.xreadgroup(
+                    self.group,
+                    self.consumer,
+                    {self.stream: ">"},
+                    count=self.batch_size,
+                    block=self.block_ms,
+                )
+                for _, entries in response or ():
+                    await self.process(entries)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Achievement worker pass failed")
+                await asyncio.sleep(self.block_ms / 1000)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+achievement_worker = AchievementWorker(
+    redis_cache,
+    ACHIEVEMENT_STREAM,
+    ACHIEVEMENT_STREAM_GROUP,
+    batch_size=ACHIEVEMENT_BATCH_SIZE,
+    block_ms=ACHIEVEMENT_BLOCK_MS,
+    claim_idle_ms=ACHIEVEMENT_CLAIM_IDLE_MS,
+    max_deliveries=ACHIEVEMENT_MAX_DELIVERIES,
+)
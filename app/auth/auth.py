@@ -1,30 +1,31 @@
 from typing import Any, Dict
 
-import databases
-from fastapi import Request, status
-from fastapi.responses import JSONResponse
+from fastapi import Request
 from fastapi_users import FastAPIUsers
 from fastapi_users.authentication import JWTAuthentication
 
-from app.config import SECRET, SQLALCHEMY_DATABASE_URL_USERS
+from app.config import SECRET
+from app.database import async_session
 from app.auth.fastapi_users_changed import (
-    OverridenSQLAlchemyUserDatabase,
     get_auth_router,
     get_register_router,
     get_users_router,
     get_verify_router,
     get_verify_token,
 )
+from app.auth.principal_cache import principal_cache
+from app.auth.user_database import AsyncSQLAlchemyUserDatabase
 from app.helper_functions import validate_password
 from app.users import models, schemas
-from elastic import es
+from app.search.indexer import search_indexer
 from redis_conf.redis import redis_cache
 from app.email.send_emails import send_register_mail
 
 
 users = models.User.__table__
-database = databases.Database(SQLALCHEMY_DATABASE_URL_USERS)
-user_db = OverridenSQLAlchemyUserDatabase(schemas.UserDB, database, users)
+user_db = AsyncSQLAlchemyUserDatabase(
+    schemas.UserDB, async_session, users, cache=principal_cache
+)
 
 
 jwt_authentication = JWTAuthentication(
@@ -48,20 +49,7 @@ async def on_after_register(user: schemas.UserDB, request: Request):
     )
     await send_register_mail(user.email, token)
     # ElasticSearch
-    try:
-        doc = {
-            "username": user.username,
-            "email": user.email,
-            "first_name": user.first_name,
-            "last_name": user.last_name,
-            "achievements": [],
-        }
-        await es.index(index="users", id=user.id, body=doc)
-    except Exception as e:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"message": f"Ошибка в апдейте elastic search: {e}"},
-        )
+    search_indexer.enqueue("users", user.id)
     # Redis
     cache_info = {"posts_count": 0, "followers_count": 0, "following_count": 0}
     await redis_cache.hset(f"user:{user.id}", cache_info)
@@ -74,23 +62,7 @@ async def on_after_forgot_password(user: schemas.UserDB, token: str, request: Re
 async def on_after_update(
     user: schemas.UserDB, update_dict: Dict[str, Any], request: Request
 ):
-    try:
-        doc_updated = {
-            {
-                "doc": {
-                    "username": user.username,
-                    "email": user.email,
-                    "first_name": user.first_name,
-                    "last_name": user.last_name,
-                }
-            }
-        }
-        await es.update(index="users", id=user.id, body=doc_updated)
-    except Exception as e:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"message": f"Ошибка в апдейте elastic search: {e}"},
-        )
+    search_indexer.enqueue("users", user.id)
 
 
 def setup_users(app):
@@ -140,11 +112,3 @@ def setup_users(app):
         prefix="/core/profile",
         tags=["Profile"],
     )
-
-    @app.on_event("startup")
-    async def startup():
-        await database.connect()
-
-    @app.on_event("shutdown")
-    async def shutdown():
-        await database.disconnect()
@@ -0,0 +1,97 @@
+"""Login lookup latency as the user table grows.
+
+Builds a temporary copy of the relevant ``Users`` columns, grows it to
+each requested size and times ``login_query`` against random existing
+usernames and emails. With the ``lower()`` indexes the median stays flat
+from thousands to millions of rows; ``--no-index`` shows the sequential
+scan it replaces.
+
+    python -m app.auth.benchmark_login --sizes 10000 100000 1000000
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from sqlalchemy import Column, Index, Integer, MetaData, String, Table, func, text
+
+from app.auth.user_database import login_query
+from app.database import engine
+
+metadata = MetaData()
+bench_users = Table(
+    'bench_users',
+    metadata,
+    Column('id', Integer, primary_key=True),
+    Column('username', String(50), nullable=False),
+    Column('email', String(50), nullable=False),
+    prefixes=['TEMPORARY'],
+)
+bench_indexes = [
+    Index('ix_bench_users_lower_username', func.lower(bench_users.c.username)),
+    Index('ix_bench_users_lower_email', func.lower(bench_users.c.email)),
+]
+
+GROW = text(
+    '''
+    INSERT INTO bench_users (id, username, email)
+    SELECT g, 'User' || g, 'User' || g || '@example.com'
+    FROM generate_series(:start, :stop) g
+    '''
+)
+
+
+def lookup_value(size: int) -> str:
+    n = random.randint(1, size)
+    return f"user{n}" if random.random() < 0.5 else f"USER{n}@example.com"
+
+
+async def benchmark(sizes, lookups: int, with_index: bool):
+    results = []
+    async with engine.connect() as conn:
+        await conn.run_sync(metadata.create_all)
+        if with_index:
+            for index in bench_indexes:
+                await conn.run_sync(index.create)
+        rows = 0
+        for size in sorted(sizes):
+            await conn.execute(GROW, {"start": rows + 1, "stop": size})
+            await conn.execute(text('ANALYZE bench_users'))
+            rows = size
+            timings = []
+            for _ in range(lookups):
+                query = login_query(bench_users, lookup_value(size))
+                start = time.perf_counter()
+                found = await conn.execute(query)
+                assert found.first() is not None
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            results.append(
+                (
+                    size,
+                    statistics.median(timings),
+                    timings[int(len(timings) * 0.95) - 1],
+                )
+            )
+        await conn.rollback()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument('--lookups', type=int, default=200)
+    parser.add_argument('--no-index', action='store_true')
+    args = parser.parse_args()
+
+    results = asyncio.run(benchmark(args.sizes, args.lookups, not args.no_index))
+    print(f"{'rows':>10} {'median ms':>10} {'p95 ms':>10}")
+    for size, median, p95 in results:
+        print(f"{size:>10} {median:>10.3f} {p95:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -11,10 +11,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi_users import models
 from fastapi_users.authentication import Authenticator, BaseAuthentication
-from fastapi_users.db import (
-    BaseUserDatabase,
-    SQLAlchemyUserDatabase,
-)
+from fastapi_users.db import BaseUserDatabase
 from fastapi_users.password import get_password_hash
 from fastapi_users.router.common import ErrorCode, run_handler
 from fastapi_users.user import (
@@ -24,24 +21,12 @@ from fastapi_users.user import (
     ValidatePasswordProtocol,
 )
 from pydantic import UUID4, EmailStr
-from sqlalchemy import func, or_
 
 from app.schemas import Token, UserLogin
 from app.users.user_dal import UserDAL
 from app.users.dependencies import get_user_dal
 from app.users.schemas import UserOut
-
-
-class OverridenSQLAlchemyUserDatabase(SQLAlchemyUserDatabase):
-    async def get_by_email(self, username_or_mail: str):
-        query = self.users.select().where(
-            or_(
-                func.lower(self.users.c.username) == func.lower(username_or_mail),
-                func.lower(self.users.c.email) == func.lower(username_or_mail),
-            )
-        )
-        user = await self.database.fetch_one(query)
-        return await self._make_user(user) if user else None
+from app.users.helper_functions import load_user_counters
 
 
 def get_auth_router(
@@ -222,6 +207,7 @@ def get_users_router(
         user: models.BaseUserDB = Depends(get_current_active_user),
     ):
         user = await user_dal.get_user(user_id=user.id)
+        await load_user_counters([user])
         return user
 
     @router.patch(
@@ -0,0 +1,105 @@
+import asyncio
+import logging
+from typing import Generic, Optional, Type
+
+from fastapi_users.models import UD
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.cache import LRUCache
+from app.config import (
+    PRINCIPAL_CACHE_TTL,
+    PRINCIPAL_LOCAL_MAXSIZE,
+    PRINCIPAL_LOCAL_TTL,
+)
+from app.users.schemas import UserDB
+from redis_conf.redis import redis_cache
+
+logger = logging.getLogger(__name__)
+
+_SESSION_KEY = "principal_invalidations"
+
+
+class PrincipalCache(Generic[UD]):
+    """Short-lived cache of authenticated users, keyed by id.
+
+    ``current_user`` resolves the JWT subject through the user database
+    adapter on every request; this cache sits in front of that lookup with
+    a per-process LRU and Redis. ``invalidate`` clears this process and
+    Redis; other workers may keep a local copy for ``local_ttl`` seconds.
+    """
+
+    def __init__(self, cache, model: Type[UD], ttl: int, maxsize: int, local_ttl):
+        self._redis = cache
+        self.model = model
+        self.ttl = ttl
+        self._local = LRUCache(maxsize, local_ttl)
+        self._tasks = set()
+
+    @staticmethod
+    def _key(user_id) -> str:
+        return f"principal:{user_id}"
+
+    async def get(self, user_id) -> Optional[UD]:
+        user = self._local.get(str(user_id))
+        if user is not None:
+            return user.copy()
+        try:
+            raw = await self._redis.get(self._key(user_id))
+        except Exception as e:
+            logger.warning("Principal cache read failed: %s", e)
+            return None
+        if raw is None:
+            return None
+        user = self.model.parse_raw(raw)
+        self._local.set(str(user_id), user)
+        return user.copy()
+
+    async def set(self, user: UD):
+        self._local.set(str(user.id), user.copy())
+        try:
+            await self._redis.set(self._key(user.id), user.json(), ex=self.ttl)
+        except Exception as e:
+            logger.warning("Principal cache write failed: %s", e)
+
+    async def invalidate(self, *user_ids):
+        for user_id in user_ids:
+            self._local.delete(str(user_id))
+        try:
+            await self._redis.delete(*(self._key(user_id) for user_id in user_ids))
+        except Exception as e:
+            logger.warning("Principal cache invalidation failed: %s", e)
+
+    def invalidate_on_commit(self, db_session, *user_ids):
+        """Drop ``user_ids`` once ``db_session`` commits.
+
+        Invalidating before the commit would let a concurrent request
+        cache the old row again.
+        """
+        db_session.sync_session.info.setdefault(_SESSION_KEY, []).extend(user_ids)
+
+    def _schedule(self, user_ids):
+        task = asyncio.get_running_loop().create_task(self.invalidate(*user_ids))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+principal_cache = PrincipalCache(
+    redis_cache,
+    UserDB,
+    ttl=PRINCIPAL_CACHE_TTL,
+    maxsize=PRINCIPAL_LOCAL_MAXSIZE,
+    local_ttl=PRINCIPAL_LOCAL_TTL,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    user_ids = session.info.pop(_SESSION_KEY, None)
+    if user_ids:
+        principal_cache._schedule(user_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop(_SESSION_KEY, None)
@@ -0,0 +1,91 @@
+from typing import Optional, Type
+
+from fastapi_users.db import BaseUserDatabase
+from fastapi_users.models import UD
+from pydantic import UUID4
+from sqlalchemy import Table, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.auth.principal_cache import PrincipalCache
+
+
+def login_query(users: Table, username_or_mail: str):
+    """Select the user whose username or email matches, ignoring case.
+
+    Written as two probes of the ``lower(username)`` and ``lower(email)``
+    indexes instead of one OR, which Postgres can only answer with a
+    sequential scan.
+    """
+    value = func.lower(username_or_mail)
+    by_username = select(users).where(func.lower(users.c.username) == value)
+    by_email = select(users).where(func.lower(users.c.email) == value)
+    return by_username.union_all(by_email).limit(1)
+
+
+class AsyncSQLAlchemyUserDatabase(BaseUserDatabase[UD]):
+    """fastapi-users adapter on the application's async SQLAlchemy engine.
+
+    Every call runs in its own short session from ``session_factory``, so
+    auth shares the connection pool (and its instrumentation) with the
+    rest of the app instead of holding a second pool.
+
+    ``get`` serves the JWT-authenticated user on every request, so it
+    goes through ``cache`` when one is given; ``update`` and ``delete``
+    invalidate it.
+    """
+
+    def __init__(
+        self,
+        user_db_model: Type[UD],
+        session_factory: sessionmaker,
+        users: Table,
+        cache: Optional[PrincipalCache] = None,
+    ):
+        super().__init__(user_db_model)
+        self.session_factory = session_factory
+        self.users = users
+        self.cache = cache
+
+    async def _fetch_user(self, query) -> Optional[UD]:
+        async with self.session_factory() as session:
+            result = await session.execute(query)
+            row = result.mappings().first()
+        return self.user_db_model(**row) if row else None
+
+    async def _execute(self, query):
+        async with self.session_factory() as session:
+            async with session.begin():
+                await session.execute(query)
+
+    async def get(self, id: UUID4) -> Optional[UD]:
+        if self.cache is not None:
+            user = await self.cache.get(id)
+            if user is not None:
+                return user
+        query = self.users.select().where(self.users.c.id == id)
+        user = await self._fetch_user(query)
+        if user is not None and self.cache is not None:
+            await self.cache.set(user)
+        return user
+
+    async def get_by_email(self, username_or_mail: str) -> Optional[UD]:
+        return await self._fetch_user(login_query(self.users, username_or_mail))
+
+    async def create(self, user: UD) -> UD:
+        await self._execute(self.users.insert().values(**user.dict()))
+        return user
+
+    async def update(self, user: UD) -> UD:
+        await self._execute(
+            self.users.update()
+            .where(self.users.c.id == user.id)
+            .values(**user.dict())
+        )
+        if self.cache is not None:
+            await self.cache.invalidate(user.id)
+        return user
+
+    async def delete(self, user: UD) -> None:
+        await self._execute(self.users.delete().where(self.users.c.id == user.id))
+        if self.cache is not None:
+            await self.cache.invalidate(user.id)
@@ -9,3 +9,4 @@ from app.lessons.models import *
 from app.tags.models import *
 from app.users.models import *
 from app.content.models import *
+from app.notifications.models import *
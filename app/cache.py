@@ -0,0 +1,193 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi_pagination import resolve_params
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.responses import Response
+
+from app.config import CACHE_LOCAL_MAXSIZE, CACHE_LOCAL_TTL
+from app.monitoring.metrics import CACHE_REQUESTS
+from redis_conf.redis import redis_cache
+
+logger = logging.getLogger(__name__)
+
+_KEY_TYPES = (str, int, float, bool)
+
+_SESSION_KEY = "response_cache_invalidations"
+
+
+class LRUCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+
+    def get(self, key):
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key):
+        self._data.pop(key, None)
+
+    def delete_prefix(self, prefix: str):
+        for key in [key for key in self._data if key.startswith(prefix)]:
+            del self._data[key]
+
+    def __len__(self):
+        return len(self._data)
+
+
+class ResponseCache:
+    """Two-tier cache for public GET handlers.
+
+    Rendered JSON bodies are kept in a small per-process LRU in front of
+    Redis. Every entry belongs to a namespace such as ``course:5``;
+    ``invalidate`` drops the namespace from this process and from Redis.
+    Other workers only hold an entry for ``CACHE_LOCAL_TTL`` seconds, which
+    bounds how stale their local tier can get after an invalidation.
+    """
+
+    def __init__(self, cache, maxsize: int, local_ttl: float):
+        self._redis = cache
+        self._local = LRUCache(maxsize, local_ttl)
+        self.stats = {"local_hits": 0, "redis_hits": 0, "misses": 0, "errors": 0}
+        self._tasks = set()
+
+    def _count(self, result: str):
+        self.stats[result] += 1
+        CACHE_REQUESTS.labels(result).inc()
+
+    @staticmethod
+    def _key(namespace: str, kwargs) -> str:
+        params = sorted(
+            (name, value)
+            for name, value in kwargs.items()
+            if value is None or isinstance(value, _KEY_TYPES)
+        )
+        try:
+            page = resolve_params()
+            params += [("page", page.page), ("size", page.size)]
+        except RuntimeError:
+            pass
+        return f"{namespace}|" + "&".join(f"{name}={value}" for name, value in params)
+
+    @staticmethod
+    def _index(namespace: str) -> str:
+        return f"cache:index:{namespace}"
+
+    async def get(self, key: str):
+        body = self._local.get(key)
+        if body is not None:
+            self._count("local_hits")
+            return body
+        try:
+            body = await self._redis.get(f"cache:{key}")
+        except Exception as e:
+            self._count("errors")
+            logger.warning("Response cache read failed: %s", e)
+            return None
+        if body is not None:
+            self._count("redis_hits")
+            self._local.set(key, body)
+            return body
+        self._count("misses")
+        return None
+
+    async def set(self, namespace: str, key: str, body: bytes, ttl: int):
+        self._local.set(key, body)
+        try:
+            await self._redis.set(f"cache:{key}", body, ex=ttl)
+            await self._redis.sadd(self._index(namespace), f"cache:{key}")
+            await self._redis.expire(self._index(namespace), ttl)
+        except Exception as e:
+            self._count("errors")
+            logger.warning("Response cache write failed: %s", e)
+
+    async def invalidate(self, *namespaces: str):
+        for namespace in namespaces:
+            self._local.delete_prefix(f"{namespace}|")
+            try:
+                keys = await self._redis.smembers(self._index(namespace))
+                await self._redis.delete(self._index(namespace), *keys)
+            except Exception as e:
+                self._count("errors")
+                logger.warning("Response cache invalidation failed: %s", e)
+
+    def invalidate_on_commit(self, db_session, *namespaces: str):
+        """Invalidate ``namespaces`` once ``db_session`` commits.
+
+        Invalidating inside the transaction would let a concurrent GET
+        cache the old row again before the commit lands.
+        """
+        db_session.sync_session.info.setdefault(_SESSION_KEY, []).extend(namespaces)
+
+    def _schedule(self, namespaces):
+        task = asyncio.get_running_loop().create_task(self.invalidate(*namespaces))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def cached(self, namespace: str, ttl: int):
+        """Cache a GET handler's JSON body.
+
+        ``namespace`` may reference handler arguments, e.g.
+        ``"course:{course_id}"``. Responses returned by the handler itself
+        (error JSONResponses) are passed through and never cached.
+        """
+
+        def decorator(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                resolved = namespace.format(**kwargs)
+                key = self._key(resolved, kwargs)
+                body = await self.get(key)
+                if body is not None:
+                    return Response(content=body, media_type="application/json")
+                result = await func(*args, **kwargs)
+                if isinstance(result, Response):
+                    return result
+                response = JSONResponse(content=jsonable_encoder(result))
+                await self.set(resolved, key, response.body, ttl)
+                return response
+
+            return wrapper
+
+        return decorator
+
+    def get_stats(self):
+        return {**self.stats, "local_size": len(self._local)}
+
+
+response_cache = ResponseCache(
+    redis_cache, maxsize=CACHE_LOCAL_MAXSIZE, local_ttl=CACHE_LOCAL_TTL
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    namespaces = session.info.pop(_SESSION_KEY, None)
+    if namespaces:
+        response_cache._schedule(set(namespaces))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop(_SESSION_KEY, None)
@@ -3,15 +3,17 @@ from typing import Optional
 from fastapi import APIRouter, Depends, status
 from fastapi.responses import JSONResponse
 from fastapi_pagination.ext.async_sqlalchemy import paginate
-from fastapi_pagination.paginator import paginate as paginate_list
 from fastapi_users import models as fastapi_model
 from app.courses.schemas import CourseOut
 from app.auth.auth import fastapi_users
 from . import models, schemas
 from .category_dal import CategoryDAL
 from app.pagination import CustomPage as Page
-from elastic import es
+from app.search.indexer import search_indexer
 from .dependencies import get_category_dal
+from app.users.helper_functions import load_user_counters
+from app.cache import response_cache
+from app.config import CACHE_TTL, CACHE_TTL_DICTIONARIES
 from http import HTTPStatus
 from starlette.responses import Response
 
@@ -23,6 +25,7 @@ router = APIRouter(tags=['Categories'])
     response_model=Page[schemas.CategoryOut],
     status_code=200,
 )
+@response_cache.cached("popular_categories", CACHE_TTL)
 async def show_popular_categories(
     category_dal: CategoryDAL = Depends(get_category_dal),
 ):
@@ -33,6 +36,7 @@ async def show_popular_categories(
 @router.get(
     '/core/categories', response_model=Page[schemas.CategoryOut], status_code=200
 )
+@response_cache.cached("categories", CACHE_TTL_DICTIONARIES)
 async def show_categories(
     category_dal: CategoryDAL = Depends(get_category_dal), title: Optional[str] = None
 ):
@@ -63,18 +67,14 @@ async def show_category_courses(
     category_dal: CategoryDAL = Depends(get_category_dal),
     title: Optional[str] = None,
 ):
-    category = await category_dal.get_category_courses(category_id)
-    if not category:
+    if not await category_dal.check_category_exists_by_id(category_id):
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"message": "Категория не найдена"},
         )
-    if title:
-        filtered_courses = [
-            course for course in category.courses if course.title.startswith(title)
-        ]
-        return paginate_list(filtered_courses)
-    return paginate_list(category.courses)
+    page = await category_dal.get_category_courses_page(category_id, title)
+    await load_user_counters(course.user for course in page.data)
+    return page
 
 
 @router.post('/core/category/create', status_code=201)
@@ -96,14 +96,9 @@ async def create_category(
         request.title,
         request.description,
     )
-    try:
-        doc = {"title": request.title, "description": request.description}
-        await es.index("categories", id=new_category.id, body=doc)
-    except Exception as e:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"message": f"Ошибка в апдейте elastic search: {e}"},
-        )
+    search_indexer.enqueue_on_commit(
+        category_dal.db_session, "categories", new_category.id
+    )
     return new_category
 
 
@@ -125,19 +120,7 @@ async def update_category(
     category_update = await category_dal.update_category(
         category_id, request.image, request.title, request.description
     )
-    try:
-        doc = {
-            "doc": {
-                "title": category_update.title,
-                "description": category_update.description,
-            }
-        }
-        await es.update("categories", id=category_id, body=doc)
-    except Exception as e:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"message": f"Ошибка в апдейте elastic search: {e}"},
-        )
+    search_indexer.enqueue_on_commit(category_dal.db_session, "categories", category_id)
     return category_update
 
 
@@ -156,11 +139,5 @@ async def delete_category(
             content={"message": "Категория не найдена"},
         )
     await category_dal.delete_category(category_id)
-    try:
-        await es.delete(index="categories", id=category_id)
-    except Exception as e:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"message": f"Ошибка в апдейте elastic search: {e}"},
-        )
+    search_indexer.enqueue_on_commit(category_dal.db_session, "categories", category_id)
     return Response(status_code=204)
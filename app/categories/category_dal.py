@@ -8,6 +8,8 @@ from sqlalchemy.orm import selectinload
 from app.database import async_session as session
 from app.courses.models import Course
 from app.categories.models import Category
+from app.dal import paginate_relationship
+from app.cache import response_cache
 
 
 class CategoryDAL:
@@ -17,6 +19,9 @@ class CategoryDAL:
     async def create_category(self, image, title, description):
         new_category = Category(image=image, title=title, description=description)
         self.db_session.add(new_category)
+        response_cache.invalidate_on_commit(
+            self.db_session, "categories", "popular_categories"
+        )
         return new_category
 
     async def get_all_categories(self, title: [Optional] = None):
@@ -34,16 +39,15 @@ class CategoryDAL:
         except:
             return None
 
-    async def get_category_courses(self, category_id):
-        q = await self.db_session.execute(
-            select(Category)
-            .options(selectinload(Category.courses))
-            .filter(Category.id == category_id)
+    async def get_category_courses_page(self, category_id, title):
+        criteria = [Course.title.like(f'{title}%')] if title else []
+        return await paginate_relationship(
+            self.db_session,
+            Category.courses,
+            category_id,
+            *criteria,
+            options=[selectinload(Course.lessons), selectinload(Course.user)],
         )
-        try:
-            return q.scalars().first()
-        except:
-            return None
 
     async def check_category_exists_by_title(self, category_title: str):
         q = await self.db_session.execute(
@@ -82,10 +86,16 @@ class CategoryDAL:
             q = q.values(description=description)
         q.execution_options(synchronize_session="fetch")
         await self.db_session.execute(q)
+        response_cache.invalidate_on_commit(
+            self.db_session, "categories", "popular_categories"
+        )
         category = await self.get_category(category_id)
         return category
 
     async def delete_category(self, category_id):
         stmt = delete(Category).where(Category.id == category_id)
         await self.db_session.execute(stmt)
+        response_cache.invalidate_on_commit(
+            self.db_session, "categories", "popular_categories"
+        )
         return "удалено"
@@ -8,7 +8,6 @@ PROTOCOL = os.environ.get('PROTOCOL', 'http')
 
 # POSTGRES CONFIGURATION
 DB_ENGINE = os.environ.get('DB_ENGINE', 'postgresql+asyncpg')
-DB_ENGINE_USERS = os.environ.get('DB_ENGINE', 'postgresql')
 POSTGRES_USER = os.environ.get('POSTGRES_USER', 'admin')
 POSTGRES_PASSWORD = os.environ.get('POSTGRES_PASSWORD', 'LOYAg3Wv')
 # POSTGRES_HOST = os.environ.get('POSTGRES_HOST', 'eduonedb')
@@ -22,13 +21,6 @@ SQLALCHEMY_DATABASE_URL = (
     f"{POSTGRES_DB}"
 )
 
-SQLALCHEMY_DATABASE_URL_USERS = (
-    f"{DB_ENGINE_USERS}://{POSTGRES_USER}:"
-    f"{POSTGRES_PASSWORD}@{POSTGRES_HOST}:"
-    f"{POSTGRES_PORT}/"
-    f"{POSTGRES_DB}"
-)
-
 # Middleware
 MIDDLEWARE_HOST = os.environ.get("MIDDLEWARE_HOST", "middleware-service")
 MIDDLEWARE_PORT = os.environ.get("MIDDLEWARE_PORT", 6000)
@@ -80,3 +72,100 @@ VERIFICATION_URL = f'{PROTOCOL}://{HOST}:{PORT}/{VERIFY_URL}'
 REDIS_HOST = os.environ.get("REDIS_HOST", "redis")
 REDIS_PORT = os.environ.get("REDIS_PORT", "6379")
 REDIS_PASSWORD = os.environ.get("REDIS_PASSWORD", "localhost")
+# "host:port,host:port"; empty means connect to REDIS_HOST directly.
+REDIS_SENTINELS = [
+    (host, int(port))
+    for host, port in (
+        item.strip().rsplit(":", 1)
+        for item in os.environ.get(
+            "REDIS_SENTINELS",
+            "sentinel-0.sentinel.default.svc.cluster.local:5000,"
+            "sentinel-1.sentinel.default.svc.cluster.local:5000,"
+            "sentinel-2.sentinel.default.svc.cluster.local:5000",
+        ).split(",")
+        if item.strip()
+    )
+]
+REDIS_SENTINEL_MASTER = os.environ.get("REDIS_SENTINEL_MASTER", "mymaster")
+REDIS_MAX_CONNECTIONS = int(os.environ.get("REDIS_MAX_CONNECTIONS", 50))
+REDIS_POOL_TIMEOUT = float(os.environ.get("REDIS_POOL_TIMEOUT", 5))
+REDIS_SOCKET_TIMEOUT = float(os.environ.get("REDIS_SOCKET_TIMEOUT", 5))
+REDIS_CONNECT_TIMEOUT = float(os.environ.get("REDIS_CONNECT_TIMEOUT", 2))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.environ.get("REDIS_HEALTH_CHECK_INTERVAL", 30))
+# Replica reads can return principals and responses that were just
+# invalidated on the master, so they are opt-in.
+REDIS_READ_FROM_REPLICAS = (
+    os.environ.get("REDIS_READ_FROM_REPLICAS", "false").lower() == "true"
+)
+
+# Response cache
+CACHE_LOCAL_MAXSIZE = int(os.environ.get("CACHE_LOCAL_MAXSIZE", 1024))
+CACHE_LOCAL_TTL = float(os.environ.get("CACHE_LOCAL_TTL", 5))
+CACHE_TTL = int(os.environ.get("CACHE_TTL", 300))
+CACHE_TTL_DICTIONARIES = int(os.environ.get("CACHE_TTL_DICTIONARIES", 600))
+
+# Authenticated user cache
+PRINCIPAL_CACHE_TTL = int(os.environ.get("PRINCIPAL_CACHE_TTL", 60))
+PRINCIPAL_LOCAL_TTL = float(os.environ.get("PRINCIPAL_LOCAL_TTL", 5))
+PRINCIPAL_LOCAL_MAXSIZE = int(os.environ.get("PRINCIPAL_LOCAL_MAXSIZE", 10000))
+
+# Outbound HTTP clients
+HTTP2 = os.environ.get("HTTP2", "false").lower() == "true"
+HTTP_CLIENTS = {
+    service: {
+        "max_connections": int(
+            os.environ.get(f"{service.upper()}_HTTP_MAX_CONNECTIONS", 50)
+        ),
+        "max_keepalive_connections": int(
+            os.environ.get(f"{service.upper()}_HTTP_MAX_KEEPALIVE", 20)
+        ),
+        "keepalive_expiry": float(
+            os.environ.get(f"{service.upper()}_HTTP_KEEPALIVE_EXPIRY", 30)
+        ),
+        "timeout": float(os.environ.get(f"{service.upper()}_HTTP_TIMEOUT", 8)),
+        "connect_timeout": float(
+            os.environ.get(f"{service.upper()}_HTTP_CONNECT_TIMEOUT", 2)
+        ),
+    }
+    for service in ("middleware", "feed", "email")
+}
+
+# Notification outbox
+OUTBOX_BATCH_SIZE = int(os.environ.get("OUTBOX_BATCH_SIZE", 50))
+OUTBOX_POLL_INTERVAL = float(os.environ.get("OUTBOX_POLL_INTERVAL", 1))
+OUTBOX_MAX_ATTEMPTS = int(os.environ.get("OUTBOX_MAX_ATTEMPTS", 8))
+OUTBOX_BACKOFF_SECONDS = float(os.environ.get("OUTBOX_BACKOFF_SECONDS", 2))
+OUTBOX_BACKOFF_MAX = float(os.environ.get("OUTBOX_BACKOFF_MAX", 600))
+# How long claimed rows stay hidden from other workers while being delivered.
+OUTBOX_LEASE_SECONDS = float(os.environ.get("OUTBOX_LEASE_SECONDS", 120))
+
+# Service token used for calls to the middleware service
+SERVICE_TOKEN_LIFETIME = int(os.environ.get("SERVICE_TOKEN_LIFETIME", 60))
+SERVICE_TOKEN_REFRESH_MARGIN = int(os.environ.get("SERVICE_TOKEN_REFRESH_MARGIN", 10))
+
+# Search indexing pipeline
+SEARCH_BATCH_SIZE = int(os.environ.get("SEARCH_BATCH_SIZE", 500))
+SEARCH_FLUSH_INTERVAL = float(os.environ.get("SEARCH_FLUSH_INTERVAL", 1))
+SEARCH_MAX_ATTEMPTS = int(os.environ.get("SEARCH_MAX_ATTEMPTS", 5))
+SEARCH_RECONCILE_INTERVAL = float(os.environ.get("SEARCH_RECONCILE_INTERVAL", 3600))
+
+# Achievements
+ACHIEVEMENT_TITLES_TTL = float(os.environ.get("ACHIEVEMENT_TITLES_TTL", 300))
+ACHIEVEMENT_STREAM = os.environ.get("ACHIEVEMENT_STREAM", "achievements:events")
+ACHIEVEMENT_STREAM_GROUP = os.environ.get("ACHIEVEMENT_STREAM_GROUP", "achievements")
+ACHIEVEMENT_STREAM_MAXLEN = int(os.environ.get("ACHIEVEMENT_STREAM_MAXLEN", 100000))
+ACHIEVEMENT_BATCH_SIZE = int(os.environ.get("ACHIEVEMENT_BATCH_SIZE", 500))
+ACHIEVEMENT_BLOCK_MS = int(os.environ.get("ACHIEVEMENT_BLOCK_MS", 1000))
+ACHIEVEMENT_CLAIM_IDLE_MS = int(os.environ.get("ACHIEVEMENT_CLAIM_IDLE_MS", 60000))
+ACHIEVEMENT_MAX_DELIVERIES = int(os.environ.get("ACHIEVEMENT_MAX_DELIVERIES", 5))
+
+# SQL logging and query instrumentation
+SQL_ECHO = os.environ.get("SQL_ECHO", "false").lower() == "true"
+SQL_LOG_SAMPLE_RATE = float(os.environ.get("SQL_LOG_SAMPLE_RATE", 0))
+SQL_SLOW_QUERY_MS = float(os.environ.get("SQL_SLOW_QUERY_MS", 200))
+SQL_N_PLUS_ONE_THRESHOLD = int(os.environ.get("SQL_N_PLUS_ONE_THRESHOLD", 10))
+SERVER_TIMING = os.environ.get("SERVER_TIMING", "true").lower() == "true"
+METRICS_SAMPLE_INTERVAL = float(os.environ.get("METRICS_SAMPLE_INTERVAL", 5))
+
+# Schema
+SCHEMA_VERSION_CHECK = os.environ.get("SCHEMA_VERSION_CHECK", "true").lower() == "true"
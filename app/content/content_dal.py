@@ -6,6 +6,7 @@ from app.content.models import Content
 import app.content.schemas as schemas
 from sqlalchemy.sql.expression import exists
 from app.lessons.models import Lesson
+from app.cache import response_cache
 
 
 class ContentDAL:
@@ -17,6 +18,9 @@ class ContentDAL:
         self.db_session.add(new_content)
         await self.db_session.flush()
         await self.db_session.refresh(new_content)
+        response_cache.invalidate_on_commit(
+            self.db_session, f"lesson:{request.lesson_id}"
+        )
         return new_content
 
     async def get_content(self, content_id: int):
@@ -32,8 +36,11 @@ class ContentDAL:
         return contents.unique().scalars().all()
 
     async def delete_content(self, content_id: int):
-        stmt = delete(Content).where(Content.id == content_id)
-        await self.db_session.execute(stmt)
+        stmt = delete(Content).where(Content.id == content_id).returning(
+            Content.lesson_id
+        )
+        lesson_id = (await self.db_session.execute(stmt)).scalar()
+        response_cache.invalidate_on_commit(self.db_session, f"lesson:{lesson_id}")
 
     async def check_content_user(self, content_id: int, user_id: str):
         lesson = await self.db_session.execute(
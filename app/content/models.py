@@ -8,5 +8,5 @@ class Content(Base):
     __tablename__ = 'Contents'
     id = Column(Integer, primary_key=True, index=True)
     text = Column(String(500), nullable=True)
-    lesson_id = Column(Integer, ForeignKey("Lessons.id"))
+    lesson_id = Column(Integer, ForeignKey("Lessons.id"), index=True)
     files = relationship('File', lazy='joined', backref='content')
@@ -1,30 +1,58 @@
-from sqlalchemy import update, desc, delete
+from sqlalchemy import update, desc, delete, func, tuple_
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
+from sqlalchemy.sql.expression import exists
 from app.database import async_session as session
 from pydantic import UUID4
 from app.courses.models import Course
 from app.categories.models import Category
 from app.file.models import File
+from app.lessons.models import Lesson
 import app.courses.schemas as schemas
 from app.file.schemas import FileToCourse as FileSchema
 from app.users.models import User
+from app.pagination import encode_cursor
+from app.dal import paginate_relationship
+from app.cache import response_cache
 
 
 class CourseDAL:
     def __init__(self, db_session: session):
         self.db_session = db_session
 
-    async def show_all_courses(self, title: str):
+    def _listed_courses(self, query, title: str):
+        query = query.filter_by(is_deleted=False, is_visible=True)
+        if title:
+            query = query.filter(Course.title.like(f'{title}%'))
+        return query
+
+    async def count_courses(self, title: str):
+        return await self.db_session.scalar(
+            self._listed_courses(select(func.count()).select_from(Course), title)
+        )
+
+    async def show_all_courses(
+        self, title: str, size: int, after=None, offset: int = 0
+    ):
         courses = (
-            select(Course)
+            self._listed_courses(select(Course), title)
             .options(selectinload(Course.lessons), selectinload(Course.user))
-            .filter_by(is_deleted=False, is_visible=True)
+            .order_by(desc(Course.created_at), desc(Course.id))
+            .limit(size + 1)
+            .offset(offset)
         )
-        if title:
-            courses = courses.filter(Course.title.like(f'{title}%'))
+        if after:
+            created_at, course_id = after
+            courses = courses.filter(
+                tuple_(Course.created_at, Course.id) < tuple_(created_at, course_id)
+            )
         courses = await self.db_session.execute(courses)
-        return courses.unique().scalars().all()
+        courses = courses.unique().scalars().all()
+        next_cursor = None
+        if len(courses) > size:
+            courses = courses[:size]
+            next_cursor = encode_cursor(courses[-1].created_at, courses[-1].id)
+        return courses, next_cursor
 
     async def show_course(self, course_id: int):
         q = await self.db_session.execute(
@@ -60,13 +88,18 @@ class CourseDAL:
         )
         return q.scalars().first()
 
-    async def show_course_with_files_paginate(self, course_id: int):
-        q = (
-            select(Course)
-            .options(selectinload(Course.files), selectinload(Course.user))
-            .filter_by(id=course_id, is_deleted=False, is_visible=True)
+    async def check_course_visible(self, course_id: int):
+        q = await self.db_session.execute(
+            exists(
+                select(Course.id).filter_by(
+                    id=course_id, is_deleted=False, is_visible=True
+                )
+            ).select()
         )
-        return q
+        return q.scalar()
+
+    async def show_course_files_page(self, course_id: int):
+        return await paginate_relationship(self.db_session, Course.files, course_id)
 
     async def show_course_deleted(self, course_id: int):
         q = await self.db_session.execute(
@@ -76,13 +109,11 @@ class CourseDAL:
         )
         return q.scalars().first()
 
-    async def show_course_lessons(self, course_id):
-        q = await self.db_session.execute(
-            select(Course)
-            .options(selectinload(Course.lessons), selectinload(Course.user))
-            .filter_by(id=course_id, is_deleted=False, is_visible=True)
+    async def show_course_lessons_page(self, course_id: int, title: str):
+        criteria = [Lesson.title.like(f'{title}%')] if title else []
+        return await paginate_relationship(
+            self.db_session, Course.lessons, course_id, *criteria
         )
-        return q.scalars().first()
 
     async def create_course(self, request: schemas.Course, user_id: UUID4):
         new_course = Course(
@@ -95,6 +126,11 @@ class CourseDAL:
             is_visible=True,
         )
         self.db_session.add(new_course)
+        await self.db_session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(courses_count=User.courses_count + 1)
+        )
         await self.db_session.flush()
         await self.db_session.refresh(new_course)
         return new_course
@@ -104,6 +140,7 @@ class CourseDAL:
         q = q.values(updated_values)
         q.execution_options(synchronize_session="fetch")
         await self.db_session.execute(q)
+        response_cache.invalidate_on_commit(self.db_session, f"course:{course_id}")
 
     async def delete_course(self, course_id: int):
         q = update(Course).where(Course.id == course_id)
@@ -111,12 +148,14 @@ class CourseDAL:
         q.execution_options(synchronize_session="fetch")
         await self.db_session.execute(q)
         await self.db_session.flush()
+        response_cache.invalidate_on_commit(self.db_session, f"course:{course_id}")
 
     async def restore_course(self, course_id: int):
         q = update(Course).where(Course.id == course_id)
         q = q.values(is_deleted=False)
         q.execution_options(synchronize_session="fetch")
         await self.db_session.execute(q)
+        response_cache.invalidate_on_commit(self.db_session, f"course:{course_id}")
 
     # Category Route
     async def get_category_with_courses(self, category_id):
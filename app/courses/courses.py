@@ -3,19 +3,22 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, status
 from fastapi.responses import JSONResponse
-from fastapi_pagination.paginator import paginate as paginate_list
+from fastapi_pagination import resolve_params
 from fastapi_users import models as fastapi_model
 from http import HTTPStatus
 from starlette.responses import Response
 from app.auth.auth import fastapi_users
 from . import schemas
-from .additional_functions import send_course_notifications
-from app.pagination import CustomPage as Page
-from elastic import es
+from app.notifications.outbox_dal import enqueue_notification
+from app.pagination import CustomPage as Page, decode_cursor
+from app.search.indexer import search_indexer
 from app.lessons.schemas import LessonOut, FileOut
 from app.file.schemas import FileToCourse
 from app.courses.course_dal import CourseDAL
 from app.courses.dependencies import get_course_dal
+from app.users.helper_functions import load_user_counters
+from app.cache import response_cache
+from app.config import CACHE_TTL
 
 
 router = APIRouter(tags=['Courses'])
@@ -23,13 +26,35 @@ router = APIRouter(tags=['Courses'])
 
 @router.get('/core/courses', response_model=Page[schemas.CourseOut], status_code=200)
 async def show_all_courses(
-    course_dal: CourseDAL = Depends(get_course_dal), title: Optional[str] = None
+    course_dal: CourseDAL = Depends(get_course_dal),
+    title: Optional[str] = None,
+    cursor: Optional[str] = None,
 ):
-    courses = await course_dal.show_all_courses(title)
-    return paginate_list(courses)
+    params = resolve_params()
+    if not cursor:
+        courses, next_cursor = await course_dal.show_all_courses(
+            title, params.size, offset=params.to_raw_params().offset
+        )
+        total = await course_dal.count_courses(title)
+        await load_user_counters(course.user for course in courses)
+        return Page.create(courses, total, params, next=next_cursor)
+    try:
+        created_at, course_id = decode_cursor(cursor)
+        after = (datetime.fromisoformat(created_at), int(course_id))
+    except (TypeError, ValueError):
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Некорректный курсор"},
+        )
+    courses, next_cursor = await course_dal.show_all_courses(
+        title, params.size, after
+    )
+    await load_user_counters(course.user for course in courses)
+    return Page.create_keyset(courses, params, next_cursor)
 
 
 @router.get('/core/courses/{course_id}', status_code=200)
+@response_cache.cached("course:{course_id}", CACHE_TTL)
 async def show_course(course_id: int, course_dal: CourseDAL = Depends(get_course_dal)):
     course = await course_dal.show_course_with_lessons(course_id)
     if not course:
@@ -61,22 +86,11 @@ async def create_course(
     #         content={"message": "Введите корректную дату"},
     #     )
     new_course = await course_dal.create_course(request, user.id)
-    await send_course_notifications(user.id)
-    try:
-        doc = {
-            "title": request.title,
-            "description": request.description,
-            "author": user.id,
-            "category": [],
-            "is_deleted": False,
-        }
-        await es.index("courses", id=new_course.id, body=doc)
-    except Exception as e:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"message": f"Ошибка в апдейте elastic search: {e}"},
-        )
-    return await course_dal.get_course(course_id=new_course.id)
+    await enqueue_notification(course_dal.db_session, "course", user_id=str(user.id))
+    search_indexer.enqueue_on_commit(course_dal.db_session, "courses", new_course.id)
+    course = await course_dal.get_course(course_id=new_course.id)
+    await load_user_counters([course.user])
+    return course
 
 
 @router.get('/core/course/{course_id}/category', status_code=200)
@@ -108,18 +122,12 @@ async def show_course_lessons(
     course_dal: CourseDAL = Depends(get_course_dal),
     title: Optional[str] = None,
 ):
-    course = await course_dal.show_course_lessons(course_id)
-    if not course:
+    if not await course_dal.check_course_visible(course_id):
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"message": "Курс не найден"},
         )
-    if title:
-        filtered_lessons = [
-            lesson for lesson in course.lessons if lesson.title.startswith(title)
-        ]
-        return paginate_list(filtered_lessons)
-    return paginate_list(course.lessons)
+    return await course_dal.show_course_lessons_page(course_id, title)
 
 
 @router.patch(
@@ -175,14 +183,7 @@ async def update_course(
     #             content={"message": "Введите корректную дату"},
     #         )
     await course_dal.update_course(course_id, request.dict(exclude_unset=True))
-    try:
-        doc = {"doc": {"title": request.title, "description": request.description}}
-        await es.update("courses", id=course_id, body=doc)
-    except Exception as e:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"message": f"Ошибка в апдейте elastic search: {e}"},
-        )
+    search_indexer.enqueue_on_commit(course_dal.db_session, "courses", course_id)
     return course
 
 
@@ -209,14 +210,7 @@ async def delete_course(
             content={"message": "Курс уже был удален"},
         )
     await course_dal.delete_course(course_id)
-    try:
-        body = {"doc": {'is_deleted': True}}
-        await es.update("courses", id=course.id, body=body)
-    except Exception as e:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"message": f"Ошибка в апдейте elastic search: {e}"},
-        )
+    search_indexer.enqueue_on_commit(course_dal.db_session, "courses", course.id)
     return Response(status_code=204)
 
 
@@ -238,6 +232,8 @@ async def hide_or_expose(
             status_code=status.HTTP_403_FORBIDDEN,
             content={"message": "У вас нет прав на это действие"},
         )
+    response_cache.invalidate_on_commit(course_dal.db_session, f"course:{course_id}")
+    search_indexer.enqueue_on_commit(course_dal.db_session, "courses", course_id)
     if course.is_visible:
         course.is_visible = False
         return JSONResponse(
@@ -270,14 +266,7 @@ async def restore_course(
             content={"message": "У вас нет прав на это действие"},
         )
     await course_dal.restore_course(course_id)
-    try:
-        body = {"doc": {'is_deleted': False}}
-        await es.update("courses", id=course.id, body=body)
-    except Exception as e:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"message": f"Ошибка в апдейте elastic search: {e}"},
-        )
+    search_indexer.enqueue_on_commit(course_dal.db_session, "courses", course.id)
     return 'Восстановлено успешно'
 
 
@@ -307,20 +296,8 @@ async def add_category_to_course(
         )
     category.courses.append(course)
     await course_dal.db_session.flush()
-    try:
-        body = {
-            "script": {
-                "source": "ctx._source.category.add(params.category)",
-                "lang": "painless",
-                "params": {"category": category.id},
-            }
-        }
-        await es.update("courses", id=course.id, body=body)
-    except Exception as e:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"message": f"Ошибка в апдейте elastic search: {e}"},
-        )
+    response_cache.invalidate_on_commit(course_dal.db_session, "popular_categories")
+    search_indexer.enqueue_on_commit(course_dal.db_session, "courses", course.id)
     return JSONResponse(content={"message": "Успешно привязано"})
 
 
@@ -360,10 +337,9 @@ async def show_courses_files(
     course_id: int,
     course_dal: CourseDAL = Depends(get_course_dal),
 ):
-    course = await course_dal.show_course_with_files(course_id)
-    if not course:
+    if not await course_dal.check_course_visible(course_id):
         return JSONResponse(
             status_code=status.HTTP_403_FORBIDDEN,
             content={"message": "Такого курса не существует"},
         )
-    return paginate_list(course.files)
+    return await course_dal.show_course_files_page(course_id)
@@ -4,21 +4,22 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     Table,
 )
 from sqlalchemy.orm import relationship, backref
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from app.database import Base
 
 
 course_tags_association = Table(
     'course-tags',
     Base.metadata,
-    Column('Course_id', Integer, ForeignKey('Courses.id')),
-    Column('Tag_id', Integer, ForeignKey('Tags.id')),
+    Column('Course_id', Integer, ForeignKey('Courses.id'), primary_key=True),
+    Column('Tag_id', Integer, ForeignKey('Tags.id'), primary_key=True, index=True),
 )
 
 
@@ -35,18 +36,35 @@ class Course(Base):
     price = Column(Integer, nullable=False, default=0)
     description = Column(Text)
     created_at = Column(
-        DateTime(timezone=True), nullable=True, server_default=func.now()
+        DateTime(timezone=True), nullable=False, server_default=func.now()
     )
     is_active = Column(Boolean)
     is_deleted = Column(Boolean, default=False)
     start_date = Column(DateTime, nullable=True)
     end_date = Column(DateTime, nullable=True)
-    user_id = Column(GUID, ForeignKey("Users.id"))
+    user_id = Column(GUID, ForeignKey("Users.id"), index=True)
     user = relationship("User", back_populates="courses")
-    category = Column(Integer, ForeignKey("Categories.id"))
+    category = Column(Integer, ForeignKey("Categories.id"), index=True)
     lessons = relationship('Lesson', lazy="select", backref='course')
     files = relationship('File', lazy="select", backref='course')
     is_visible = Column(Boolean, default=True)
+    subscribers_count = Column(Integer, nullable=False, default=0, server_default='0')
     tags = relationship(
         'Tag', secondary=course_tags_association, backref='courses', lazy='select'
     )
+
+
+# Public listings only ever read live courses, see CourseDAL.
+LISTED_COURSES = text('is_deleted = false AND is_visible = true')
+Index(
+    'ix_Courses_listed_created_at',
+    Course.created_at.desc(),
+    Course.id.desc(),
+    postgresql_where=LISTED_COURSES,
+)
+Index(
+    'ix_Courses_listed_title',
+    Course.title,
+    postgresql_ops={'title': 'varchar_pattern_ops'},
+    postgresql_where=LISTED_COURSES,
+)
@@ -0,0 +1,40 @@
+from sqlalchemy import func
+from sqlalchemy.future import select
+from fastapi_pagination.api import create_page, resolve_params
+from fastapi_pagination.ext.sqlalchemy import paginate_query
+
+
+def _filter_by_parent(query, prop, parent_id, criteria):
+    if prop.secondary is not None:
+        ((target_column, secondary_column),) = prop.secondary_synchronize_pairs
+        query = query.join(prop.secondary, target_column == secondary_column)
+    ((_, foreign_column),) = prop.synchronize_pairs
+    return query.where(foreign_column == parent_id, *criteria)
+
+
+async def paginate_relationship(
+    db_session, relationship, parent_id, *criteria, options=()
+):
+    """Paginate one parent's collection without loading it.
+
+    ``relationship`` is a collection attribute such as ``User.followers``.
+    The page is selected straight from the target table (joined to the
+    association table for many-to-many) with LIMIT/OFFSET, and the total
+    is a plain ``count(*)`` over the same join.
+    """
+    params = resolve_params()
+    prop = relationship.property
+    target = prop.mapper.class_
+
+    total = await db_session.scalar(
+        _filter_by_parent(
+            select(func.count()).select_from(target), prop, parent_id, criteria
+        )
+    )
+    query = (
+        _filter_by_parent(select(target), prop, parent_id, criteria)
+        .options(*options)
+        .order_by(target.id)
+    )
+    items = await db_session.execute(paginate_query(query, params))
+    return create_page(items.unique().scalars().all(), total, params)
@@ -1,6 +1,6 @@
 from sqlalchemy.orm import declarative_base
 import logging
-from app.config import SQLALCHEMY_DATABASE_URL
+from app.config import SQLALCHEMY_DATABASE_URL, SQL_ECHO
 from typing import AsyncIterator
 
 
@@ -8,14 +8,17 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
+from app.monitoring.pools import TimedQueuePool
+
 logger = logging.getLogger(__name__)
 
 engine = create_async_engine(
     SQLALCHEMY_DATABASE_URL,
+    poolclass=TimedQueuePool,
     pool_pre_ping=True,
     pool_size=20,
     max_overflow=10,
-    echo=True,
+    echo=SQL_ECHO,
 )
 
 async_session = sessionmaker(
@@ -1,5 +1,5 @@
 from app.config import EMAIL_URL_SEND_REGISTER_MAIL, VERIFICATION_URL
-import httpx
+from app.http_clients import http_clients
 
 
 async def send_register_mail(email, verify_token):
@@ -11,8 +11,8 @@ async def send_register_mail(email, verify_token):
         "template_subject": "string",
         "template_body": {'action_url': action_url, "email": email},
     }
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url=url, json=data, timeout=8)
-        response.raise_for_status()
+    client = http_clients.get("email")
+    response = await client.post(url=url, json=data)
+    response.raise_for_status()
 
     return response.json()
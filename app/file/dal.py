@@ -8,8 +8,8 @@ from app.homework.models import Homework
 from app.lessons.models import Lesson
 from app.achievements.models import Achievement
 from app.users.models import User
-from sqlalchemy.orm import selectinload
 from sqlalchemy.sql.expression import exists
+from app.cache import response_cache
 
 
 class FileDAL:
@@ -70,6 +70,9 @@ class FileDAL:
         )
         self.db_session.add(new_file)
         await self.db_session.flush()
+        response_cache.invalidate_on_commit(
+            self.db_session, f"course:{request.course_id}"
+        )
 
     async def upload_achievement_avatar(self, request):
         achievement = await self.db_session.execute(
@@ -85,12 +88,6 @@ class FileDAL:
         self.db_session.add(new_file)
         await self.db_session.flush()
 
-    async def get_user_files(self, user_id: UUID4, file_type: str):
-        q = await self.db_session.execute(
-            select(File).filter_by(type=file_type, user=user_id)
-        )
-        return q.scalars().all()
-
     # Course Route
     async def check_course(self, course_id: int):
         q = await self.db_session.execute(
@@ -111,17 +108,3 @@ class FileDAL:
             exists(select(Homework.id).filter_by(id=homework_id)).select()
         )
         return q.scalar()
-
-    # Achievement route
-    async def get_achievement(self, title: str):
-        q = await self.db_session.execute(select(Achievement).filter_by(title=title))
-        return q.scalars().first()
-
-    # User route
-    async def get_user_with_achievements(self, user_id):
-        user = await self.db_session.execute(
-            select(User)
-            .options(selectinload(User.achievements))
-            .filter(User.id == user_id)
-        )
-        return user.scalars().first()
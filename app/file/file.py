@@ -5,7 +5,7 @@ from fastapi_users import models as fastapi_model
 from app.auth.auth import fastapi_users
 from . import schemas
 
-from app.file.achievement import get_achievements
+from app.achievements.events import achievement_events
 from app.file.dal import FileDAL
 from app.file.dependencies import get_file_dal
 
@@ -18,7 +18,6 @@ async def create_file(
     user: fastapi_model.BaseUserDB = Depends(fastapi_users.current_user()),
     file_dal: FileDAL = Depends(get_file_dal),
 ):
-    user = await file_dal.get_user_with_achievements(user.id)
     if request.course_id:
         if not await file_dal.check_course(request.course_id):
             return JSONResponse(
@@ -38,7 +37,8 @@ async def create_file(
                 content={"message": "Домашнее задание не найдено"},
             )
     await file_dal.create_file(request, user.id)
-    await get_achievements(user, file_dal)
+    if request.type == "video":
+        achievement_events.publish_on_commit(file_dal.db_session, user.id, "videos")
     return JSONResponse(
         status_code=status.HTTP_201_CREATED,
         content={"message": "Файл создан"},
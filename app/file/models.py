@@ -12,12 +12,12 @@ class File(Base):
     url = Column(String(500), nullable=True, default='file_default.png')
     duration = Column(Integer, nullable=True)
     type = Column(String(50))
-    homework_id = Column(Integer, ForeignKey("Homework.id"))
-    course_id = Column(Integer, ForeignKey("Courses.id"))
-    user = Column(GUID, ForeignKey("Users.id"))
-    achievement_id = Column(Integer, ForeignKey("Achievements.id"))
+    homework_id = Column(Integer, ForeignKey("Homework.id"), index=True)
+    course_id = Column(Integer, ForeignKey("Courses.id"), index=True)
+    user = Column(GUID, ForeignKey("Users.id"), index=True)
+    achievement_id = Column(Integer, ForeignKey("Achievements.id"), index=True)
     key = Column(String(255), nullable=False)
-    content_id = Column(Integer, ForeignKey("Contents.id"))
+    content_id = Column(Integer, ForeignKey("Contents.id"), index=True)
 
 
 class Avatar(Base):
@@ -25,7 +25,7 @@ class Avatar(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(50), nullable=False)
     url = Column(String(500), nullable=True, default='file_default.png')
-    course_id = Column(Integer, ForeignKey("Courses.id"))
-    user_id = Column(GUID, ForeignKey("Users.id"))
-    achievement_id = Column(Integer, ForeignKey("Achievements.id"))
+    course_id = Column(Integer, ForeignKey("Courses.id"), index=True)
+    user_id = Column(GUID, ForeignKey("Users.id"), index=True)
+    achievement_id = Column(Integer, ForeignKey("Achievements.id"), index=True)
     key = Column(String(500), nullable=False)
@@ -1,31 +1,36 @@
 from sqlalchemy.future import select
 from app.database import async_session as session
 from app.users.models import User, user_following
-from app.achievements.models import Achievement
 from pydantic import UUID4
 from sqlalchemy.orm import selectinload
-from sqlalchemy.sql import func
 from sqlalchemy.sql.expression import exists
-from sqlalchemy import insert, delete
+from sqlalchemy import insert, delete, update
 
 
 class FollowDAL:
     def __init__(self, db_session: session):
         self.db_session = db_session
 
-    async def user_following_count(self, user_id):
-        q = await self.db_session.execute(
-            select(func.count(user_following.c.user_id)).filter_by(user_id=user_id)
-        )
-        return q.scalars().first()
+    async def change_follow_counters(self, user_id, author_id, delta: int):
+        """Shift both users' counters and return their new values.
 
-    async def user_followers_count(self, user_id):
-        q = await self.db_session.execute(
-            select(func.count(user_following.c.following_id)).filter_by(
-                following_id=user_id
+        Returns ``{user_id: (followers_count, following_count), ...}``.
+        """
+        counters = {}
+        for target_id, column in (
+            (user_id, User.following_count),
+            (author_id, User.followers_count),
+        ):
+            q = await self.db_session.execute(
+                update(User)
+                .where(User.id == target_id)
+                .values({column: column + delta})
+                .returning(User.id, User.followers_count, User.following_count)
             )
-        )
-        return q.scalars().first()
+            row = q.first()
+            if row is not None:
+                counters[str(row.id)] = (row.followers_count, row.following_count)
+        return counters
 
     async def follow_exists(self, user_id, second_user_id):
         q = await self.db_session.execute(
@@ -37,6 +42,17 @@ class FollowDAL:
         )
         return q.scalar()
 
+    async def follow_exists_many(self, viewer_id, candidate_ids):
+        if not candidate_ids:
+            return set()
+        q = await self.db_session.execute(
+            select(user_following.c.following_id).where(
+                user_following.c.user_id == viewer_id,
+                user_following.c.following_id.in_(candidate_ids),
+            )
+        )
+        return set(q.scalars().all())
+
     async def follow(self, user_id, second_user_id):
         checker = await self.follow_exists(user_id, second_user_id)
         if not checker:
@@ -45,26 +61,27 @@ class FollowDAL:
                     user_id=user_id, following_id=second_user_id
                 )
             )
-            return True
+            return True, await self.change_follow_counters(
+                user_id, second_user_id, 1
+            )
         else:
-            await self.db_session.execute(
+            q = await self.db_session.execute(
                 delete(user_following).where(
                     user_following.c.user_id == user_id,
                     user_following.c.following_id == second_user_id,
                 )
             )
-            return False
+            counters = {}
+            if q.rowcount:
+                counters = await self.change_follow_counters(
+                    user_id, second_user_id, -1
+                )
+            return False, counters
 
     async def get_username(self, user_id):
         q = await self.db_session.execute(select(User.username).filter_by(id=user_id))
         return q.scalars().first()
 
-    # Achievement Route
-
-    async def get_achievement(self, title: str):
-        q = await self.db_session.execute(select(Achievement).filter_by(title=title))
-        return q.scalars().first()
-
     # User Route
     async def get_user(self, user_id: UUID4):
         q = await self.db_session.execute(select(User).filter_by(id=user_id))
@@ -77,11 +94,3 @@ class FollowDAL:
             .filter(User.id == user_id)
         )
         return q.scalars().first()
-
-    async def get_user_with_followers(self, user_id: UUID4):
-        q = await self.db_session.execute(
-            select(User)
-            .options(selectinload(User.followers))
-            .filter(User.id == user_id)
-        )
-        return q.scalars().first()
@@ -3,7 +3,8 @@ from fastapi.responses import JSONResponse
 from fastapi_users import models as fastapi_model
 from app.auth.auth import fastapi_users
 from . import schemas
-from .additional_functions import send_follow_notifications, add_achievements
+from app.achievements.events import achievement_events
+from app.notifications.outbox_dal import enqueue_notification
 from redis_conf.redis import redis_cache
 from app.follows.follow_dal import FollowDAL
 from app.follows.dependencies import get_follow_dal
@@ -25,32 +26,31 @@ async def follow(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"message": "Юзер или автор не найдены"},
         )
-    checker = await follow_dal.follow(user.id, request.author_id)
+    checker, counters = await follow_dal.follow(user.id, request.author_id)
     if checker:
         message = "подписался на"
-        await send_follow_notifications(user.id, request.author_id)
+        await enqueue_notification(
+            follow_dal.db_session,
+            "follow",
+            user_id=str(user.id),
+            author=str(request.author_id),
+        )
     else:
         message = "отписался от"
-    await follow_dal.db_session.flush()
-    user_followers_count = await follow_dal.user_followers_count(user.id)
-    user_following_count = await follow_dal.user_following_count(user.id)
-    author_followers_count = await follow_dal.user_followers_count(request.author_id)
-    author_following_count = await follow_dal.user_following_count(request.author_id)
-    await redis_cache.hset(
-        f"user:{user.id}",
-        mapping={
-            "followers_count": user_followers_count,
-            "following_count": user_following_count,
-        },
-    )
-    await redis_cache.hset(
-        f"user:{request.author_id}",
-        mapping={
-            "followers_count": author_followers_count,
-            "following_count": author_following_count,
-        },
-    )
-    await add_achievements(request.author_id, follow_dal)
+    # Other services still read the follow counters from Redis.
+    for user_id, (followers_count, following_count) in counters.items():
+        await redis_cache.hset(
+            f"user:{user_id}",
+            mapping={
+                "followers_count": followers_count,
+                "following_count": following_count,
+            },
+        )
+    author_counters = counters.get(str(request.author_id))
+    if checker and author_counters:
+        achievement_events.publish_on_commit(
+            follow_dal.db_session, request.author_id, "followers", author_counters[0]
+        )
     return JSONResponse(
         content={"message": f'{user.username} {message } {author_username}'}
     )
@@ -1,9 +1,8 @@
 from fastapi_users import InvalidPasswordException
 from typing import Union
 from app.config import FEED_URL_GET_POST, FEED_URL_CHECK_POST
-import requests
 from app.users.schemas import User, UserCreate
-import httpx
+from app.http_clients import http_clients
 
 
 async def validate_password(password: str, user: Union[UserCreate, User]):
@@ -16,6 +15,8 @@ async def validate_password(password: str, user: Union[UserCreate, User]):
 
 
 def get_post(post_id: int):
+    import requests
+
     url = f'{FEED_URL_GET_POST}{post_id}'
     try:
         response = requests.get(url=url, timeout=8)
@@ -28,7 +29,7 @@ def get_post(post_id: int):
 
 async def check_post(post_id):
     url = f'{FEED_URL_CHECK_POST}{post_id}'
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url=url, timeout=8)
-        response.raise_for_status()
+    client = http_clients.get("feed")
+    response = await client.get(url=url)
+    response.raise_for_status()
     return response.json()
@@ -10,6 +10,7 @@ from app.users.models import User
 from app.lessons.models import Lesson
 from sqlalchemy import update, delete
 from app.courses.models import Course
+from app.dal import paginate_relationship
 
 
 class HomeWorkDAL:
@@ -28,6 +29,9 @@ class HomeWorkDAL:
         )
         return q.scalars().first()
 
+    async def get_hw_files_page(self, homework_id: int):
+        return await paginate_relationship(self.db_session, Homework.files, homework_id)
+
     async def create_hw(self, request: Homework):
         new_homework = Homework(
             title=request.title,
@@ -2,7 +2,6 @@ from fastapi import APIRouter, Depends, status
 from fastapi.responses import JSONResponse
 from fastapi_users import models as fastapi_model
 from app.pagination import CustomPage as Page
-from fastapi_pagination.paginator import paginate as paginate_list
 from app.auth.auth import fastapi_users
 
 from http import HTTPStatus
@@ -112,13 +111,12 @@ async def show_homework_files(
     homework_id: int,
     homework_dal: HomeWorkDAL = Depends(get_homework_dal),
 ):
-    homework_with_files = await homework_dal.get_hw_with_files(homework_id)
-    if not homework_with_files:
+    if not await homework_dal.check_hw(homework_id):
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"message": "Урока не существует"},
         )
-    return paginate_list(homework_with_files.files)
+    return await homework_dal.get_hw_files_page(homework_id)
 
 
 @router.delete('/core/homework/{homework_id}', status_code=HTTPStatus.NO_CONTENT)
@@ -9,5 +9,5 @@ class Homework(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(50), nullable=False)
     description = Column(Text)
-    lesson_id = Column(Integer, ForeignKey("Lessons.id"))
+    lesson_id = Column(Integer, ForeignKey("Lessons.id"), index=True)
     files = relationship('File', backref='homework')
@@ -0,0 +1,56 @@
+from typing import TYPE_CHECKING, Dict
+
+from app.config import HTTP2, HTTP_CLIENTS
+from app.monitoring.instruments import HTTP_EVENT_HOOKS
+
+if TYPE_CHECKING:
+    import httpx
+
+
+class HTTPClients:
+    """One pooled keep-alive AsyncClient per downstream service.
+
+    Clients are opened on startup and closed on shutdown in main.py;
+    ``get`` also opens a client on first use for code running outside the
+    app lifespan (scripts, tests).
+    """
+
+    def __init__(self, settings: Dict[str, dict], http2: bool = False):
+        self._settings = settings
+        self._http2 = http2
+        self._clients: Dict[str, "httpx.AsyncClient"] = {}
+
+    def _create(self, service: str) -> "httpx.AsyncClient":
+        import httpx
+
+        settings = self._settings[service]
+        return httpx.AsyncClient(
+            http2=self._http2,
+            event_hooks=HTTP_EVENT_HOOKS,
+            limits=httpx.Limits(
+                max_connections=settings["max_connections"],
+                max_keepalive_connections=settings["max_keepalive_connections"],
+                keepalive_expiry=settings["keepalive_expiry"],
+            ),
+            timeout=httpx.Timeout(
+                settings["timeout"], connect=settings["connect_timeout"]
+            ),
+        )
+
+    async def init(self):
+        for service in self._settings:
+            self.get(service)
+
+    def get(self, service: str) -> "httpx.AsyncClient":
+        client = self._clients.get(service)
+        if client is None or client.is_closed:
+            client = self._clients[service] = self._create(service)
+        return client
+
+    async def close(self):
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+
+http_clients = HTTPClients(HTTP_CLIENTS, http2=HTTP2)
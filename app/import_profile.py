@@ -0,0 +1,56 @@
+"""Import-time breakdown of ``import main``.
+
+Runs a fresh interpreter with ``-X importtime`` and sums the self time of
+every module per top-level package, then lists the slowest modules by
+cumulative time.
+
+    python -m app.import_profile --top 15
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(module: str = "main"):
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stderr
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        yield name.strip(), int(self_us), int(cumulative_us)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--module", default="main")
+    args = parser.parse_args()
+
+    modules = list(import_times(args.module))
+    packages = defaultdict(int)
+    for name, self_us, _ in modules:
+        packages[name.split(".")[0]] += self_us
+    total = sum(packages.values())
+
+    print(f"total {total / 1000:.1f} ms over {len(modules)} modules\n")
+    print(f"{'package':<30} {'self ms':>10} {'share':>7}")
+    for package, self_us in sorted(packages.items(), key=lambda i: -i[1])[: args.top]:
+        print(f"{package:<30} {self_us / 1000:>10.1f} {self_us / total:>7.1%}")
+
+    print(f"\n{'module':<50} {'cumulative ms':>14}")
+    for name, _, cumulative_us in sorted(modules, key=lambda m: -m[2])[: args.top]:
+        print(f"{name:<50} {cumulative_us / 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
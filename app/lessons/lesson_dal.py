@@ -10,6 +10,9 @@ from app.users.models import User
 from app.file.models import File
 from app.lessons.schemas import FileToLesson
 from app.tags.models import Tag
+from app.homework.models import Homework
+from app.dal import paginate_relationship
+from app.cache import response_cache
 
 
 class LessonDAL:
@@ -48,17 +51,15 @@ class LessonDAL:
 
     async def check_lesson_exists(self, lesson_id: int):
         q = await self.db_session.execute(
-            exists(select(Lesson.id).filter_by(id=lesson_id))
-        ).select()
+            exists(select(Lesson.id).filter_by(id=lesson_id)).select()
+        )
         return q.scalar()
 
-    async def get_lesson_with_homework(self, lesson_id):
-        user = await self.db_session.execute(
-            select(Lesson)
-            .options(selectinload(Lesson.homework), selectinload(Lesson.contents))
-            .filter(Lesson.id == lesson_id)
+    async def get_lesson_homework_page(self, lesson_id, title):
+        criteria = [Homework.title.like(f'{title}%')] if title else []
+        return await paginate_relationship(
+            self.db_session, Lesson.homework, lesson_id, *criteria
         )
-        return user.scalars().first()
 
     async def get_lesson_with_tags(self, lesson_id):
         user = await self.db_session.execute(
@@ -80,6 +81,7 @@ class LessonDAL:
             course_id=course_id,
         )
         self.db_session.add(new_lesson)
+        response_cache.invalidate_on_commit(self.db_session, f"course:{course_id}")
         return new_lesson
 
     async def update_lesson(self, lesson_id, title, description, estimated_time):
@@ -93,11 +95,17 @@ class LessonDAL:
         q.execution_options(synchronize_session="fetch")
         await self.db_session.execute(q)
         lesson = await self.get_lesson(lesson_id)
+        response_cache.invalidate_on_commit(
+            self.db_session, f"lesson:{lesson_id}", f"course:{lesson.course_id}"
+        )
         return lesson
 
     async def delete_lesson(self, lesson_id):
-        stmt = delete(Lesson).where(Lesson.id == lesson_id)
-        await self.db_session.execute(stmt)
+        stmt = delete(Lesson).where(Lesson.id == lesson_id).returning(Lesson.course_id)
+        course_id = (await self.db_session.execute(stmt)).scalar()
+        response_cache.invalidate_on_commit(
+            self.db_session, f"lesson:{lesson_id}", f"course:{course_id}"
+        )
 
     async def get_user_courses(self, user_id):
         user = await self.db_session.execute(
@@ -2,16 +2,17 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, status
 from fastapi.responses import JSONResponse
-from fastapi_pagination.paginator import paginate as paginate_list
 from fastapi_users import models as fastapi_model
 from app.auth.auth import fastapi_users
 from . import schemas
 from app.pagination import CustomPage as Page
-from elastic import es
+from app.search.indexer import search_indexer
 from app.homework.schemas import HomeworkOut
 from .lesson_dal import LessonDAL
 from .dependencies import get_lesson_dal
-from .additional_functions import send_lesson_notifications
+from app.notifications.outbox_dal import enqueue_notification
+from app.cache import response_cache
+from app.config import CACHE_TTL
 from http import HTTPStatus
 from starlette.responses import Response
 
@@ -20,6 +21,7 @@ router = APIRouter(tags=['Lesson'])
 
 
 @router.get('/core/lesson/{lesson_id}', status_code=200)
+@response_cache.cached("lesson:{lesson_id}", CACHE_TTL)
 async def show_lesson(lesson_id: int, lesson_dal: LessonDAL = Depends(get_lesson_dal)):
     lesson = await lesson_dal.get_lesson(lesson_id)
     if not lesson:
@@ -50,21 +52,10 @@ async def create_lesson(
     new_lesson = await lesson_dal.create_lesson(
         request.title, request.description, request.estimated_time, request.course_id
     )
-    await send_lesson_notifications(user.id, course.title)
-    try:
-        doc = {
-            "title": request.title,
-            "description": request.description,
-            "estimated_time": request.estimated_time,
-            "course_id": request.course_id,
-            "tags": [],
-        }
-        await es.index("lessons", id=new_lesson.id, body=doc)
-    except Exception as e:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"message": f"Ошибка в апдейте elastic search: {e}"},
-        )
+    await enqueue_notification(
+        lesson_dal.db_session, "lesson", user_id=str(user.id), course_title=course.title
+    )
+    search_indexer.enqueue_on_commit(lesson_dal.db_session, "lessons", new_lesson.id)
     return new_lesson
 
 
@@ -89,20 +80,7 @@ async def update_lesson(
     lesson = await lesson_dal.update_lesson(
         lesson_id, request.title, request.description, request.estimated_time
     )
-    try:
-        doc = {
-            "doc": {
-                "title": lesson.title,
-                "description": lesson.description,
-                "estimated_time": lesson.estimated_time,
-            }
-        }
-        await es.update("lessons", id=lesson_id, body=doc)
-    except Exception as e:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"message": f"Ошибка в апдейте elastic search: {e}"},
-        )
+    search_indexer.enqueue_on_commit(lesson_dal.db_session, "lessons", lesson_id)
     return lesson
 
 
@@ -125,13 +103,7 @@ async def delete_lesson(
             content={"message": "Вы не можете удалить этот урок"},
         )
     deletion = await lesson_dal.delete_lesson(lesson_id)
-    try:
-        await es.delete("lessons", id=lesson.id)
-    except Exception as e:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"message": f"Ошибка в апдейте elastic search: {e}"},
-        )
+    search_indexer.enqueue_on_commit(lesson_dal.db_session, "lessons", lesson.id)
     return Response(status_code=204)
 
 
@@ -164,18 +136,12 @@ async def show_lessons_homework(
     lesson_dal: LessonDAL = Depends(get_lesson_dal),
     title: Optional[str] = None,
 ):
-    lesson = await lesson_dal.get_lesson_with_homework(lesson_id)
-    if not lesson:
+    if not await lesson_dal.check_lesson_exists(lesson_id):
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"message": "Урок не найден"},
         )
-    if title:
-        filtered_homework = [
-            homework for homework in lesson.homework if homework.title.startswith(title)
-        ]
-        return paginate_list(filtered_homework)
-    return paginate_list(lesson.homework)
+    return await lesson_dal.get_lesson_homework_page(lesson_id, title)
 
 
 @router.post('/core/tag/add', status_code=200)
@@ -214,20 +180,12 @@ async def add_tag_to_lesson(
             content={"message": "Тэг уже привязан"},
         )
     lesson.tags.append(tag)
-    try:
-        doc = {
-            "script": {
-                "source": "ctx._source.tags.add(params.tag)",
-                "lang": "painless",
-                "params": {"tag": tag.title},
-            }
-        }
-        await es.update("lessons", id=request.lesson_id, body=doc)
-    except Exception as e:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"message": f"Ошибка в апдейте elastic search: {e}"},
-        )
+    response_cache.invalidate_on_commit(
+        lesson_dal.db_session, f"lesson:{request.lesson_id}"
+    )
+    search_indexer.enqueue_on_commit(
+        lesson_dal.db_session, "lessons", request.lesson_id
+    )
     return JSONResponse(content={"message": "Успешно привязано"})
 
 
@@ -267,18 +225,10 @@ async def unbound_tag_to_lesson(
             content={"message": "Тэг не был привязан к уроку"},
         )
     lesson.tags.remove(tag)
-    try:
-        body_script = {
-            "script": {
-                "source": "if (ctx._source.tags.contains(params.tag)) { ctx._source.tags.remove(ctx._source.tags.indexOf(params.tag)) }",
-                "lang": "painless",
-                "params": {"tag": tag.title},
-            }
-        }
-        await es.update("lessons", id=request.lesson_id, body=body_script)
-    except Exception as e:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"message": f"Ошибка в апдейте elastic search: {e}"},
-        )
+    response_cache.invalidate_on_commit(
+        lesson_dal.db_session, f"lesson:{request.lesson_id}"
+    )
+    search_indexer.enqueue_on_commit(
+        lesson_dal.db_session, "lessons", request.lesson_id
+    )
     return Response(status_code=204)
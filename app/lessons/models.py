@@ -6,8 +6,8 @@ from app.database import Base
 lessons_tags_association = Table(
     'lessons-tags',
     Base.metadata,
-    Column('Lesson_id', Integer, ForeignKey('Lessons.id')),
-    Column('Tag_id', Integer, ForeignKey('Tags.id')),
+    Column('Lesson_id', Integer, ForeignKey('Lessons.id'), primary_key=True),
+    Column('Tag_id', Integer, ForeignKey('Tags.id'), primary_key=True, index=True),
 )
 
 
@@ -19,7 +19,7 @@ class Lesson(Base):
     contents = relationship('Content', backref='lesson')
     rating = Column(Integer, nullable=True)
     estimated_time = Column(String(50), nullable=False)
-    course_id = Column(Integer, ForeignKey("Courses.id"))
+    course_id = Column(Integer, ForeignKey("Courses.id"), index=True)
     homework = relationship('Homework', backref='lesson')
     tags = relationship(
         'Tag', secondary=lessons_tags_association, backref='lessons', lazy='joined'
@@ -1,8 +1,15 @@
 from app.database import async_session
 from .middleware_dal import MiddlewareDAL
+from .subscription_dal import SubscriptionDAL
 
 
 async def get_middleware_dal():
     async with async_session() as session:
         async with session.begin():
             yield MiddlewareDAL(session)
+
+
+async def get_subscription_dal():
+    async with async_session() as session:
+        async with session.begin():
+            yield SubscriptionDAL(session)
@@ -1,10 +1,11 @@
-from app.middleware.achievements import get_achievements
+from app.achievements.events import achievement_events
 from fastapi import APIRouter, Depends, status
 from fastapi.responses import JSONResponse
 from . import schemas
-from .additional_functions import send_subscription_notifications
+from app.notifications.outbox_dal import enqueue_notification
 from .middleware_dal import MiddlewareDAL
-from .dependency import get_middleware_dal
+from .dependency import get_middleware_dal, get_subscription_dal
+from .subscription_dal import SubscriptionDAL
 from pydantic import UUID4
 from app.users.schemas import UserOut
 from app.file.schemas import Avatar, Content
@@ -14,6 +15,7 @@ from app.courses.schemas import MyCourseOut
 from app.content.dependencies import get_content_dal
 from app.content.content_dal import ContentDAL
 from app.lessons.schemas import LessonOut
+from app.users.helper_functions import load_user_counters
 
 
 router = APIRouter(tags=['Middleware'])
@@ -113,138 +115,108 @@ async def get_user_followers(
     return [user, followers]
 
 
+def _subscription_error(result):
+    if not result.user_exists:
+        return "Пользователя не существует"
+    if result.course_id is None:
+        return "Курса не найдено"
+    if not result.owner_exists:
+        return "Владельца курса не найдено"
+    if not result.subscribed:
+        return "Вы уже подписаны на курс"
+    return None
+
+
+def _unsubscription_error(result):
+    if not result.user_exists:
+        return "Пользователь не найден"
+    if not result.course_exists:
+        return "Курса не найдено"
+    if not result.unsubscribed:
+        return "Вы не подписаны"
+    return None
+
+
+async def _check_email_owner(subscription_dal: SubscriptionDAL, request):
+    """Return the id of the user owning ``request.email``, or an error response."""
+    user_id = await subscription_dal.get_user_id_by_email(request.email)
+    if user_id is None:
+        return None, JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content="Пользователь не найден",
+        )
+    if str(user_id) != str(request.user_id):
+        return None, JSONResponse(
+            status_code=status.HTTP_403_FORBIDDEN,
+            content="Запрещено",
+        )
+    return user_id, None
+
+
 @router.post('/core/middleware/course/subscribe')
 async def subscribe_to_course(
     request: schemas.Subscription,
-    middleware_dal: MiddlewareDAL = Depends(get_middleware_dal),
+    subscription_dal: SubscriptionDAL = Depends(get_subscription_dal),
 ):
-    course = await middleware_dal.get_course(request.course_id)
-    user = await middleware_dal.get_user_with_sub_course(request.user_id)
-    if not user:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content="Пользователя не существует",
-        )
-    if course in user.subscribed_courses:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content="Вы уже подписаны на курс",
-        )
-    if not course:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content="Курса не найдено",
-        )
-    course_owner = await middleware_dal.get_user_by_course(course.user_id)
-    if not course_owner:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content="Владельца курса не найдено",
-        )
-    if not course_owner.sold_courses:
-        course_owner.sold_courses = 0
-    course_owner.sold_courses += 1
-    user.subscribed_courses.append(course)
-    await send_subscription_notifications(user.id, course)
-    await get_achievements(course.user_id, middleware_dal)
+    result = await subscription_dal.subscribe(request.user_id, request.course_id)
+    error = _subscription_error(result)
+    if error:
+        return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content=error)
+    await enqueue_notification(
+        subscription_dal.db_session,
+        "subscription",
+        user_id=str(request.user_id),
+        course_title=result.title,
+        owner_id=str(result.owner_id),
+    )
+    achievement_events.publish_on_commit(
+        subscription_dal.db_session, result.owner_id, "students"
+    )
     return "Вы подписались на курс"
 
 
 @router.post('/core/middleware/course/email-subscribe')
 async def subscribe_to_course_by_email(
     request: schemas.EmailSubscription,
-    middleware_dal: MiddlewareDAL = Depends(get_middleware_dal),
+    subscription_dal: SubscriptionDAL = Depends(get_subscription_dal),
 ):
-    course = await middleware_dal.get_course(request.course_id)
-    user = await middleware_dal.get_user_with_sub_cours_by_email(request.email)
-    if not user:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content="Пользователь не найден",
-        )
-    if str(user.id) != str(request.user_id):
-        return JSONResponse(
-            status_code=status.HTTP_403_FORBIDDEN,
-            content="Запрещено",
-        )
-    if course in user.subscribed_courses:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content="Вы уже подписаны на курс",
-        )
-    if not course:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content="Курса не найдено",
-        )
-    course_owner = await middleware_dal.get_user_by_course(course.user_id)
-    if not course_owner:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content="Владельца курса не найдено",
-        )
-    if not course_owner.sold_courses:
-        course_owner.sold_courses = 0
-    course_owner.sold_courses += 1
-    user.subscribed_courses.append(course)
-    await get_achievements(course.user_id, middleware_dal)
+    user_id, response = await _check_email_owner(subscription_dal, request)
+    if response:
+        return response
+    result = await subscription_dal.subscribe(user_id, request.course_id)
+    error = _subscription_error(result)
+    if error:
+        return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content=error)
+    achievement_events.publish_on_commit(
+        subscription_dal.db_session, result.owner_id, "students"
+    )
     return "Вы подписались на курс"
 
 
 @router.post('/core/middleware/course/unsubscribe')
 async def unsubscribe_to_course(
     request: schemas.Subscription,
-    middleware_dal: MiddlewareDAL = Depends(get_middleware_dal),
+    subscription_dal: SubscriptionDAL = Depends(get_subscription_dal),
 ):
-    course = await middleware_dal.get_course(request.course_id)
-    user = await middleware_dal.get_user_with_sub_course(request.user_id)
-    if not user:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content="Пользователь не найден",
-        )
-    if course not in user.subscribed_courses:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content="Вы не подписаны",
-        )
-    if not course:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content="Курса не найдено",
-        )
-    user.subscribed_courses.remove(course)
+    result = await subscription_dal.unsubscribe(request.user_id, request.course_id)
+    error = _unsubscription_error(result)
+    if error:
+        return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content=error)
     return "Курс удален из подписок"
 
 
 @router.post('/core/middleware/course/email-unsubscribe')
 async def unsubscribe_to_course_by_email(
     request: schemas.EmailSubscription,
-    middleware_dal: MiddlewareDAL = Depends(get_middleware_dal),
+    subscription_dal: SubscriptionDAL = Depends(get_subscription_dal),
 ):
-    course = await middleware_dal.get_course(request.course_id)
-    user = await middleware_dal.get_user_with_sub_cours_by_email(request.email)
-    if not user:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content="Пользователь не найден",
-        )
-    if str(user.id) != str(request.user_id):
-        return JSONResponse(
-            status_code=status.HTTP_403_FORBIDDEN,
-            content="Запрещено",
-        )
-    if course not in user.subscribed_courses:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content="Вы не подписаны",
-        )
-    if not course:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content="Курса не найдено",
-        )
-    user.subscribed_courses.remove(course)
+    user_id, response = await _check_email_owner(subscription_dal, request)
+    if response:
+        return response
+    result = await subscription_dal.unsubscribe(user_id, request.course_id)
+    error = _unsubscription_error(result)
+    if error:
+        return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content=error)
     return "Курс удален из подписок"
 
 
@@ -254,19 +226,14 @@ async def add_achievement(
     quantity,
     middleware_dal: MiddlewareDAL = Depends(get_middleware_dal),
 ):
-    user = await middleware_dal.get_user_with_achievements(user_id)
-    if quantity == '100000':
-        title = '100000 комментариев'
-        achievement = await middleware_dal.get_achievements_by_title(title)
-        user.achievements.append(achievement)
-    if quantity == '10000':
-        title = '10000 комментариев'
-        achievement = await middleware_dal.get_achievements_by_title(title)
-        user.achievements.append(achievement)
-    if quantity == '1000':
-        title = '1000 комментариев'
-        achievement = await middleware_dal.get_achievements_by_title(title)
-        user.achievements.append(achievement)
+    if not quantity.isdigit() or not await middleware_dal.check_user(user_id):
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content="Некорректный запрос",
+        )
+    achievement_events.publish_on_commit(
+        middleware_dal.db_session, user_id, "comments", int(quantity)
+    )
     return 'ok'
 
 
@@ -280,6 +247,7 @@ async def get_course_obj(
             status_code=status.HTTP_400_BAD_REQUEST,
             content="Курса не найдено",
         )
+    await load_user_counters([course.user])
     return MyCourseOut.from_orm(course)
 
 
@@ -306,6 +274,7 @@ async def get_user_obj(
             status_code=status.HTTP_400_BAD_REQUEST,
             content="Пользователя не найдено",
         )
+    await load_user_counters([user])
     return UserOut.from_orm(user)
 
 
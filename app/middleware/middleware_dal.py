@@ -7,8 +7,7 @@ from app.users.models import User, user_following
 from app.homework.models import Homework
 from app.achievements.models import Achievement
 from sqlalchemy.sql.expression import exists
-from app.config import SECRET
-from fastapi_users.utils import JWT_ALGORITHM, generate_jwt
+from app.middleware.service_token import service_token
 
 
 class MiddlewareDAL:
@@ -61,10 +60,6 @@ class MiddlewareDAL:
         )
         return user.scalars().first()
 
-    async def get_user_by_course(self, user_id):
-        user = await self.db_session.execute(select(User).filter(User.id == user_id))
-        return user.scalars().first()
-
     async def check_lesson(self, lesson_id):
         q = await self.db_session.execute(
             exists(select(Lesson.id).filter_by(id=lesson_id)).select()
@@ -112,54 +107,12 @@ class MiddlewareDAL:
         )
         return users.scalars().all()
 
-    async def get_user_with_sub_course(self, user_id):
-        user = await self.db_session.execute(
-            select(User)
-            .options(selectinload(User.subscribed_courses))
-            .filter(User.id == user_id)
-        )
-        return user.scalars().first()
-
-    async def get_user_with_sub_cours_by_email(self, email):
-        user = await self.db_session.execute(
-            select(User)
-            .options(selectinload(User.subscribed_courses))
-            .filter(User.email == email)
-        )
-        return user.scalars().first()
-
-    async def get_by_title(self, title):
-        q = await self.db_session.execute(select(Achievement).filter_by(title=title))
-        return q.scalars().first()
-
-    async def get_user_with_achievements(self, user_id):
-        user = await self.db_session.execute(
-            select(User)
-            .options(selectinload(User.achievements))
-            .filter(User.id == user_id)
-        )
-        return user.scalars().first()
-
     async def get_user_with_courses(self, user_id):
         user = await self.db_session.execute(
             select(User).options(selectinload(User.courses)).filter(User.id == user_id)
         )
         return user.scalars().first()
 
-    async def get_course_with_subs(self, user_id):
-        course = await self.db_session.execute(
-            select(Course)
-            .options(selectinload(Course.subscribers), selectinload(Course.user))
-            .filter(User.id == user_id)
-        )
-        return course.scalars().all()
-
-    async def get_achievements_by_title(self, title):
-        user = await self.db_session.execute(
-            select(Achievement).filter(Achievement.title == title)
-        )
-        return user.scalars().first()
-
     async def get_user_by_username(self):
         user = await self.db_session.execute(
             select(User).filter(User.is_superuser == True)
@@ -167,7 +120,4 @@ class MiddlewareDAL:
         return user.scalars().first()
 
     async def get_superuser_token(self):
-        user = await self.get_user_by_username()
-        data = {"user_id": str(user.id), "aud": ["fastapi-users:auth"]}
-        token = generate_jwt(data, SECRET, 60, JWT_ALGORITHM)
-        return token
+        return await service_token.get_token(self)
@@ -0,0 +1,52 @@
+import asyncio
+import time
+
+from fastapi_users.utils import JWT_ALGORITHM, generate_jwt
+
+from app.config import SECRET, SERVICE_TOKEN_LIFETIME, SERVICE_TOKEN_REFRESH_MARGIN
+
+
+class ServiceTokenProvider:
+    """Signed superuser JWT shared by all outbound service calls.
+
+    The token is reused until ``refresh_margin`` seconds before it expires.
+    Refreshes happen under a lock, so concurrent callers wait for a single
+    refresh instead of each querying the superuser and signing a token.
+    """
+
+    def __init__(self, lifetime: int, refresh_margin: int):
+        self.lifetime = lifetime
+        self.refresh_margin = refresh_margin
+        self._superuser_id = None
+        self._token = None
+        self._expires_at = 0.0
+        self._lock = None
+
+    def _fresh(self):
+        return self._token is not None and time.monotonic() < self._expires_at
+
+    async def get_token(self, middleware_dal):
+        if self._fresh():
+            return self._token
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._fresh():
+                return self._token
+            if self._superuser_id is None:
+                superuser = await middleware_dal.get_user_by_username()
+                self._superuser_id = str(superuser.id)
+            data = {"user_id": self._superuser_id, "aud": ["fastapi-users:auth"]}
+            self._token = generate_jwt(data, SECRET, self.lifetime, JWT_ALGORITHM)
+            self._expires_at = time.monotonic() + self.lifetime - self.refresh_margin
+            return self._token
+
+    def invalidate(self):
+        self._superuser_id = None
+        self._token = None
+        self._expires_at = 0.0
+
+
+service_token = ServiceTokenProvider(
+    SERVICE_TOKEN_LIFETIME, SERVICE_TOKEN_REFRESH_MARGIN
+)
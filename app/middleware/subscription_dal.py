@@ -0,0 +1,114 @@
+from fastapi_users.db.sqlalchemy import GUID
+from sqlalchemy import delete, func, literal, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.future import select
+from sqlalchemy.sql.expression import exists
+
+from app.database import async_session as session
+from app.courses.models import Course
+from app.users.models import User, user_courses_association
+
+
+def _count(cte):
+    return select(func.count()).select_from(cte).scalar_subquery()
+
+
+class SubscriptionDAL:
+    """Course subscriptions as single statements.
+
+    Each call is one round trip whose cost does not depend on how many
+    courses the user already has: the association row is inserted or
+    deleted by key, and ``subscribers_count``/``sold_courses`` are moved
+    in SQL only when that row actually changed, so concurrent requests
+    cannot lose an increment.
+    """
+
+    def __init__(self, db_session: session):
+        self.db_session = db_session
+
+    async def subscribe(self, user_id, course_id):
+        """Return a row with ``user_exists``, ``course_id``, ``owner_id``,
+        ``title``, ``owner_exists`` and ``subscribed`` (0 when the user was
+        already subscribed or a check failed)."""
+        course = (
+            select(Course.id, Course.user_id, Course.title)
+            .where(Course.id == course_id)
+            .cte("course")
+        )
+        owner_id = select(course.c.user_id).scalar_subquery()
+        user_exists = exists().where(User.id == user_id)
+        owner_exists = exists().where(User.id == owner_id)
+        inserted = (
+            pg_insert(user_courses_association)
+            .from_select(
+                ["User_id", "Course_id"],
+                select(literal(user_id, GUID), course.c.id).where(
+                    user_exists, owner_exists
+                ),
+            )
+            .on_conflict_do_nothing()
+            .returning(user_courses_association.c.Course_id)
+            .cte("inserted")
+        )
+        counted = (
+            update(Course)
+            .where(Course.id.in_(select(inserted.c.Course_id)))
+            .values(subscribers_count=Course.subscribers_count + 1)
+            .returning(Course.id)
+            .cte("counted")
+        )
+        sold = (
+            update(User)
+            .where(User.id == owner_id, exists(select(inserted.c.Course_id)))
+            .values(sold_courses=func.coalesce(User.sold_courses, 0) + 1)
+            .returning(User.id)
+            .cte("sold")
+        )
+        result = await self.db_session.execute(
+            select(
+                user_exists.label("user_exists"),
+                select(course.c.id).scalar_subquery().label("course_id"),
+                owner_id.label("owner_id"),
+                select(course.c.title).scalar_subquery().label("title"),
+                owner_exists.label("owner_exists"),
+                _count(inserted).label("subscribed"),
+                # Selected so that the UPDATE CTEs are part of the statement.
+                _count(counted).label("counted"),
+                _count(sold).label("sold"),
+            )
+        )
+        return result.one()
+
+    async def unsubscribe(self, user_id, course_id):
+        """Return a row with ``user_exists``, ``course_exists`` and
+        ``unsubscribed``."""
+        deleted = (
+            delete(user_courses_association)
+            .where(
+                user_courses_association.c.User_id == user_id,
+                user_courses_association.c.Course_id == course_id,
+            )
+            .returning(user_courses_association.c.Course_id)
+            .cte("deleted")
+        )
+        counted = (
+            update(Course)
+            .where(Course.id.in_(select(deleted.c.Course_id)))
+            .values(subscribers_count=Course.subscribers_count - 1)
+            .returning(Course.id)
+            .cte("counted")
+        )
+        result = await self.db_session.execute(
+            select(
+                exists().where(User.id == user_id).label("user_exists"),
+                exists().where(Course.id == course_id).label("course_exists"),
+                _count(deleted).label("unsubscribed"),
+                # Selected so that the UPDATE CTE is part of the statement.
+                _count(counted).label("counted"),
+            )
+        )
+        return result.one()
+
+    async def get_user_id_by_email(self, email):
+        query = select(User.id).where(User.email == email)
+        return await self.db_session.scalar(query)
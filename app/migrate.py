@@ -0,0 +1,84 @@
+"""Apply the database schema once per deploy.
+
+    python -m app.migrate
+
+An empty database is created from the models and stamped at the Alembic
+head; anything else is upgraded to head. Workers never touch the schema:
+they only compare ``alembic_version`` with the head at boot
+(``check_schema_version``).
+"""
+import asyncio
+import logging
+import os
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import ProgrammingError
+
+from app.base import Base
+from app.database import engine
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(__file__)), "alembic.ini")
+
+
+class SchemaVersionError(RuntimeError):
+    pass
+
+
+def alembic_config() -> Config:
+    config = Config(ALEMBIC_INI)
+    config.set_main_option(
+        "script_location", os.path.join(os.path.dirname(ALEMBIC_INI), "alembic")
+    )
+    return config
+
+
+def head_revision() -> str:
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+async def _is_empty() -> bool:
+    async with engine.connect() as conn:
+        tables = await conn.run_sync(lambda sync: inspect(sync).get_table_names())
+    await engine.dispose()
+    return not tables
+
+
+async def _create_all():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+
+
+def migrate():
+    config = alembic_config()
+    if asyncio.run(_is_empty()):
+        logger.info("Empty database, creating schema from models")
+        asyncio.run(_create_all())
+        command.stamp(config, "head")
+    else:
+        command.upgrade(config, "head")
+
+
+async def check_schema_version():
+    """Fail fast when the database is not at the revision this code expects."""
+    expected = head_revision()
+    async with engine.connect() as conn:
+        try:
+            current = await conn.scalar(text("SELECT version_num FROM alembic_version"))
+        except ProgrammingError:
+            current = None
+    if current != expected:
+        raise SchemaVersionError(
+            f"Database schema is at {current}, expected {expected}; "
+            "run `python -m app.migrate`"
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    migrate()
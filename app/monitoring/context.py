@@ -0,0 +1,90 @@
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+UNMATCHED = "unmatched"
+
+_PARAMS = re.compile(r"(\$\d+|%\(\w+\)s|\?)(\s*,\s*(\$\d+|%\(\w+\)s|\?))*")
+
+
+def statement_shape(statement: str) -> str:
+    """Collapse bind parameter lists so ``IN ($1, $2)`` and ``IN ($1)`` match."""
+    return _PARAMS.sub("?", " ".join(statement.split()))
+
+
+class RequestContext:
+    """Per-request state shared by the instrumentation hooks."""
+
+    KINDS = ("db", "redis", "es", "http")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.started = time.perf_counter()
+        self.calls = dict.fromkeys(self.KINDS, 0)
+        self.time = dict.fromkeys(self.KINDS, 0.0)
+        self.statements = Counter()
+
+    @property
+    def route(self):
+        return route_template(self.scope)
+
+    @property
+    def queries(self):
+        return self.calls["db"]
+
+    def record(self, kind: str, elapsed: float):
+        self.calls[kind] += 1
+        self.time[kind] += elapsed
+
+    def repeated_statements(self, threshold: int):
+        """Statement shapes executed more than ``threshold`` times."""
+        shapes = Counter()
+        for statement, count in self.statements.items():
+            shapes[statement_shape(statement)] += count
+        return {shape: count for shape, count in shapes.items() if count > threshold}
+
+    def server_timing(self) -> str:
+        total = (time.perf_counter() - self.started) * 1000
+        parts = [
+            f'{kind};dur={self.time[kind] * 1000:.1f};desc="{self.calls[kind]} calls"'
+            for kind in self.KINDS
+            if self.calls[kind]
+        ]
+        parts.append(f"total;dur={total:.1f}")
+        return ", ".join(parts)
+
+
+request_context: ContextVar[Optional[RequestContext]] = ContextVar(
+    "request_context", default=None
+)
+
+_templates = {}
+
+
+def route_template(scope) -> str:
+    """Path template of the matched route, e.g. ``/core/courses/{course_id}``.
+
+    The router stores the matched endpoint in the scope before calling the
+    handler; templates keep metric labels bounded, unlike raw paths.
+    """
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return UNMATCHED
+    if endpoint not in _templates:
+        for route in scope["app"].routes:
+            if getattr(route, "endpoint", None) is not None:
+                _templates[route.endpoint] = route.path
+    return _templates.get(endpoint, UNMATCHED)
+
+
+def current_route() -> Optional[str]:
+    ctx = request_context.get()
+    return ctx.route if ctx is not None else None
+
+
+def record(kind: str, elapsed: float):
+    ctx = request_context.get()
+    if ctx is not None:
+        ctx.record(kind, elapsed)
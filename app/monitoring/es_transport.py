@@ -0,0 +1,25 @@
+import time
+
+from elasticsearch import AsyncTransport, TransportError
+
+from app.monitoring.context import record
+from app.monitoring.metrics import ES_ERRORS, ES_REQUEST_DURATION
+
+
+class InstrumentedTransport(AsyncTransport):
+    async def perform_request(
+        self, method, url, headers=None, params=None, body=None
+    ):
+        start = time.perf_counter()
+        try:
+            return await super().perform_request(method, url, headers, params, body)
+        except TransportError as e:
+            ES_ERRORS.labels(str(e.status_code)).inc()
+            raise
+        except Exception as e:
+            ES_ERRORS.labels(type(e).__name__).inc()
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            ES_REQUEST_DURATION.labels(method).observe(elapsed)
+            record("es", elapsed)
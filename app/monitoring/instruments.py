@@ -0,0 +1,63 @@
+"""Timing hooks for Redis and outbound HTTP calls.
+
+Each hook feeds the service's Prometheus metrics and adds its call to the
+current RequestContext, if any. Elasticsearch is timed by
+``app.monitoring.es_transport``, loaded with the client.
+"""
+import asyncio
+import time
+from functools import wraps
+
+from app.monitoring.context import record
+from app.monitoring.metrics import (
+    HTTP_CLIENT_DURATION,
+    HTTP_CLIENT_RESPONSES,
+    REDIS_COMMAND_DURATION,
+    REDIS_ERRORS,
+)
+
+
+def instrument_methods(kind: str, exclude=()):
+    """Class decorator timing every coroutine method not in ``exclude``."""
+
+    def timed(name, method):
+        duration = REDIS_COMMAND_DURATION.labels(name)
+        errors = REDIS_ERRORS.labels(name)
+
+        @wraps(method)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await method(*args, **kwargs)
+            except Exception:
+                errors.inc()
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                duration.observe(elapsed)
+                record(kind, elapsed)
+
+        return wrapper
+
+    def decorator(cls):
+        for name, method in list(vars(cls).items()):
+            if asyncio.iscoroutinefunction(method) and name not in exclude:
+                setattr(cls, name, timed(name, method))
+        return cls
+
+    return decorator
+
+
+async def _on_request(request):
+    request.extensions["started"] = time.perf_counter()
+
+
+async def _on_response(response):
+    elapsed = time.perf_counter() - response.request.extensions["started"]
+    host = response.request.url.host
+    HTTP_CLIENT_DURATION.labels(host).observe(elapsed)
+    HTTP_CLIENT_RESPONSES.labels(host, str(response.status_code)).inc()
+    record("http", elapsed)
+
+
+HTTP_EVENT_HOOKS = {"request": [_on_request], "response": [_on_response]}
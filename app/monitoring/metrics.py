@@ -0,0 +1,79 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+DB_QUERIES = Counter("db_queries_total", "SQL statements executed", ["route"])
+DB_SLOW_QUERIES = Counter(
+    "db_slow_queries_total", "SQL statements slower than SQL_SLOW_QUERY_MS", ["route"]
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "SQL statement duration", ["route"]
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "SQL statements issued by one request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250),
+)
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Request handling time", ["route"]
+)
+REQUEST_DEPENDENCY_TIME = Histogram(
+    "request_dependency_seconds",
+    "Time one request spent waiting on a backing service",
+    ["route", "dependency"],
+)
+REQUEST_DEPENDENCY_CALLS = Histogram(
+    "request_dependency_calls",
+    "Calls one request made to a backing service",
+    ["route", "dependency"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250),
+)
+N_PLUS_ONE = Counter(
+    "db_repeated_statement_requests_total",
+    "Requests that repeated one statement shape too many times",
+    ["route"],
+)
+
+DB_POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    ["pool"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total", "Pool checkouts that timed out", ["pool"]
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Pooled connections by state, summed over live workers",
+    ["pool", "state"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Configured pool capacity, summed over live workers",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds", "RedisCache command latency", ["command"]
+)
+REDIS_ERRORS = Counter("redis_errors_total", "Failed RedisCache commands", ["command"])
+
+ES_REQUEST_DURATION = Histogram(
+    "es_request_duration_seconds", "Elasticsearch request latency", ["method"]
+)
+ES_ERRORS = Counter("es_errors_total", "Failed Elasticsearch requests", ["status"])
+
+HTTP_CLIENT_DURATION = Histogram(
+    "http_client_request_duration_seconds",
+    "Outbound HTTP latency until response headers",
+    ["host"],
+)
+HTTP_CLIENT_RESPONSES = Counter(
+    "http_client_responses_total", "Outbound HTTP responses", ["host", "status"]
+)
+
+CACHE_REQUESTS = Counter(
+    "response_cache_requests_total", "Response cache lookups", ["result"]
+)
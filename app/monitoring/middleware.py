@@ -0,0 +1,66 @@
+import json
+import logging
+import time
+
+from app.config import SERVER_TIMING, SQL_N_PLUS_ONE_THRESHOLD
+from app.monitoring.context import RequestContext, request_context
+from app.monitoring.metrics import (
+    DB_QUERIES_PER_REQUEST,
+    N_PLUS_ONE,
+    REQUEST_DEPENDENCY_CALLS,
+    REQUEST_DEPENDENCY_TIME,
+    REQUEST_DURATION,
+)
+
+logger = logging.getLogger("app.sql")
+
+
+class RequestContextMiddleware:
+    """Pure ASGI middleware that opens a RequestContext for each request.
+
+    Only the ``http.response.start`` message is touched (to add the
+    Server-Timing header), so body chunks stream through untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        ctx = RequestContext(scope)
+        token = request_context.set(ctx)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", ()))
+                headers.append((b"server-timing", ctx.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing if SERVER_TIMING else send)
+        finally:
+            request_context.reset(token)
+            self.observe(ctx)
+
+    @staticmethod
+    def observe(ctx: RequestContext):
+        route = ctx.route
+        REQUEST_DURATION.labels(route).observe(time.perf_counter() - ctx.started)
+        DB_QUERIES_PER_REQUEST.labels(route).observe(ctx.queries)
+        for kind in ctx.KINDS:
+            REQUEST_DEPENDENCY_CALLS.labels(route, kind).observe(ctx.calls[kind])
+            REQUEST_DEPENDENCY_TIME.labels(route, kind).observe(ctx.time[kind])
+
+        repeated = ctx.repeated_statements(SQL_N_PLUS_ONE_THRESHOLD)
+        if repeated:
+            N_PLUS_ONE.labels(route).inc()
+            for shape, count in repeated.items():
+                record = {
+                    "event": "repeated_statement",
+                    "route": route,
+                    "count": count,
+                    "statement": shape[:2000],
+                }
+                logger.warning(json.dumps(record, ensure_ascii=False))
@@ -0,0 +1,22 @@
+import os
+
+from fastapi import APIRouter
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+from prometheus_client import CollectorRegistry, multiprocess
+from starlette.responses import Response
+
+router = APIRouter(tags=['Monitoring'])
+
+
+def _registry():
+    """Aggregate every gunicorn worker's samples when multiprocess mode is on."""
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+@router.get('/core/metrics', include_in_schema=False)
+async def metrics():
+    return Response(generate_latest(_registry()), media_type=CONTENT_TYPE_LATEST)
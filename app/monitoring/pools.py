@@ -0,0 +1,95 @@
+"""Connection pool metrics.
+
+Checkout waits are timed inside the pool itself. Pool occupancy is
+sampled into gauges by ``PoolSampler`` because custom collectors are not
+supported by prometheus_client's multiprocess mode.
+"""
+import asyncio
+import logging
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.config import METRICS_SAMPLE_INTERVAL
+from app.monitoring.metrics import (
+    DB_POOL_CONNECTIONS,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUTS,
+    DB_POOL_WAIT,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long checkouts wait."""
+
+    metrics_name = "sqlalchemy"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            DB_POOL_TIMEOUTS.labels(self.metrics_name).inc()
+            raise
+        finally:
+            DB_POOL_WAIT.labels(self.metrics_name).observe(
+                time.perf_counter() - start
+            )
+
+
+def sqlalchemy_pool_stats(pool):
+    checked_out = pool.checkedout()
+    return {
+        "size": pool.size() + pool._max_overflow,
+        "checked_out": checked_out,
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+    }
+
+
+class PoolSampler:
+    """Periodically copies pool occupancy into the pool gauges."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._sources = {}
+        self._task = None
+
+    def register(self, name, read_stats):
+        self._sources[name] = read_stats
+
+    def sample(self):
+        for name, read_stats in self._sources.items():
+            stats = read_stats()
+            if stats is None:
+                continue
+            DB_POOL_SIZE.labels(name).set(stats.pop("size"))
+            for state, value in stats.items():
+                DB_POOL_CONNECTIONS.labels(name, state).set(value)
+
+    async def _run(self):
+        while True:
+            try:
+                self.sample()
+            except Exception as e:
+                logger.warning("Pool sampling failed: %s", e)
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+pool_sampler = PoolSampler(METRICS_SAMPLE_INTERVAL)
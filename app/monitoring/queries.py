@@ -0,0 +1,63 @@
+"""SQL instrumentation through engine events.
+
+Every statement is timed and counted against the current route. A sample
+of statements (``SQL_LOG_SAMPLE_RATE``) and every statement slower than
+``SQL_SLOW_QUERY_MS`` is logged as one JSON line on the ``app.sql``
+logger. Parameters are never logged.
+"""
+import json
+import logging
+import random
+import time
+
+from sqlalchemy import event
+
+from app.config import SQL_LOG_SAMPLE_RATE, SQL_SLOW_QUERY_MS
+from app.monitoring.context import request_context
+from app.monitoring.metrics import DB_QUERIES, DB_QUERY_DURATION, DB_SLOW_QUERIES
+
+logger = logging.getLogger("app.sql")
+
+BACKGROUND = "background"
+
+
+def _before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    ctx = request_context.get()
+    route = BACKGROUND
+    if ctx is not None:
+        route = ctx.route
+        ctx.record("db", elapsed)
+        ctx.statements[statement] += 1
+    DB_QUERIES.labels(route).inc()
+    DB_QUERY_DURATION.labels(route).observe(elapsed)
+
+    slow = elapsed * 1000 >= SQL_SLOW_QUERY_MS
+    if slow:
+        DB_SLOW_QUERIES.labels(route).inc()
+    if slow or (SQL_LOG_SAMPLE_RATE and random.random() < SQL_LOG_SAMPLE_RATE):
+        record = {
+            "event": "slow_query" if slow else "query",
+            "route": route,
+            "duration_ms": round(elapsed * 1000, 2),
+            "statement": " ".join(statement.split())[:2000],
+        }
+        level = logging.WARNING if slow else logging.INFO
+        logger.log(level, json.dumps(record, ensure_ascii=False))
+
+
+def instrument_engine(engine):
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if not event.contains(
+        sync_engine, "before_cursor_execute", _before_cursor_execute
+    ):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
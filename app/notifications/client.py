@@ -0,0 +1,18 @@
+from http import HTTPStatus
+
+from app.config import MIDDLEWARE_URL_SEND_NOTIFICATIONS
+from app.http_clients import http_clients
+from app.middleware.service_token import service_token
+
+
+async def post_notification(data: dict, token: str):
+    headers = {'Authorization': f'Bearer {token}'}
+    client = http_clients.get("middleware")
+    response = await client.post(
+        url=MIDDLEWARE_URL_SEND_NOTIFICATIONS, json=data, headers=headers
+    )
+    if response.status_code == HTTPStatus.UNAUTHORIZED:
+        # The superuser may have been recreated; sign a new token next time.
+        service_token.invalidate()
+    response.raise_for_status()
+    return response.json()
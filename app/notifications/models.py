@@ -0,0 +1,21 @@
+from sqlalchemy import JSON, Column, DateTime, Integer, String, Text
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+PENDING = 'pending'
+DEAD = 'dead'
+
+
+class OutboxNotification(Base):
+    __tablename__ = 'NotificationOutbox'
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(50), nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(String(20), nullable=False, default=PENDING, index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    last_error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete
+from sqlalchemy.future import select
+from sqlalchemy.sql import func
+
+from app.database import async_session as session
+from app.notifications.models import DEAD, PENDING, OutboxNotification
+
+
+class OutboxDAL:
+    def __init__(self, db_session: session):
+        self.db_session = db_session
+
+    async def enqueue(self, kind: str, payload: dict):
+        notification = OutboxNotification(kind=kind, payload=payload, status=PENDING)
+        self.db_session.add(notification)
+        return notification
+
+    async def claim_batch(self, limit: int, lease: float):
+        """Lock up to ``limit`` due rows and push them ``lease`` seconds out.
+
+        Once the transaction commits, other workers skip the rows until the
+        lease runs out; a worker that dies mid-delivery therefore only
+        delays them.
+        """
+        q = await self.db_session.execute(
+            select(OutboxNotification)
+            .filter(
+                OutboxNotification.status == PENDING,
+                OutboxNotification.next_attempt_at <= func.now(),
+            )
+            .order_by(OutboxNotification.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        notifications = q.scalars().all()
+        leased_until = datetime.now(timezone.utc) + timedelta(seconds=lease)
+        for notification in notifications:
+            notification.next_attempt_at = leased_until
+        return notifications
+
+    async def get_many(self, notification_ids):
+        if not notification_ids:
+            return []
+        q = await self.db_session.execute(
+            select(OutboxNotification).where(
+                OutboxNotification.id.in_(notification_ids)
+            )
+        )
+        return q.scalars().all()
+
+    async def delete_sent(self, notification_ids):
+        if notification_ids:
+            await self.db_session.execute(
+                delete(OutboxNotification).where(
+                    OutboxNotification.id.in_(notification_ids)
+                )
+            )
+
+    def mark_failed(
+        self,
+        notification: OutboxNotification,
+        error: Exception,
+        max_attempts: int,
+        backoff: float,
+        backoff_max: float,
+    ):
+        notification.attempts += 1
+        notification.last_error = repr(error)[:2000]
+        if notification.attempts >= max_attempts:
+            notification.status = DEAD
+            return
+        delay = min(backoff * 2 ** (notification.attempts - 1), backoff_max)
+        notification.next_attempt_at = datetime.now(timezone.utc) + timedelta(
+            seconds=delay
+        )
+
+
+async def enqueue_notification(db_session, kind: str, **payload):
+    """Store a notification in the caller's transaction.
+
+    It is delivered by app.notifications.worker after the transaction
+    commits, so the request never waits on the middleware service.
+    """
+    return await OutboxDAL(db_session).enqueue(kind, payload)
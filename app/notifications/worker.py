@@ -0,0 +1,167 @@
+import asyncio
+import logging
+
+from app.config import (
+    OUTBOX_BACKOFF_MAX,
+    OUTBOX_BACKOFF_SECONDS,
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_LEASE_SECONDS,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_POLL_INTERVAL,
+)
+from app.courses.additional_functions import build_course_notification
+from app.database import async_session
+from app.follows.additional_functions import build_follow_notification
+from app.lessons.additional_functions import build_lesson_notification
+from app.middleware.additional_functions import build_subscription_notification
+from app.middleware.middleware_dal import MiddlewareDAL
+from app.notifications.client import post_notification
+from app.notifications.outbox_dal import OutboxDAL
+
+logger = logging.getLogger(__name__)
+
+BUILDERS = {
+    "course": build_course_notification,
+    "lesson": build_lesson_notification,
+    "follow": build_follow_notification,
+    "subscription": build_subscription_notification,
+}
+
+
+class NotificationWorker:
+    """Drains the notification outbox in the background.
+
+    Each pass claims up to ``batch_size`` due rows with
+    ``FOR UPDATE SKIP LOCKED`` and commits them with ``next_attempt_at``
+    pushed out by ``lease`` seconds, so several app workers can drain the
+    table concurrently without holding locks or a connection while posting.
+    Payloads are then built, posted in parallel outside any transaction,
+    and a second short transaction deletes the delivered rows.
+    Failed rows are retried with exponential backoff and marked ``dead``
+    after ``max_attempts``.
+    """
+
+    def __init__(
+        self,
+        builders,
+        batch_size: int,
+        poll_interval: float,
+        max_attempts: int,
+        backoff: float,
+        backoff_max: float,
+        lease: float,
+    ):
+        self.builders = builders
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.lease = lease
+        self._task = None
+
+    async def _build(self, middleware_dal, kind, payload):
+        builder = self.builders.get(kind)
+        if builder is None:
+            raise ValueError(f"Unknown notification kind: {kind}")
+        return await builder(middleware_dal, **payload)
+
+    async def _deliver(self, data, token):
+        if isinstance(data, Exception):
+            raise data
+        await post_notification(data, token)
+
+    async def _claim(self):
+        async with async_session() as session:
+            async with session.begin():
+                notifications = await OutboxDAL(session).claim_batch(
+                    self.batch_size, self.lease
+                )
+                return [(n.id, n.kind, dict(n.payload)) for n in notifications]
+
+    async def _prepare(self, claimed):
+        async with async_session() as session:
+            middleware_dal = MiddlewareDAL(session)
+            token = await middleware_dal.get_superuser_token()
+            payloads = []
+            for _, kind, payload in claimed:
+                try:
+                    payloads.append(await self._build(middleware_dal, kind, payload))
+                except Exception as e:
+                    # e.g. the user or course was deleted after enqueueing;
+                    # the failure is recorded on this row only.
+                    await session.rollback()
+                    payloads.append(e)
+            return token, payloads
+
+    async def _finish(self, sent, failed):
+        async with async_session() as session:
+            async with session.begin():
+                dal = OutboxDAL(session)
+                await dal.delete_sent(sent)
+                for notification in await dal.get_many(list(failed)):
+                    dal.mark_failed(
+                        notification,
+                        failed[notification.id],
+                        self.max_attempts,
+                        self.backoff,
+                        self.backoff_max,
+                    )
+
+    async def drain_once(self) -> int:
+        claimed = await self._claim()
+        if not claimed:
+            return 0
+        token, payloads = await self._prepare(claimed)
+        results = await asyncio.gather(
+            *(self._deliver(data, token) for data in payloads),
+            return_exceptions=True,
+        )
+        sent, failed = [], {}
+        for (notification_id, kind, _), result in zip(claimed, results):
+            if isinstance(result, Exception):
+                logger.warning(
+                    "Notification %s (%s) failed: %r", notification_id, kind, result
+                )
+                failed[notification_id] = result
+            else:
+                sent.append(notification_id)
+        await self._finish(sent, failed)
+        return len(claimed)
+
+    async def _run(self):
+        while True:
+            try:
+                claimed = await self.drain_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Notification outbox pass failed")
+                claimed = 0
+            if claimed < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+notification_worker = NotificationWorker(
+    BUILDERS,
+    batch_size=OUTBOX_BATCH_SIZE,
+    poll_interval=OUTBOX_POLL_INTERVAL,
+    max_attempts=OUTBOX_MAX_ATTEMPTS,
+    backoff=OUTBOX_BACKOFF_SECONDS,
+    backoff_max=OUTBOX_BACKOFF_MAX,
+    lease=OUTBOX_LEASE_SECONDS,
+)
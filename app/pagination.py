@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from typing import Generic, Sequence, TypeVar
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from typing import Any, Generic, List, Optional, Sequence, TypeVar
 
 from fastapi_pagination import Params
 from fastapi_pagination.bases import AbstractPage, AbstractParams
@@ -19,6 +22,7 @@ class CustomPage(AbstractPage[T], Generic[T]):
         items: Sequence[T],
         total: int,
         params: AbstractParams,
+        **meta: Any,
     ):
         return cls(
             data=items,
@@ -26,5 +30,39 @@ class CustomPage(AbstractPage[T], Generic[T]):
                 "current_page": params.page,
                 "per_page": params.size,
                 "total_items": total,
+                **meta,
             },
         )
+
+    @classmethod
+    def create_keyset(
+        cls,
+        items: Sequence[T],
+        params: AbstractParams,
+        next_cursor: Optional[str],
+    ):
+        return cls(
+            data=items,
+            meta={
+                "per_page": params.size,
+                "next": next_cursor,
+            },
+        )
+
+
+def encode_cursor(*values: Any) -> str:
+    raw = json.dumps(
+        [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    )
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Raises ValueError if the cursor was not produced by encode_cursor."""
+    try:
+        values = json.loads(urlsafe_b64decode(cursor.encode()))
+    except (TypeError, UnicodeError) as e:
+        raise ValueError(e)
+    if not isinstance(values, list):
+        raise ValueError("cursor must encode a list")
+    return values
@@ -0,0 +1,8 @@
+from app.database import async_session
+from app.search.search_dal import SearchDAL
+
+
+async def get_search_dal():
+    async with async_session() as session:
+        async with session.begin():
+            yield SearchDAL(session)
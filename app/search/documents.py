@@ -0,0 +1,172 @@
+from collections import defaultdict
+
+from sqlalchemy.future import select
+
+from app.achievements.models import Achievement
+from app.categories.models import Category
+from app.courses.models import Course
+from app.lessons.models import Lesson, lessons_tags_association
+from app.tags.models import Tag
+from app.users.models import User, user_achievements_association
+
+
+async def course_documents(db_session, rows):
+    return {
+        row.id: {
+            "title": row.title,
+            "description": row.description,
+            "author": str(row.user_id),
+            "category": [row.category] if row.category else [],
+            "is_deleted": bool(row.is_deleted),
+            "is_visible": row.is_visible is not False,
+        }
+        for row in rows
+    }
+
+
+async def lesson_documents(db_session, rows):
+    ids = [row.id for row in rows]
+    tags = defaultdict(list)
+    if ids:
+        q = await db_session.execute(
+            select(lessons_tags_association.c.Lesson_id, Tag.title)
+            .join(Tag, Tag.id == lessons_tags_association.c.Tag_id)
+            .where(lessons_tags_association.c.Lesson_id.in_(ids))
+        )
+        for lesson_id, title in q:
+            tags[lesson_id].append(title)
+    return {
+        row.id: {
+            "title": row.title,
+            "description": row.description,
+            "estimated_time": row.estimated_time,
+            "course_id": row.course_id,
+            "tags": tags[row.id],
+        }
+        for row in rows
+    }
+
+
+async def user_documents(db_session, rows):
+    ids = [row.id for row in rows]
+    achievements = defaultdict(list)
+    if ids:
+        q = await db_session.execute(
+            select(
+                user_achievements_association.c.User_id,
+                user_achievements_association.c.Achievement_id,
+            ).where(user_achievements_association.c.User_id.in_(ids))
+        )
+        for user_id, achievement_id in q:
+            achievements[user_id].append(achievement_id)
+    return {
+        row.id: {
+            "username": row.username,
+            "email": row.email,
+            "first_name": row.first_name,
+            "last_name": row.last_name,
+            "achievements": achievements[row.id],
+        }
+        for row in rows
+    }
+
+
+async def titled_documents(db_session, rows):
+    return {
+        row.id: {"title": row.title, "description": row.description} for row in rows
+    }
+
+
+class DocumentSource:
+    """How the documents of one index are read from Postgres.
+
+    ``columns`` are selected as plain rows (no ORM eager loads) and passed in
+    batches to ``build``, which loads any related ids in one extra query.
+    """
+
+    def __init__(self, model, columns, build, mappings=None):
+        self.model = model
+        self.columns = columns
+        self.build = build
+        self.mappings = mappings or {}
+
+    def select(self):
+        return select(*self.columns)
+
+    async def load(self, db_session, ids):
+        q = await db_session.execute(self.select().where(self.model.id.in_(ids)))
+        return await self.build(db_session, q.all())
+
+
+_TEXT = {"type": "text"}
+# Text with a ``.keyword`` sub-field, the same shape dynamic mapping gives
+# strings, so filters work on old and reindexed generations alike.
+_KEYWORD_TEXT = {"type": "text", "fields": {"keyword": {"type": "keyword"}}}
+
+DOCUMENTS = {
+    "courses": DocumentSource(
+        Course,
+        (
+            Course.id,
+            Course.title,
+            Course.description,
+            Course.user_id,
+            Course.category,
+            Course.is_deleted,
+            Course.is_visible,
+        ),
+        course_documents,
+        {
+            "properties": {
+                "title": _TEXT,
+                "description": _TEXT,
+                "author": _KEYWORD_TEXT,
+                "category": {"type": "integer"},
+                "is_deleted": {"type": "boolean"},
+                "is_visible": {"type": "boolean"},
+            }
+        },
+    ),
+    "lessons": DocumentSource(
+        Lesson,
+        (
+            Lesson.id,
+            Lesson.title,
+            Lesson.description,
+            Lesson.estimated_time,
+            Lesson.course_id,
+        ),
+        lesson_documents,
+        {
+            "properties": {
+                "title": _TEXT,
+                "description": _TEXT,
+                "estimated_time": {"type": "keyword"},
+                "course_id": {"type": "integer"},
+                "tags": _KEYWORD_TEXT,
+            }
+        },
+    ),
+    "users": DocumentSource(
+        User,
+        (User.id, User.username, User.email, User.first_name, User.last_name),
+        user_documents,
+        {
+            "properties": {
+                "username": _KEYWORD_TEXT,
+                "email": _KEYWORD_TEXT,
+                "first_name": _TEXT,
+                "last_name": _TEXT,
+                "achievements": {"type": "integer"},
+            }
+        },
+    ),
+    "categories": DocumentSource(
+        Category, (Category.id, Category.title, Category.description), titled_documents
+    ),
+    "achievements": DocumentSource(
+        Achievement,
+        (Achievement.id, Achievement.title, Achievement.description),
+        titled_documents,
+    ),
+}
@@ -0,0 +1,262 @@
+import asyncio
+import logging
+import time
+
+from sqlalchemy import event
+from sqlalchemy.future import select
+from sqlalchemy.orm import Session
+
+from app.config import (
+    SEARCH_BATCH_SIZE,
+    SEARCH_FLUSH_INTERVAL,
+    SEARCH_MAX_ATTEMPTS,
+    SEARCH_RECONCILE_INTERVAL,
+)
+from app.database import async_session
+from app.search.documents import DOCUMENTS
+from elastic import es
+from redis_conf.redis import redis_cache
+
+logger = logging.getLogger(__name__)
+
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+_SESSION_KEY = "search_pending"
+_TRACKING_KEY = "search:reindex:{}:tracking"
+_CHANGED_KEY = "search:reindex:{}:changed"
+# Upper bound for a marker left behind by a reindex that died mid-run.
+_TRACKING_TTL = 24 * 3600
+
+
+class SearchIndexer:
+    """Keeps the Elasticsearch indices in sync without blocking requests.
+
+    Handlers only mark documents as dirty. Marks are coalesced per
+    ``(index, id)`` and a background task flushes them through ``_bulk``
+    whenever ``batch_size`` documents are pending or ``flush_interval``
+    seconds have passed. Each flush rebuilds the current documents from
+    Postgres, so any number of edits to one row costs a single bulk action;
+    rows that no longer exist are deleted from the index.
+
+    Failed actions are retried on the next flush up to ``max_attempts``.
+    A periodic reconciliation pass re-marks rows that are missing from the
+    index, which also covers marks lost when a worker restarts.
+    """
+
+    def __init__(
+        self,
+        client,
+        sources,
+        batch_size: int,
+        flush_interval: float,
+        max_attempts: int,
+        reconcile_interval: float,
+    ):
+        self.client = client
+        self.sources = sources
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self.reconcile_interval = reconcile_interval
+        self._pending = {}
+        self._wakeup = None
+        self._task = None
+        self._last_reconcile = time.monotonic()
+        self.stats = {"flushed": 0, "bulk_requests": 0, "retried": 0, "dropped": 0}
+
+    def enqueue(self, index: str, *ids, attempts: int = 0):
+        for doc_id in ids:
+            key = (index, str(doc_id))
+            if key not in self._pending or self._pending[key][1] > attempts:
+                self._pending[key] = (doc_id, attempts)
+        if self._wakeup is not None and len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    def enqueue_on_commit(self, db_session, index: str, *ids):
+        """Mark documents dirty once ``db_session`` commits.
+
+        Marks are dropped on rollback, so the flush never reads rows the
+        request has not committed yet.
+        """
+        pending = db_session.sync_session.info.setdefault(_SESSION_KEY, [])
+        pending.extend((index, doc_id) for doc_id in ids)
+
+    async def start_tracking(self, index: str):
+        """Record every document of ``index`` flushed from now on.
+
+        The marker and the recorded ids live in Redis, so flushes from every
+        worker and pod are seen, not only those of the reindexing process.
+        """
+        await redis_cache.delete(_CHANGED_KEY.format(index))
+        await redis_cache.set(_TRACKING_KEY.format(index), 1, ex=_TRACKING_TTL)
+
+    async def stop_tracking(self, index: str):
+        await redis_cache.delete(_TRACKING_KEY.format(index))
+        changed = await redis_cache.smembers(_CHANGED_KEY.format(index))
+        await redis_cache.delete(_CHANGED_KEY.format(index))
+        return [
+            doc_id.decode() if isinstance(doc_id, bytes) else doc_id
+            for doc_id in changed
+        ]
+
+    async def _record_tracked(self, batch):
+        # Runs before the documents are read, so a flush that still reaches
+        # the old generation is always recorded before the reindex collects
+        # the changed ids.
+        if redis_cache.redis_cache is None:
+            return
+        by_index = {}
+        for index, doc_id, _ in batch:
+            by_index.setdefault(index, set()).add(str(doc_id))
+        try:
+            for index, ids in by_index.items():
+                if await redis_cache.exists(_TRACKING_KEY.format(index)):
+                    await redis_cache.sadd(_CHANGED_KEY.format(index), *ids)
+        except Exception as e:
+            logger.warning("Could not record documents for a running reindex: %s", e)
+
+    def _take_batch(self):
+        keys = list(self._pending)[: self.batch_size]
+        return [(key[0], *self._pending.pop(key)) for key in keys]
+
+    async def _actions(self, batch):
+        by_index = {}
+        for index, doc_id, attempts in batch:
+            by_index.setdefault(index, []).append((doc_id, attempts))
+        actions, meta = [], []
+        async with async_session() as session:
+            for index, items in by_index.items():
+                documents = await self.sources[index].load(
+                    session, [doc_id for doc_id, _ in items]
+                )
+                documents = {str(key): doc for key, doc in documents.items()}
+                for doc_id, attempts in items:
+                    doc = documents.get(str(doc_id))
+                    if doc is None:
+                        actions.append({"delete": {"_index": index, "_id": str(doc_id)}})
+                    else:
+                        actions.append({"index": {"_index": index, "_id": str(doc_id)}})
+                        actions.append(doc)
+                    meta.append((index, doc_id, attempts))
+        return actions, meta
+
+    def _retry(self, retries, index, doc_id, attempts, reason):
+        if attempts + 1 >= self.max_attempts:
+            self.stats["dropped"] += 1
+            logger.error("Giving up indexing %s/%s: %s", index, doc_id, reason)
+            return
+        self.stats["retried"] += 1
+        retries.append((index, doc_id, attempts + 1))
+
+    async def flush(self):
+        retries = []
+        try:
+            while self._pending:
+                await self._flush_batch(self._take_batch(), retries)
+        finally:
+            for index, doc_id, attempts in retries:
+                self.enqueue(index, doc_id, attempts=attempts)
+
+    async def _flush_batch(self, batch, retries):
+        await self._record_tracked(batch)
+        try:
+            actions, meta = await self._actions(batch)
+            self.stats["bulk_requests"] += 1
+            response = await self.client.bulk(body=actions)
+        except Exception as e:
+            logger.warning("Search bulk flush failed: %s", e)
+            for index, doc_id, attempts in batch:
+                self._retry(retries, index, doc_id, attempts, e)
+            return
+        for item, (index, doc_id, attempts) in zip(response["items"], meta):
+            ((op, result),) = item.items()
+            status = result.get("status", 500)
+            if status < 300 or (op == "delete" and status == 404):
+                self.stats["flushed"] += 1
+            elif status in _RETRY_STATUSES:
+                self._retry(retries, index, doc_id, attempts, result.get("error"))
+            else:
+                self.stats["dropped"] += 1
+                logger.error(
+                    "Indexing %s/%s rejected: %s", index, doc_id, result.get("error")
+                )
+
+    async def reconcile(self, chunk_size: int = 1000):
+        """Mark every row that has no document in its index."""
+        async with async_session() as session:
+            for index, source in self.sources.items():
+                result = await session.stream(
+                    select(source.model.id).order_by(source.model.id)
+                )
+                async for ids in result.scalars().partitions(chunk_size):
+                    found = await self.client.mget(
+                        index=index,
+                        body={"ids": [str(doc_id) for doc_id in ids]},
+                        _source=False,
+                    )
+                    missing = {
+                        doc["_id"] for doc in found["docs"] if not doc.get("found")
+                    }
+                    self.enqueue(
+                        index, *(doc_id for doc_id in ids if str(doc_id) in missing)
+                    )
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+                if (
+                    self.reconcile_interval
+                    and time.monotonic() - self._last_reconcile
+                    >= self.reconcile_interval
+                ):
+                    self._last_reconcile = time.monotonic()
+                    await self.reconcile()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Search indexer pass failed")
+
+    def start(self):
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Final search flush failed")
+
+
+search_indexer = SearchIndexer(
+    es,
+    DOCUMENTS,
+    batch_size=SEARCH_BATCH_SIZE,
+    flush_interval=SEARCH_FLUSH_INTERVAL,
+    max_attempts=SEARCH_MAX_ATTEMPTS,
+    reconcile_interval=SEARCH_RECONCILE_INTERVAL,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_after_commit(session):
+    for index, doc_id in session.info.pop(_SESSION_KEY, ()):
+        search_indexer.enqueue(index, doc_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop(_SESSION_KEY, None)
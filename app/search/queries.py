@@ -0,0 +1,50 @@
+COURSE_FIELDS = ["title^3", "description"]
+LESSON_FIELDS = ["title^3", "tags^2", "description"]
+USER_FIELDS = ["username^3", "first_name^2", "last_name^2"]
+
+
+def search_body(
+    q: str, fields, filters=(), must_not=(), offset: int = 0, size: int = 10
+):
+    return {
+        "from": offset,
+        "size": size,
+        "_source": False,
+        "query": {
+            "bool": {
+                "must": {
+                    "multi_match": {"query": q, "fields": fields, "fuzziness": "AUTO"}
+                },
+                "filter": list(filters),
+                "must_not": list(must_not),
+            }
+        },
+        "highlight": {"fields": {field.split("^")[0]: {} for field in fields}},
+    }
+
+
+def course_query(q: str, category=None, author=None, **page):
+    filters = []
+    if category is not None:
+        filters.append({"term": {"category": category}})
+    if author is not None:
+        filters.append({"term": {"author.keyword": str(author)}})
+    must_not = [{"term": {"is_deleted": True}}, {"term": {"is_visible": False}}]
+    return search_body(q, COURSE_FIELDS, filters, must_not, **page)
+
+
+def lesson_query(q: str, tags=None, **page):
+    filters = [{"term": {"tags.keyword": tag}} for tag in tags or ()]
+    return search_body(q, LESSON_FIELDS, filters, **page)
+
+
+def user_query(q: str, **page):
+    return search_body(q, USER_FIELDS, **page)
+
+
+def parse_hits(response):
+    """Return ``(ids, highlights, total)`` from a search response."""
+    hits = response["hits"]
+    ids = [hit["_id"] for hit in hits["hits"]]
+    highlights = {hit["_id"]: hit.get("highlight", {}) for hit in hits["hits"]}
+    return ids, highlights, hits["total"]["value"]
@@ -0,0 +1,191 @@
+"""Rebuild Elasticsearch indices from Postgres.
+
+Rows are streamed with a server-side cursor and turned into documents one
+partition at a time, so memory stays flat however large the tables are.
+Documents go into a fresh versioned index (``courses_v1700000000``) through
+``helpers.async_bulk``; when the load finishes the public name is switched
+to it as an alias in one atomic ``_aliases`` call and the previous
+generation is removed.
+
+Usage::
+
+    python -m app.search.reindex [courses lessons ...] [--batch-size 1000]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+from app.database import async_session
+from app.search.documents import DOCUMENTS
+from app.search.indexer import search_indexer
+from elastic import es
+from redis_conf.redis import redis_cache
+
+logger = logging.getLogger(__name__)
+
+# Progress of the latest run per index, shared by every process.
+_STATUS_KEY = "search:reindex_status"
+
+
+async def _publish(stats):
+    try:
+        await redis_cache.hset(_STATUS_KEY, {stats["index"]: json.dumps(stats)})
+    except Exception as e:
+        logger.warning("Could not publish reindex progress: %s", e)
+
+
+async def reindex_status():
+    status = await redis_cache.hgetall(_STATUS_KEY)
+    return {
+        (index.decode() if isinstance(index, bytes) else index): json.loads(stats)
+        for index, stats in status.items()
+    }
+
+
+def _parse_ids(source, ids):
+    # Ids come back from Redis as strings.
+    try:
+        python_type = source.model.id.type.python_type
+    except NotImplementedError:
+        return ids
+    return [python_type(doc_id) for doc_id in ids]
+
+
+async def _documents(index, source, batch_size, progress):
+    async with async_session() as stream_session, async_session() as session:
+        result = await stream_session.stream(
+            source.select()
+            .order_by(source.model.id)
+            .execution_options(stream_results=True, max_row_buffer=batch_size)
+        )
+        async for rows in result.partitions(batch_size):
+            documents = await source.build(session, rows)
+            for doc_id, doc in documents.items():
+                yield {"_index": index, "_id": str(doc_id), "_source": doc}
+            await progress(len(rows))
+
+
+async def _swap_alias(client, alias, new_index):
+    actions = [{"add": {"index": new_index, "alias": alias}}]
+    old_indices = []
+    if await client.indices.exists_alias(name=alias):
+        old_indices = list(await client.indices.get_alias(name=alias))
+        actions += [{"remove": {"index": old, "alias": alias}} for old in old_indices]
+    elif await client.indices.exists(index=alias):
+        actions.append({"remove_index": {"index": alias}})
+    await client.indices.update_aliases(body={"actions": actions})
+    return old_indices
+
+
+async def reindex(
+    index: str, batch_size: int = 1000, keep_old: bool = False, client=None
+):
+    """Rebuild ``index`` and return throughput metrics."""
+    from elasticsearch import helpers
+
+    client = client or es.get()
+    source = DOCUMENTS[index]
+    new_index = f"{index}_v{int(time.time())}"
+    started = time.monotonic()
+    stats = {
+        "index": index,
+        "new_index": new_index,
+        "state": "running",
+        "rows": 0,
+        "errors": 0,
+    }
+    await _publish(stats)
+
+    async def progress(rows):
+        stats["rows"] += rows
+        elapsed = time.monotonic() - started
+        logger.info(
+            "%s: %s rows, %.0f rows/s", index, stats["rows"], stats["rows"] / elapsed
+        )
+        await _publish(stats)
+
+    await client.indices.create(
+        index=new_index,
+        body={
+            "settings": {"refresh_interval": "-1", "number_of_replicas": 0},
+            "mappings": source.mappings,
+        },
+    )
+    await search_indexer.start_tracking(index)
+    try:
+        indexed, errors = await helpers.async_bulk(
+            client,
+            _documents(new_index, source, batch_size, progress),
+            chunk_size=batch_size,
+            raise_on_error=False,
+        )
+        await client.indices.put_settings(
+            index=new_index,
+            body={"index": {"refresh_interval": None, "number_of_replicas": None}},
+        )
+        await client.indices.refresh(index=new_index)
+        old_indices = await _swap_alias(client, index, new_index)
+    except Exception:
+        stats["state"] = "failed"
+        await _publish(stats)
+        await search_indexer.stop_tracking(index)
+        await client.indices.delete(index=new_index, ignore_unavailable=True)
+        raise
+    # Documents changed while the snapshot was streaming were written to the
+    # old generation by whichever worker flushed them; rebuild them here so
+    # the new one catches up.
+    changed = await search_indexer.stop_tracking(index)
+    search_indexer.enqueue(index, *_parse_ids(source, changed))
+    await search_indexer.flush()
+    if old_indices and not keep_old:
+        await client.indices.delete(index=",".join(old_indices))
+
+    elapsed = time.monotonic() - started
+    stats.update(
+        state="done",
+        documents=indexed,
+        errors=len(errors),
+        seconds=round(elapsed, 2),
+        docs_per_second=round(indexed / elapsed, 1) if elapsed else indexed,
+        caught_up=len(changed),
+    )
+    await _publish(stats)
+    for error in errors[:10]:
+        logger.error("%s: bulk error %s", index, error)
+    logger.info("%s reindexed: %s", index, stats)
+    return stats
+
+
+async def reindex_all(indices=None, batch_size: int = 1000, keep_old: bool = False):
+    return [
+        await reindex(index, batch_size, keep_old) for index in indices or DOCUMENTS
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild Elasticsearch indices")
+    parser.add_argument("indices", nargs="*", help=", ".join(DOCUMENTS))
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--keep-old", action="store_true")
+    args = parser.parse_args()
+    unknown = set(args.indices) - set(DOCUMENTS)
+    if unknown:
+        parser.error(f"unknown indices: {', '.join(sorted(unknown))}")
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    async def run():
+        await redis_cache.init_cache()
+        try:
+            return await reindex_all(args.indices, args.batch_size, args.keep_old)
+        finally:
+            await es.close()
+            await redis_cache.close()
+
+    for stats in asyncio.run(run()):
+        print(stats)
+
+
+if __name__ == "__main__":
+    main()
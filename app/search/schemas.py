@@ -0,0 +1,25 @@
+from typing import Dict, List
+
+from pydantic import BaseModel
+
+from app.courses.schemas import CourseOut
+from app.lessons.schemas import LessonOut
+from app.users.schemas import UserOut
+
+
+class CourseSearchOut(CourseOut):
+    highlight: Dict[str, List[str]] = {}
+
+
+class LessonSearchOut(LessonOut):
+    highlight: Dict[str, List[str]] = {}
+
+
+class UserSearchOut(UserOut):
+    highlight: Dict[str, List[str]] = {}
+
+
+class SearchOut(BaseModel):
+    courses: List[CourseSearchOut]
+    lessons: List[LessonSearchOut]
+    users: List[UserSearchOut]
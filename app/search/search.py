@@ -0,0 +1,142 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import JSONResponse
+from fastapi_pagination import resolve_params
+from fastapi_pagination.api import create_page
+from pydantic import UUID4
+
+from app.pagination import CustomPage as Page
+from app.search import queries, schemas
+from app.search.dependencies import get_search_dal
+from app.search.search_dal import SearchDAL
+from app.users.helper_functions import load_user_counters
+from elastic import es
+
+router = APIRouter(tags=['Search'])
+
+UNAVAILABLE = {"message": "Поиск временно недоступен"}
+
+
+def _with_highlights(items, highlights):
+    for item in items:
+        item.highlight = highlights.get(str(item.id), {})
+    return items
+
+
+def _page():
+    params = resolve_params()
+    return params, {"offset": (params.page - 1) * params.size, "size": params.size}
+
+
+@router.get('/core/search', response_model=schemas.SearchOut, status_code=200)
+async def search(
+    q: str = Query(..., min_length=1),
+    size: int = Query(5, ge=1, le=20),
+    search_dal: SearchDAL = Depends(get_search_dal),
+):
+    try:
+        response = await es.msearch(
+            body=[
+                {"index": "courses"},
+                queries.course_query(q, size=size),
+                {"index": "lessons"},
+                queries.lesson_query(q, size=size),
+                {"index": "users"},
+                queries.user_query(q, size=size),
+            ]
+        )
+        courses, lessons, users = (
+            queries.parse_hits(result) for result in response["responses"]
+        )
+    except Exception:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=UNAVAILABLE
+        )
+    found_courses = _with_highlights(
+        await search_dal.get_courses(courses[0]), courses[1]
+    )
+    found_users = _with_highlights(await search_dal.get_users(users[0]), users[1])
+    await load_user_counters(
+        [course.user for course in found_courses if course.user] + found_users
+    )
+    return {
+        "courses": found_courses,
+        "lessons": _with_highlights(
+            await search_dal.get_lessons(lessons[0]), lessons[1]
+        ),
+        "users": found_users,
+    }
+
+
+@router.get(
+    '/core/search/courses',
+    response_model=Page[schemas.CourseSearchOut],
+    status_code=200,
+)
+async def search_courses(
+    q: str = Query(..., min_length=1),
+    category: Optional[int] = None,
+    author: Optional[UUID4] = None,
+    search_dal: SearchDAL = Depends(get_search_dal),
+):
+    params, page = _page()
+    try:
+        response = await es.search(
+            index="courses",
+            body=queries.course_query(q, category=category, author=author, **page),
+        )
+    except Exception:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=UNAVAILABLE
+        )
+    ids, highlights, total = queries.parse_hits(response)
+    courses = _with_highlights(await search_dal.get_courses(ids), highlights)
+    await load_user_counters(course.user for course in courses if course.user)
+    return create_page(courses, total, params)
+
+
+@router.get(
+    '/core/search/lessons',
+    response_model=Page[schemas.LessonSearchOut],
+    status_code=200,
+)
+async def search_lessons(
+    q: str = Query(..., min_length=1),
+    tags: Optional[List[str]] = Query(None),
+    search_dal: SearchDAL = Depends(get_search_dal),
+):
+    params, page = _page()
+    try:
+        response = await es.search(
+            index="lessons", body=queries.lesson_query(q, tags=tags, **page)
+        )
+    except Exception:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=UNAVAILABLE
+        )
+    ids, highlights, total = queries.parse_hits(response)
+    lessons = _with_highlights(await search_dal.get_lessons(ids), highlights)
+    return create_page(lessons, total, params)
+
+
+@router.get(
+    '/core/search/users',
+    response_model=Page[schemas.UserSearchOut],
+    status_code=200,
+)
+async def search_users(
+    q: str = Query(..., min_length=1),
+    search_dal: SearchDAL = Depends(get_search_dal),
+):
+    params, page = _page()
+    try:
+        response = await es.search(index="users", body=queries.user_query(q, **page))
+    except Exception:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=UNAVAILABLE
+        )
+    ids, highlights, total = queries.parse_hits(response)
+    users = _with_highlights(await search_dal.get_users(ids), highlights)
+    await load_user_counters(users)
+    return create_page(users, total, params)
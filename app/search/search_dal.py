@@ -0,0 +1,59 @@
+from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
+
+from app.courses.models import Course
+from app.database import async_session as session
+from app.lessons.models import Lesson
+from app.users.models import User
+
+
+def _in_order(items, ids):
+    by_id = {str(item.id): item for item in items}
+    return [by_id[str(item_id)] for item_id in ids if str(item_id) in by_id]
+
+
+class SearchDAL:
+    """Loads search hits from Postgres in one ``IN`` query per entity.
+
+    Results keep the relevance order of ``ids``; rows that are gone or no
+    longer public are skipped.
+    """
+
+    def __init__(self, db_session: session):
+        self.db_session = db_session
+
+    async def get_courses(self, ids):
+        if not ids:
+            return []
+        q = await self.db_session.execute(
+            select(Course)
+            .options(selectinload(Course.lessons), selectinload(Course.user))
+            .filter(
+                Course.id.in_([int(i) for i in ids]),
+                Course.is_deleted == False,
+                Course.is_visible == True,
+            )
+        )
+        return _in_order(q.unique().scalars().all(), ids)
+
+    async def get_lessons(self, ids):
+        if not ids:
+            return []
+        q = await self.db_session.execute(
+            select(Lesson)
+            .join(Course, Course.id == Lesson.course_id)
+            .filter(
+                Lesson.id.in_([int(i) for i in ids]),
+                Course.is_deleted == False,
+                Course.is_visible == True,
+            )
+        )
+        return _in_order(q.unique().scalars().all(), ids)
+
+    async def get_users(self, ids):
+        if not ids:
+            return []
+        q = await self.db_session.execute(
+            select(User).filter(User.id.in_(ids), User.is_active == True)
+        )
+        return _in_order(q.unique().scalars().all(), ids)
@@ -0,0 +1,64 @@
+"""Cold-start timing of the app: ``import main`` and the lifespan.
+
+Every run happens in a fresh interpreter so module caches do not hide
+import cost; medians over ``--runs`` are printed.
+
+    python -m app.startup_benchmark --runs 5
+    python -m app.startup_benchmark --import-only   # no DB/Redis needed
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = '''
+import asyncio, json, sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+result = {"import": imported - start}
+if sys.argv[1] == "lifespan":
+    from asgi_lifespan import LifespanManager
+
+    async def run():
+        async with LifespanManager(main.app):
+            result["startup"] = time.perf_counter() - imported
+        result["shutdown"] = time.perf_counter() - imported - result["startup"]
+
+    asyncio.run(run())
+print(json.dumps(result))
+'''
+
+
+def measure(lifespan: bool) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE, "lifespan" if lifespan else "import"],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-only", action="store_true")
+    args = parser.parse_args()
+
+    runs = [measure(not args.import_only) for _ in range(args.runs)]
+    for phase in runs[0]:
+        timings = [run[phase] * 1000 for run in runs]
+        print(
+            f"{phase:>10}: median {statistics.median(timings):8.1f} ms, "
+            f"max {max(timings):8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
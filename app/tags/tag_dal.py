@@ -1,8 +1,10 @@
 from sqlalchemy import update, delete
 from sqlalchemy.future import select
 from app.tags.models import Tag
+from app.lessons.models import lessons_tags_association
 from app.users.models import User
 from app.database import async_session as session
+from app.cache import response_cache
 
 
 class TagDAL:
@@ -29,6 +31,7 @@ class TagDAL:
         new_tag = Tag(title=title)
         self.db_session.add(new_tag)
         await self.db_session.flush()
+        response_cache.invalidate_on_commit(self.db_session, "tags")
         return new_tag
 
     async def get_user(self, user_id: str):
@@ -40,7 +43,17 @@ class TagDAL:
         q = q.values(updated_values)
         q.execution_options(synchronize_session="fetch")
         await self.db_session.execute(q)
+        response_cache.invalidate_on_commit(self.db_session, "tags")
+
+    async def get_tag_lesson_ids(self, tag_id: int):
+        q = await self.db_session.execute(
+            select(lessons_tags_association.c.Lesson_id).where(
+                lessons_tags_association.c.Tag_id == tag_id
+            )
+        )
+        return q.scalars().all()
 
     async def delete_tag(self, tag_id: int):
         q = delete(Tag).where(Tag.id == tag_id)
         await self.db_session.execute(q)
+        response_cache.invalidate_on_commit(self.db_session, "tags")
@@ -11,16 +11,19 @@ from app.auth.auth import fastapi_users
 
 from app.pagination import CustomPage as Page
 from . import schemas
-from elastic import es
+from app.search.indexer import search_indexer
 
 from app.tags.tag_dal import TagDAL
 from app.tags.dependencies import get_tag_dal
+from app.cache import response_cache
+from app.config import CACHE_TTL_DICTIONARIES
 
 
 router = APIRouter(tags=['Tags'])
 
 
 @router.get('/core/tags', response_model=Page[schemas.TagOut], status_code=200)
+@response_cache.cached("tags", CACHE_TTL_DICTIONARIES)
 async def show_tags(
     tag_dal: TagDAL = Depends(get_tag_dal), title: Optional[str] = None
 ):
@@ -74,6 +77,9 @@ async def update_tag(
             content={"message": "Тэг не найден"},
         )
     await tag_dal.update_tag(tag_id, request.dict(exclude_unset=True))
+    search_indexer.enqueue_on_commit(
+        tag_dal.db_session, "lessons", *await tag_dal.get_tag_lesson_ids(tag_id)
+    )
     return tag
 
 
@@ -91,21 +97,7 @@ async def delete_tag(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"message": "Тэг не найден"},
         )
+    lesson_ids = await tag_dal.get_tag_lesson_ids(tag_id)
     await tag_dal.delete_tag(tag_id)
-    try:
-        doc = {
-            "script": {
-                "source": "if (ctx._source.tags.contains(params.tag)) { ctx._source.tags.rem"
-                "ove(ctx._source.tags.indexOf(params.tag)) }",
-                "lang": "painless",
-                "params": {"tag": tag.title},
-            },
-            "query": {"match": {"tags": tag.title}},
-        }
-        await es.update_by_query("lessons", body=doc)
-    except Exception as e:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"message": f"Ошибка в апдейте elastic search: {e}"},
-        )
+    search_indexer.enqueue_on_commit(tag_dal.db_session, "lessons", *lesson_ids)
     return Response(status_code=204)
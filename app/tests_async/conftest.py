@@ -0,0 +1,29 @@
+import os
+
+import pytest
+
+try:
+    from pytest_asyncio import fixture as async_fixture
+except ImportError:  # modules using pg_sessionmaker skip themselves without it
+    async_fixture = pytest.fixture
+
+# Tests of Postgres-only statements run against this disposable database.
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+
+@async_fixture
+async def pg_sessionmaker():
+    """A sessionmaker bound to a freshly created schema in TEST_DATABASE_URL."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("set TEST_DATABASE_URL to a disposable Postgres database")
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.base import Base
+
+    engine = create_async_engine(TEST_DATABASE_URL)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    yield sessionmaker(bind=engine, autoflush=False, future=True, class_=AsyncSession)
+    await engine.dispose()
@@ -0,0 +1,61 @@
+import asyncio
+
+from app.achievements.engine import AchievementEngine, ThresholdRule
+
+RULES = [
+    ThresholdRule("followers", 10, "10 followers"),
+    ThresholdRule("followers", 100, "100 followers"),
+]
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    def __init__(self):
+        self.statements = []
+        self.sync_session = type("SyncSession", (), {"info": {}})()
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        if len(self.statements) == 1:
+            return FakeResult([("10 followers", 1), ("100 followers", 2)])
+        return FakeResult([("user", 1)])
+
+
+def test_nothing_is_queried_below_thresholds():
+    engine = AchievementEngine(RULES, {}, titles_ttl=60)
+    session = FakeSession()
+    granted = asyncio.run(engine.evaluate(session, "user", followers=9))
+    assert granted == []
+    assert session.statements == []
+
+
+def test_reached_rules_are_granted_in_one_insert():
+    engine = AchievementEngine(RULES, {}, titles_ttl=60)
+    session = FakeSession()
+    granted = asyncio.run(engine.evaluate(session, "user", followers=15))
+    assert granted == [("user", 1)]
+    assert len(session.statements) == 2
+    params = session.statements[1].compile().params
+    assert list(params.values()) == ["user", 1]
+
+
+def test_worker_merges_events_per_counter():
+    from app.achievements.worker import AchievementWorker
+
+    entries = [
+        ("1-0", {b"user_id": b"a", b"counter": b"followers", b"value": b"10"}),
+        ("2-0", {b"user_id": b"a", b"counter": b"followers", b"value": b"12"}),
+        ("3-0", {b"user_id": b"b", b"counter": b"students"}),
+        ("4-0", {b"user_id": b"b", b"counter": b"students"}),
+    ]
+    assert AchievementWorker._merge(entries) == {
+        "followers": {"a": 12},
+        "students": {"b": None},
+    }
@@ -0,0 +1,24 @@
+from app.cache import LRUCache
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2, ttl=60)
+    cache.set("a|", b"1")
+    cache.set("b|", b"2")
+    assert cache.get("a|") == b"1"
+    cache.set("c|", b"3")
+    assert cache.get("b|") is None
+    assert cache.get("a|") == b"1"
+
+
+def test_lru_expires_and_deletes_by_prefix():
+    cache = LRUCache(maxsize=10, ttl=-1)
+    cache.set("course:1|", b"1")
+    assert cache.get("course:1|") is None
+
+    cache = LRUCache(maxsize=10, ttl=60)
+    cache.set("course:1|page=1", b"1")
+    cache.set("course:12|page=1", b"2")
+    cache.delete_prefix("course:1|")
+    assert cache.get("course:1|page=1") is None
+    assert cache.get("course:12|page=1") == b"2"
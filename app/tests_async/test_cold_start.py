@@ -0,0 +1,46 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Clients that must only be imported from the lifespan or on first use.
+LAZY_MODULES = ("elasticsearch", "aiohttp", "redis", "aioredis", "requests")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import main
+print(json.dumps({
+    "seconds": time.perf_counter() - start,
+    "loaded": sorted(name for name in sys.argv[1:] if name in sys.modules),
+}))
+"""
+
+
+def _import_main():
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE, *LAZY_MODULES],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_import_main_without_heavy_clients():
+    assert _import_main()["loaded"] == []
+
+
+@pytest.mark.skipif(
+    "COLD_START_BUDGET" not in os.environ,
+    reason="set COLD_START_BUDGET (seconds) to check the import time",
+)
+def test_import_main_within_budget():
+    assert _import_main()["seconds"] < float(os.environ["COLD_START_BUDGET"])
@@ -0,0 +1,129 @@
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("pytest_asyncio")
+
+from sqlalchemy.future import select
+
+from app.middleware.middleware_dal import MiddlewareDAL
+from app.notifications import worker as worker_module
+from app.notifications.models import DEAD, PENDING, OutboxNotification
+from app.notifications.outbox_dal import OutboxDAL, enqueue_notification
+from app.notifications.worker import NotificationWorker
+
+# FOR UPDATE SKIP LOCKED needs Postgres, see the pg_sessionmaker fixture.
+
+
+@pytest.fixture
+def async_session(pg_sessionmaker, monkeypatch):
+    monkeypatch.setattr(worker_module, "async_session", pg_sessionmaker)
+
+    async def get_superuser_token(self):
+        return "token"
+
+    monkeypatch.setattr(MiddlewareDAL, "get_superuser_token", get_superuser_token)
+    return pg_sessionmaker
+
+
+@pytest.fixture
+def posted(monkeypatch):
+    sent = []
+
+    async def post_notification(data, token):
+        if data.get("fail"):
+            raise RuntimeError("middleware is down")
+        sent.append((data, token))
+
+    monkeypatch.setattr(worker_module, "post_notification", post_notification)
+    return sent
+
+
+async def build(middleware_dal, **payload):
+    if payload.get("deleted"):
+        # What a builder raises when the user has been deleted.
+        raise AttributeError("'NoneType' object has no attribute 'username'")
+    return payload
+
+
+def make_worker(**options):
+    defaults = dict(
+        builders={"test": build},
+        batch_size=10,
+        poll_interval=0,
+        max_attempts=3,
+        backoff=60,
+        backoff_max=600,
+        lease=120,
+    )
+    return NotificationWorker(**{**defaults, **options})
+
+
+async def enqueue(async_session, *payloads):
+    async with async_session() as session:
+        async with session.begin():
+            for payload in payloads:
+                await enqueue_notification(session, "test", **payload)
+
+
+async def outbox(async_session):
+    async with async_session() as session:
+        q = await session.execute(
+            select(OutboxNotification).order_by(OutboxNotification.id)
+        )
+        return q.scalars().all()
+
+
+@pytest.mark.asyncio
+async def test_delivered_notifications_are_deleted(async_session, posted):
+    await enqueue(async_session, {"n": 1}, {"n": 2})
+
+    assert await make_worker().drain_once() == 2
+
+    assert posted == [({"n": 1}, "token"), ({"n": 2}, "token")]
+    assert await outbox(async_session) == []
+
+
+@pytest.mark.asyncio
+async def test_failures_are_retried_later(async_session, posted):
+    await enqueue(async_session, {"n": 1}, {"deleted": True}, {"fail": True})
+
+    assert await make_worker().drain_once() == 3
+
+    assert posted == [({"n": 1}, "token")]
+    rows = await outbox(async_session)
+    assert [row.payload for row in rows] == [{"deleted": True}, {"fail": True}]
+    for row in rows:
+        assert row.status == PENDING
+        assert row.attempts == 1
+        assert row.next_attempt_at > datetime.now(timezone.utc)
+    assert "AttributeError" in rows[0].last_error
+    assert "middleware is down" in rows[1].last_error
+    # Not due yet, so the next pass has nothing to do.
+    assert await make_worker().drain_once() == 0
+
+
+@pytest.mark.asyncio
+async def test_notification_is_dead_after_max_attempts(async_session, posted):
+    await enqueue(async_session, {"fail": True})
+
+    await make_worker(max_attempts=1).drain_once()
+
+    (row,) = await outbox(async_session)
+    assert row.status == DEAD
+
+
+@pytest.mark.asyncio
+async def test_claimed_rows_are_leased(async_session):
+    await enqueue(async_session, {"n": 1})
+
+    async with async_session() as session:
+        async with session.begin():
+            claimed = await OutboxDAL(session).claim_batch(10, lease=120)
+    async with async_session() as session:
+        async with session.begin():
+            again = await OutboxDAL(session).claim_batch(10, lease=120)
+
+    assert len(claimed) == 1
+    assert again == []
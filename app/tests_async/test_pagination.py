@@ -0,0 +1,31 @@
+import datetime
+
+import pytest
+from fastapi_pagination import Params
+
+from app.pagination import CustomPage, decode_cursor, encode_cursor
+
+
+def test_cursor_roundtrip():
+    created_at = datetime.datetime(2021, 9, 1, 12, 30, tzinfo=datetime.timezone.utc)
+    cursor = encode_cursor(created_at, 42)
+    raw_created_at, course_id = decode_cursor(cursor)
+    assert datetime.datetime.fromisoformat(raw_created_at) == created_at
+    assert course_id == 42
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "bm90IGpzb24=", "e30="])
+def test_invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_offset_page_keeps_totals_and_next_cursor():
+    params = Params(page=2, size=10)
+    page = CustomPage.create([], 25, params, next="abc")
+    assert page.meta == {
+        "current_page": 2,
+        "per_page": 10,
+        "total_items": 25,
+        "next": "abc",
+    }
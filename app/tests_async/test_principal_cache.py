@@ -0,0 +1,47 @@
+import asyncio
+import uuid
+
+from pydantic import BaseModel
+
+from app.auth.principal_cache import PrincipalCache
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+class Principal(BaseModel):
+    id: uuid.UUID
+    is_author: bool = False
+
+
+def test_principal_cache_round_trip_and_invalidate():
+    redis = FakeRedis()
+    cache = PrincipalCache(redis, Principal, ttl=60, maxsize=10, local_ttl=60)
+    user = Principal(id=uuid.uuid4())
+
+    async def run():
+        await cache.set(user)
+        cached = await cache.get(user.id)
+        cached.is_author = True
+        assert (await cache.get(user.id)).is_author is False
+
+        other = PrincipalCache(redis, Principal, ttl=60, maxsize=10, local_ttl=60)
+        assert await other.get(user.id) == user
+
+        await cache.invalidate(user.id)
+        assert await cache.get(user.id) is None
+        assert redis.data == {}
+
+    asyncio.run(run())
@@ -0,0 +1,53 @@
+import asyncio
+import shutil
+import socket
+import subprocess
+import time
+
+import pytest
+
+pytest.importorskip("aioredis")
+
+from redis_conf.redis import RedisCache  # noqa: E402
+
+
+@pytest.fixture
+def redis_port():
+    if shutil.which("redis-server") is None:
+        pytest.skip("redis-server is not installed")
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = subprocess.Popen(
+        ["redis-server", "--port", str(port), "--save", "", "--appendonly", "no"],
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+    yield port
+    server.terminate()
+    server.wait()
+
+
+def test_direct_mode_pool_and_close(redis_port):
+    cache = RedisCache(host="127.0.0.1", port=redis_port, max_connections=2)
+
+    async def run():
+        await cache.init_cache()
+        assert await cache.ping()
+        await cache.hset("user:1", {"posts_count": 3})
+        await asyncio.gather(*(cache.set(f"key:{i}", i) for i in range(10)))
+        assert await cache.get("key:9") == b"9"
+        assert await cache.hmget_many(["user:1", "user:2"], ["posts_count"]) == [
+            [b"3"],
+            [None],
+        ]
+        await cache.close()
+        assert cache.redis_cache is None
+
+    asyncio.run(run())
@@ -0,0 +1,34 @@
+from app.monitoring.context import RequestContext, route_template, statement_shape
+
+
+class FakeRoute:
+    def __init__(self, path, endpoint):
+        self.path = path
+        self.endpoint = endpoint
+
+
+class FakeApp:
+    def __init__(self, routes):
+        self.routes = routes
+
+
+def test_route_template_uses_matched_endpoint():
+    def get_course():
+        pass
+
+    app = FakeApp([FakeRoute("/core/courses/{course_id}", get_course)])
+    assert route_template({"app": app, "endpoint": get_course}) == (
+        "/core/courses/{course_id}"
+    )
+    assert route_template({"app": app}) == "unmatched"
+
+
+def test_repeated_statements_group_by_shape():
+    ctx = RequestContext({})
+    for size in range(1, 13):
+        params = ", ".join(f"${i}" for i in range(1, size + 1))
+        ctx.statements[f'SELECT * FROM "Users" WHERE id IN ({params})'] += 1
+    ctx.statements['SELECT * FROM "Courses" WHERE id = $1'] += 3
+    repeated = ctx.repeated_statements(10)
+    assert repeated == {'SELECT * FROM "Users" WHERE id IN (?)': 12}
+    assert statement_shape("a = %(id_1)s AND\n b = %(id_2)s") == "a = ? AND b = ?"
@@ -0,0 +1,66 @@
+import asyncio
+
+from app.search.indexer import SearchIndexer
+
+
+class FakeSource:
+    def __init__(self, documents):
+        self.documents = documents
+
+    async def load(self, db_session, ids):
+        return {i: self.documents[i] for i in ids if i in self.documents}
+
+
+class FakeES:
+    def __init__(self, statuses=None):
+        self.requests = []
+        self.statuses = statuses or {}
+
+    async def bulk(self, body):
+        self.requests.append(body)
+        items = []
+        for action in body:
+            for op in ("index", "delete"):
+                if op in action:
+                    doc_id = action[op]["_id"]
+                    status = self.statuses.get(doc_id, 200)
+                    items.append({op: {"_id": doc_id, "status": status}})
+        return {"items": items}
+
+
+def make_indexer(client, documents):
+    return SearchIndexer(
+        client,
+        {"courses": FakeSource(documents)},
+        batch_size=100,
+        flush_interval=1,
+        max_attempts=2,
+        reconcile_interval=0,
+    )
+
+
+def test_changes_are_coalesced_into_one_bulk_request():
+    client = FakeES()
+    indexer = make_indexer(client, {1: {"title": "a"}})
+    indexer.enqueue("courses", 1)
+    indexer.enqueue("courses", 1, 2)
+    asyncio.run(indexer.flush())
+
+    assert len(client.requests) == 1
+    assert client.requests[0] == [
+        {"index": {"_index": "courses", "_id": "1"}},
+        {"title": "a"},
+        {"delete": {"_index": "courses", "_id": "2"}},
+    ]
+    assert indexer.stats["flushed"] == 2
+
+
+def test_retryable_failures_are_requeued_until_max_attempts():
+    client = FakeES(statuses={"1": 429})
+    indexer = make_indexer(client, {1: {"title": "a"}})
+    indexer.enqueue("courses", 1)
+    asyncio.run(indexer.flush())
+    assert indexer.stats["retried"] == 1
+    asyncio.run(indexer.flush())
+    assert indexer.stats["dropped"] == 1
+    assert not indexer._pending
@@ -0,0 +1,28 @@
+from app.search import queries
+
+
+def test_course_query_filters_and_paging():
+    body = queries.course_query("python", category=3, author="abc", offset=20, size=10)
+    assert body["from"] == 20 and body["size"] == 10
+    query = body["query"]["bool"]
+    assert query["must"]["multi_match"]["fields"] == queries.COURSE_FIELDS
+    assert {"term": {"category": 3}} in query["filter"]
+    assert {"term": {"author.keyword": "abc"}} in query["filter"]
+    assert {"term": {"is_deleted": True}} in query["must_not"]
+    assert set(body["highlight"]["fields"]) == {"title", "description"}
+
+
+def test_parse_hits_keeps_relevance_order():
+    response = {
+        "hits": {
+            "total": {"value": 7},
+            "hits": [
+                {"_id": "5", "highlight": {"title": ["<em>py</em>"]}},
+                {"_id": "2"},
+            ],
+        }
+    }
+    ids, highlights, total = queries.parse_hits(response)
+    assert ids == ["5", "2"]
+    assert highlights == {"5": {"title": ["<em>py</em>"]}, "2": {}}
+    assert total == 7
@@ -0,0 +1,47 @@
+import asyncio
+import uuid
+
+from app.middleware import service_token
+from app.middleware.service_token import ServiceTokenProvider
+
+
+class FakeMiddlewareDAL:
+    def __init__(self):
+        self.calls = 0
+        self.superuser_id = uuid.uuid4()
+
+    async def get_user_by_username(self):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return type("User", (), {"id": self.superuser_id})()
+
+
+def test_service_token_is_reused_and_refreshed_once():
+    provider = ServiceTokenProvider(lifetime=60, refresh_margin=10)
+    dal = FakeMiddlewareDAL()
+
+    async def run():
+        return await asyncio.gather(*(provider.get_token(dal) for _ in range(10)))
+
+    tokens = asyncio.run(run())
+    assert len(set(tokens)) == 1
+    assert dal.calls == 1
+
+
+def test_service_token_refreshes_inside_margin(monkeypatch):
+    signed = []
+
+    def fake_generate_jwt(data, secret, lifetime, algorithm):
+        signed.append(data)
+        return f"token-{len(signed)}"
+
+    monkeypatch.setattr(service_token, "generate_jwt", fake_generate_jwt)
+    provider = ServiceTokenProvider(lifetime=60, refresh_margin=60)
+    dal = FakeMiddlewareDAL()
+
+    async def run():
+        return [await provider.get_token(dal), await provider.get_token(dal)]
+
+    assert asyncio.run(run()) == ["token-1", "token-2"]
+    assert len(signed) == 2
+    assert dal.calls == 1
@@ -0,0 +1,140 @@
+import uuid
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest_asyncio = pytest.importorskip("pytest_asyncio")
+
+from sqlalchemy.future import select
+
+from app.courses.models import Course
+from app.middleware.subscription_dal import SubscriptionDAL
+from app.users.models import User, user_courses_association
+
+# The statements use Postgres-only INSERT ... ON CONFLICT and data-modifying
+# CTEs, so they run against the database of the pg_sessionmaker fixture.
+
+
+@pytest_asyncio.fixture
+async def db_session(pg_sessionmaker):
+    async with pg_sessionmaker() as session:
+        yield session
+
+
+def make_user():
+    name = uuid.uuid4().hex[:20]
+    return User(
+        id=uuid.uuid4(),
+        username=name,
+        hashed_password="x",
+        first_name="Test",
+        last_name="User",
+        email=f"{name}@example.com",
+        is_superuser=False,
+    )
+
+
+async def make_course(db_session, owner=None):
+    user = make_user()
+    db_session.add(user)
+    if owner is not None:
+        db_session.add(owner)
+    course = Course(title="Course", user_id=owner.id if owner else None)
+    db_session.add(course)
+    await db_session.flush()
+    ids = user.id, course.id, owner.id if owner else None
+    await db_session.commit()
+    return ids
+
+
+async def counters(db_session, course_id, owner_id):
+    subscribers = await db_session.scalar(
+        select(Course.subscribers_count).where(Course.id == course_id)
+    )
+    sold = await db_session.scalar(
+        select(User.sold_courses).where(User.id == owner_id)
+    )
+    return subscribers, sold or 0
+
+
+@pytest.mark.asyncio
+async def test_subscribe_twice_counts_once(db_session):
+    user_id, course_id, owner_id = await make_course(db_session, make_user())
+    dal = SubscriptionDAL(db_session)
+
+    first = await dal.subscribe(user_id, course_id)
+    second = await dal.subscribe(user_id, course_id)
+    await db_session.commit()
+
+    assert first.user_exists and first.owner_exists
+    assert (first.course_id, first.owner_id) == (course_id, owner_id)
+    assert first.subscribed == 1
+    assert second.subscribed == 0
+    assert await counters(db_session, course_id, owner_id) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_subscribe_unknown_course(db_session):
+    user_id, course_id, _ = await make_course(db_session, make_user())
+
+    row = await SubscriptionDAL(db_session).subscribe(user_id, course_id + 1000)
+
+    assert row.user_exists
+    assert row.course_id is None
+    assert row.subscribed == 0
+
+
+@pytest.mark.asyncio
+async def test_subscribe_course_without_owner(db_session):
+    user_id, course_id, _ = await make_course(db_session)
+
+    row = await SubscriptionDAL(db_session).subscribe(user_id, course_id)
+    await db_session.commit()
+
+    assert row.course_id == course_id
+    assert not row.owner_exists
+    assert row.subscribed == 0
+    subscriptions = await db_session.scalar(
+        select(user_courses_association.c.User_id).where(
+            user_courses_association.c.Course_id == course_id
+        )
+    )
+    assert subscriptions is None
+
+
+@pytest.mark.asyncio
+async def test_subscribe_unknown_user(db_session):
+    _, course_id, owner_id = await make_course(db_session, make_user())
+
+    row = await SubscriptionDAL(db_session).subscribe(uuid.uuid4(), course_id)
+    await db_session.commit()
+
+    assert not row.user_exists
+    assert row.subscribed == 0
+    assert await counters(db_session, course_id, owner_id) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_unsubscribe_when_not_subscribed(db_session):
+    user_id, course_id, owner_id = await make_course(db_session, make_user())
+
+    row = await SubscriptionDAL(db_session).unsubscribe(user_id, course_id)
+    await db_session.commit()
+
+    assert row.user_exists and row.course_exists
+    assert row.unsubscribed == 0
+    assert await counters(db_session, course_id, owner_id) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_unsubscribe_decrements_subscribers(db_session):
+    user_id, course_id, owner_id = await make_course(db_session, make_user())
+    dal = SubscriptionDAL(db_session)
+
+    await dal.subscribe(user_id, course_id)
+    row = await dal.unsubscribe(user_id, course_id)
+    await db_session.commit()
+
+    assert row.unsubscribed == 1
+    subscribers, _ = await counters(db_session, course_id, owner_id)
+    assert subscribers == 0
@@ -0,0 +1,69 @@
+"""Recompute the denormalized counter columns in bulk.
+
+The counters are kept up to date incrementally by the writes that change
+them. This job is the safety net: each counter is recomputed with a single
+``UPDATE ... FROM (SELECT ... GROUP BY)`` that only touches rows whose
+stored value drifted.
+
+Usage::
+
+    python -m app.users.counters
+"""
+import asyncio
+
+from sqlalchemy import func, update
+from sqlalchemy.future import select
+
+from app.courses.models import Course
+from app.database import async_session
+from app.users.models import User, user_courses_association, user_following
+
+
+def recount(table, column, child_key):
+    """Build ``UPDATE table SET column = count(child_key)`` for drifted rows."""
+    parent = table.alias()
+    counts = (
+        select(parent.c.id, func.count(child_key).label("total"))
+        .select_from(parent.outerjoin(child_key.table, child_key == parent.c.id))
+        .group_by(parent.c.id)
+        .subquery()
+    )
+    return (
+        update(table)
+        .where(table.c.id == counts.c.id, column != counts.c.total)
+        .values({column.name: counts.c.total})
+    )
+
+
+def counter_statements():
+    users = User.__table__
+    courses = Course.__table__
+    return {
+        "courses_count": recount(users, users.c.courses_count, courses.c.user_id),
+        "followers_count": recount(
+            users, users.c.followers_count, user_following.c.following_id
+        ),
+        "following_count": recount(
+            users, users.c.following_count, user_following.c.user_id
+        ),
+        "subscribers_count": recount(
+            courses,
+            courses.c.subscribers_count,
+            user_courses_association.c.Course_id,
+        ),
+    }
+
+
+async def repair_counters():
+    """Return how many rows were corrected per counter."""
+    fixed = {}
+    async with async_session() as session:
+        async with session.begin():
+            for name, statement in counter_statements().items():
+                result = await session.execute(statement)
+                fixed[name] = result.rowcount
+    return fixed
+
+
+if __name__ == "__main__":
+    print(asyncio.run(repair_counters()))
@@ -1,15 +1,24 @@
-from app.config import MIDDLEWARE_URL_GET_POSTS_COUNT
-import requests
-
-# def get_posts_count():
-#     url = f'{MIDDLEWARE_URL_GET_POSTS_COUNT}'
-#     try:
-#         response = requests.get(url=url, timeout=8)
-#     except requests.exceptions.ConnectionError as e:
-#         return {'Ошибка': e}
-#     except Exception as e:
-#         return {'Ошибка': e}
-#     return response.json()
-#
-#
-# user_posts_count = {}
+from redis_conf.redis import redis_cache
+
+USER_COUNTERS = ("posts_count",)
+
+
+async def load_user_counters(users):
+    """Attach the Redis-only counters to users in one pipelined round trip.
+
+    Works both on ORM users and on already built ``UserOut`` models, so it
+    can be called on a page returned by ``paginate``.
+    """
+    users_by_id = {}
+    for user in users:
+        if user is not None:
+            users_by_id.setdefault(user.id, []).append(user)
+    if not users_by_id:
+        return
+    rows = await redis_cache.hmget_many(
+        [f"user:{user_id}" for user_id in users_by_id], USER_COUNTERS
+    )
+    for same_users, values in zip(users_by_id.values(), rows):
+        for user in same_users:
+            for name, value in zip(USER_COUNTERS, values):
+                setattr(user, name, int(value) if value else 0)
@@ -10,35 +10,51 @@ from sqlalchemy import (
     Table,
     Text,
     Enum,
-    select,
+    Index,
     func,
 )
-from sqlalchemy.orm import relationship, column_property, backref
+from sqlalchemy.orm import relationship, backref
 from app.database import Base
-from redis_conf.redis import redis_pub
 from app.users.enums import Gender
-from sqlalchemy import text
 
 
 user_achievements_association = Table(
     'user-achievements',
     Base.metadata,
-    Column('User_id', GUID, ForeignKey('Users.id')),
-    Column('Achievement_id', Integer, ForeignKey('Achievements.id')),
+    Column('User_id', GUID, ForeignKey('Users.id'), primary_key=True),
+    Column(
+        'Achievement_id',
+        Integer,
+        ForeignKey('Achievements.id'),
+        primary_key=True,
+        index=True,
+    ),
 )
 
 user_courses_association = Table(
     'user-courses',
     Base.metadata,
-    Column('User_id', GUID, ForeignKey('Users.id')),
-    Column('Course_id', Integer, ForeignKey('Courses.id')),
+    Column('User_id', GUID, ForeignKey('Users.id'), primary_key=True),
+    Column(
+        'Course_id',
+        Integer,
+        ForeignKey('Courses.id'),
+        primary_key=True,
+        index=True,
+    ),
 )
 
 graduated_user_courses_association = Table(
     'user-courses-graduated',
     Base.metadata,
-    Column('User_id', GUID, ForeignKey('Users.id')),
-    Column('Course_id', Integer, ForeignKey('Courses.id')),
+    Column('User_id', GUID, ForeignKey('Users.id'), primary_key=True),
+    Column(
+        'Course_id',
+        Integer,
+        ForeignKey('Courses.id'),
+        primary_key=True,
+        index=True,
+    ),
 )
 
 
@@ -93,11 +109,11 @@ class User(Base, SQLAlchemyBaseUserTable):
         secondaryjoin=lambda: User.id == user_following.c.following_id,
         backref='followers',
     )
-    courses_count = column_property(
-        select(
-            text('count(*) from "Courses" where "Courses".user_id="Users".id')
-        ).scalar_subquery()
-    )
+    # Maintained incrementally by the writes that change them; see
+    # app.users.counters for the bulk repair job.
+    courses_count = Column(Integer, nullable=False, default=0, server_default='0')
+    followers_count = Column(Integer, nullable=False, default=0, server_default='0')
+    following_count = Column(Integer, nullable=False, default=0, server_default='0')
 
     def __init__(
         self,
@@ -132,26 +148,21 @@ class User(Base, SQLAlchemyBaseUserTable):
     def is_followed(self, value):
         self._is_followed = value
 
+    # posts_count lives in Redis and is attached in bulk by
+    # app.users.helper_functions.load_user_counters before serialization.
     @property
     def posts_count(self):
-        count = redis_pub.hget(f"user:{self.id}", "posts_count")
-        if count:
-            return int(count)
-        return 0
+        return getattr(self, '_posts_count', 0)
 
-    @property
-    def followers_count(self):
-        count = redis_pub.hget(f"user:{self.id}", "followers_count")
-        if count:
-            return int(count)
-        return 0
+    @posts_count.setter
+    def posts_count(self, value):
+        self._posts_count = value
 
-    @property
-    def following_count(self):
-        count = redis_pub.hget(f"user:{self.id}", "following_count")
-        if count:
-            return int(count)
-        return 0
+
+# Login matches username or email case-insensitively; see
+# app.auth.user_database.login_query.
+Index('ix_Users_lower_username', func.lower(User.username))
+Index('ix_Users_lower_email', func.lower(User.email))
 
 
 user_following = Table(
@@ -6,6 +6,10 @@ from .models import User
 from sqlalchemy.orm import selectinload
 from app.database import get_db, async_session as session
 from app.courses.models import Course
+from app.achievements.models import Achievement
+from app.dal import paginate_relationship
+from app.auth.principal_cache import principal_cache
+from app.cache import response_cache
 from fastapi_users.password import get_password_hash
 from .enums import Gender
 from sqlalchemy.sql.expression import exists
@@ -29,27 +33,47 @@ class UserDAL:
         )
         return user.scalars().first()
 
-    async def get_user_followers(self, user_id):
-        user = await self.db_session.execute(
-            select(User)
-            .options(selectinload(User.followers))
-            .filter(User.id == user_id)
+    async def check_user(self, user_id):
+        q = await self.db_session.execute(
+            exists(select(User.id).filter_by(id=user_id)).select()
         )
-        return user.scalars().first()
+        return q.scalar()
 
-    async def get_user_following(self, user_id):
-        user = await self.db_session.execute(
-            select(User)
-            .options(selectinload(User.following))
-            .filter(User.id == user_id)
+    async def get_user_achievements_page(self, user_id, title: Optional[str]):
+        criteria = [Achievement.title.like(f'{title}%')] if title else []
+        return await paginate_relationship(
+            self.db_session, User.achievements, user_id, *criteria
         )
-        return user.scalars().first()
 
-    async def get_user_courses(self, user_id):
-        user = await self.db_session.execute(
-            select(User).options(selectinload(User.courses)).filter(User.id == user_id)
+    async def get_user_followers_page(self, user_id, username: Optional[str]):
+        criteria = [User.username.like(f'{username}%')] if username else []
+        return await paginate_relationship(
+            self.db_session, User.followers, user_id, *criteria
+        )
+
+    async def get_user_following_page(self, user_id, username: Optional[str]):
+        criteria = [User.username.like(f'{username}%')] if username else []
+        return await paginate_relationship(
+            self.db_session, User.following, user_id, *criteria
+        )
+
+    async def get_user_courses_page(self, user_id, title: Optional[str]):
+        criteria = [Course.title.like(f'{title}%')] if title else []
+        return await paginate_relationship(
+            self.db_session,
+            User.courses,
+            user_id,
+            *criteria,
+            options=[selectinload(Course.user)],
+        )
+
+    async def get_subscribed_courses_page(self, user_id):
+        return await paginate_relationship(
+            self.db_session,
+            User.subscribed_courses,
+            user_id,
+            options=[selectinload(Course.user)],
         )
-        return user.scalars().first()
 
     async def get_user_by_username(self, username):
         user = await self.db_session.execute(
@@ -58,23 +82,18 @@ class UserDAL:
         return user.scalars().first()
 
     async def get_users(self, username):
-        users = await self.db_session.execute(select(User))
-        users.unique()
+        users = select(User).order_by(User.id)
         if username:
-            users = await self.db_session.execute(
-                select(User).filter(User.username.like(f'{username}%'))
-            )
-            users.unique()
-        return users.scalars().all()
+            users = users.filter(User.username.like(f'{username}%'))
+        return users
 
     async def get_popular_authors(self):
-        users = await self.db_session.execute(
+        users = (
             select(User)
             .filter(User.is_author == True)
-            .order_by(desc(User.sold_courses))
+            .order_by(desc(User.sold_courses), User.id)
         )
-        users.unique()
-        return users.scalars().all()
+        return users
 
     async def update_user(
         self,
@@ -110,12 +129,16 @@ class UserDAL:
             q = q.values(birth_date=birth_date)
         q.execution_options(synchronize_session="fetch")
         await self.db_session.execute(q)
+        response_cache.invalidate_on_commit(self.db_session, "popular_authors")
+        principal_cache.invalidate_on_commit(self.db_session, user_id)
         user = await self.get_user(user_id)
         return user
 
     async def delete_user(self, user_id):
         stmt = delete(User).where(User.id == user_id)
         await self.db_session.execute(stmt)
+        response_cache.invalidate_on_commit(self.db_session, "popular_authors")
+        principal_cache.invalidate_on_commit(self.db_session, user_id)
 
     async def get_courses(self, user_id):
         stmt = (
@@ -126,14 +149,6 @@ class UserDAL:
         )
         return stmt
 
-    async def get_user_with_sub_course(self, user_id):
-        stmt = await self.db_session.execute(
-            select(User)
-            .options(selectinload(User.subscribed_courses))
-            .where(User.id == user_id)
-        )
-        return stmt.scalars().first()
-
     async def get_deleted_courses(self, user_id):
         stmt = (
             select(Course)
@@ -148,6 +163,8 @@ class UserDAL:
         q = q.values(is_author=is_author)
         q.execution_options(synchronize_session="fetch")
         await self.db_session.execute(q)
+        response_cache.invalidate_on_commit(self.db_session, "popular_authors")
+        principal_cache.invalidate_on_commit(self.db_session, user_id)
 
     async def create_superuser(self):
         new_user = User(
@@ -4,7 +4,6 @@ from typing import Any, Optional
 from fastapi import APIRouter, Depends, status
 from fastapi.responses import JSONResponse
 from fastapi_pagination.ext.async_sqlalchemy import paginate
-from fastapi_pagination.paginator import paginate as paginate_list
 from fastapi_users import models as fastapi_model
 from sqlalchemy.ext.asyncio.result import AsyncResult
 from http import HTTPStatus
@@ -18,6 +17,9 @@ from app.pagination import CustomPage as Page
 from . import models, schemas
 from .user_dal import UserDAL
 from .dependencies import get_user_dal
+from .helper_functions import load_user_counters
+from app.cache import response_cache
+from app.config import CACHE_TTL
 from app.follows.follow_dal import FollowDAL
 from app.follows.dependencies import get_follow_dal
 
@@ -30,15 +32,20 @@ async def get_users(
     user_dal: UserDAL = Depends(get_user_dal), username: Optional[str] = None
 ):
     users = await user_dal.get_users(username)
-    return paginate_list(users)
+    page = await paginate(user_dal.db_session, users)
+    await load_user_counters(page.data)
+    return page
 
 
 @router.get(
     "/core/popular_authors", response_model=Page[schemas.UserOut], status_code=200
 )
+@response_cache.cached("popular_authors", CACHE_TTL)
 async def get_popular_authors(user_dal: UserDAL = Depends(get_user_dal)):
     users = await user_dal.get_popular_authors()
-    return paginate_list(users)
+    page = await paginate(user_dal.db_session, users)
+    await load_user_counters(page.data)
+    return page
 
 
 @router.get('/core/user/{user_id}', response_model=schemas.UserOut, status_code=200)
@@ -61,7 +68,7 @@ async def get_user(
         second_user.is_followed = True
     else:
         second_user.is_followed = False
-
+    await load_user_counters([second_user])
     return second_user
 
 
@@ -97,9 +104,8 @@ async def update_user(
     user: fastapi_model.BaseUserDB = Depends(fastapi_users.current_user()),
     user_dal: UserDAL = Depends(get_user_dal),
 ):
-    check_admin = await user_dal.get_user(user.id)
     if user.id != user_id:
-        if check_admin.is_superuser is False:
+        if user.is_superuser is False:
             return JSONResponse(
                 status_code=status.HTTP_403_FORBIDDEN,
                 content={"message": "Запрещено"},
@@ -116,7 +122,7 @@ async def update_user(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"message": "Пользователь не найден"},
         )
-    await user_dal.update_user(
+    user = await user_dal.update_user(
         user_id,
         request.username,
         request.first_name,
@@ -128,7 +134,7 @@ async def update_user(
         request.gender,
         request.birth_date,
     )
-    user = await user_dal.get_user(user_id)
+    await load_user_counters([user])
     return user
 
 
@@ -142,16 +148,12 @@ async def show_user_achievements(
     user_dal: UserDAL = Depends(get_user_dal),
     title: Optional[str] = None,
 ):
-    user = await user_dal.get_user(user_id)
-    if not user:
+    if not await user_dal.check_user(user_id):
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"message": "Пользователь не найден"},
         )
-    if title:
-        filtered_ach = [ach for ach in user.achievements if ach.title.startswith(title)]
-        return paginate_list(filtered_ach)
-    return paginate_list(user.achievements)
+    return await user_dal.get_user_achievements_page(user_id, title)
 
 
 @router.get(
@@ -168,27 +170,20 @@ async def show_user_followers(
     ),
     follow_dal: FollowDAL = Depends(get_follow_dal),
 ):
-    user = await user_dal.get_user_followers(user_id)
-    if not user:
+    if not await user_dal.check_user(user_id):
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"message": "Пользователь не найден"},
         )
+    page = await user_dal.get_user_followers_page(user_id, username)
     if auth_user:
-        for follower in user.followers:
-            follow = await follow_dal.follow_exists(
-                user_id=auth_user.id, second_user_id=follower.id
-            )
-            if follow:
-                follower.is_followed = True
-            else:
-                follower.is_followed = False
-    if username:
-        filtered_users = [
-            ach for ach in user.followers if ach.username.startswith(username)
-        ]
-        return paginate_list(filtered_users)
-    return paginate_list(user.followers)
+        followed = await follow_dal.follow_exists_many(
+            auth_user.id, [follower.id for follower in page.data]
+        )
+        for follower in page.data:
+            follower.is_followed = follower.id in followed
+    await load_user_counters(page.data)
+    return page
 
 
 @router.get(
@@ -205,28 +200,20 @@ async def show_user_following(
     ),
     follow_dal: FollowDAL = Depends(get_follow_dal),
 ):
-    user = await user_dal.get_user_following(user_id)
-    if not user:
+    if not await user_dal.check_user(user_id):
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"message": "Пользователь не найден"},
         )
+    page = await user_dal.get_user_following_page(user_id, username)
     if auth_user:
-        for followings in user.following:
-            follow = await follow_dal.follow_exists(
-                user_id=auth_user.id, second_user_id=followings.id
-            )
-            if follow:
-                followings.is_followed = True
-            else:
-                followings.is_followed = False
-    if username:
-        filtered_users = [
-            ach for ach in user.following if ach.username.startswith(username)
-        ]
-        return paginate_list(filtered_users)
-
-    return paginate_list(user.following)
+        followed = await follow_dal.follow_exists_many(
+            auth_user.id, [followings.id for followings in page.data]
+        )
+        for followings in page.data:
+            followings.is_followed = followings.id in followed
+    await load_user_counters(page.data)
+    return page
 
 
 @router.get(
@@ -237,18 +224,14 @@ async def show_user_courses(
     user_dal: UserDAL = Depends(get_user_dal),
     title: Optional[str] = None,
 ):
-    user = await user_dal.get_user_courses(user_id)
-    if not user:
+    if not await user_dal.check_user(user_id):
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"message": "Пользователь не найден"},
         )
-    if title:
-        filtered_courses = [
-            course for course in user.courses if course.title.startswith(title)
-        ]
-        return paginate_list(filtered_courses)
-    return paginate_list(user.courses)
+    page = await user_dal.get_user_courses_page(user_id, title)
+    await load_user_counters(course.user for course in page.data)
+    return page
 
 
 @router.get('/core/user/courses/my', response_model=Page[MyCourseOut], status_code=200)
@@ -262,7 +245,9 @@ async def show_my_courses(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"message": "Пользователь не найден"},
         )
-    return await paginate(user_dal.db_session, courses)
+    page = await paginate(user_dal.db_session, courses)
+    await load_user_counters(course.user for course in page.data)
+    return page
 
 
 @router.get('/core/user/courses/followed', response_model=Page[MyCourseOut], status_code=200)
@@ -270,14 +255,14 @@ async def show_my_followed_courses(
     user: fastapi_model.BaseUserDB = Depends(fastapi_users.current_user()),
     user_dal: UserDAL = Depends(get_user_dal),
 ):
-    user_with_courses = await user_dal.get_user_with_sub_course(user.id)
     if not user:
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"message": "Пользователь не найден"},
         )
-    print(111111111111111111111111111111111111111111, user_with_courses.subscribed_courses)
-    return paginate_list(user_with_courses.subscribed_courses)
+    page = await user_dal.get_subscribed_courses_page(user.id)
+    await load_user_counters(course.user for course in page.data)
+    return page
 
 
 @router.get(
@@ -293,7 +278,9 @@ async def show_my_deleted_courses(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"message": "Пользователь не найден"},
         )
-    return await paginate(user_dal.db_session, courses)
+    page = await paginate(user_dal.db_session, courses)
+    await load_user_counters(course.user for course in page.data)
+    return page
 
 
 @router.post('/core/user/author/')
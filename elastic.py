@@ -1,7 +1,40 @@
-from elasticsearch import AsyncElasticsearch
-
 from app.config import ELASTIC_HOST, ELASTIC_PORT
 
-es = AsyncElasticsearch(
+
+class LazyElasticsearch:
+    """AsyncElasticsearch client created on first use.
+
+    Importing ``elasticsearch`` (and aiohttp under it) is a noticeable
+    share of worker start-up, so neither the import nor the client happen
+    until a request or a background task needs them. ``close`` runs at
+    shutdown.
+    """
+
+    def __init__(self, hosts, **options):
+        self._hosts = hosts
+        self._options = options
+        self._client = None
+
+    def get(self):
+        if self._client is None:
+            from elasticsearch import AsyncElasticsearch
+
+            from app.monitoring.es_transport import InstrumentedTransport
+
+            self._client = AsyncElasticsearch(
+                self._hosts, transport_class=InstrumentedTransport, **self._options
+            )
+        return self._client
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+    async def close(self):
+        client, self._client = self._client, None
+        if client is not None:
+            await client.close()
+
+
+es = LazyElasticsearch(
     [f'http://{ELASTIC_HOST}:{ELASTIC_PORT}'], ca_certs=False, verify_certs=False
 )
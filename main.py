@@ -6,7 +6,13 @@ from app.achievements import achievements
 from app.auth.auth import setup_users
 from app.categories import categories
 from app.courses import courses
-from app.database import Base, engine
+from app.config import SCHEMA_VERSION_CHECK
+from app.database import engine
+from app.migrate import check_schema_version
+from app.monitoring import monitoring
+from app.monitoring.middleware import RequestContextMiddleware
+from app.monitoring.pools import pool_sampler, sqlalchemy_pool_stats
+from app.monitoring.queries import instrument_engine
 from app.email import email
 from app.file import file
 from app.follows import follows
@@ -15,10 +21,14 @@ from app.lessons import lessons
 from app.content import contents
 from app.middleware import middleware
 from app.additional_functions import additional_function
+from app.search import search
 from app.tags import tags
 from app.users import users
-
-
+from app.http_clients import http_clients
+from app.notifications.worker import notification_worker
+from app.search.indexer import search_indexer
+from app.achievements.worker import achievement_worker
+from elastic import es
 from redis_conf.redis import redis_cache
 
 
@@ -34,6 +44,9 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(RequestContextMiddleware)
+instrument_engine(engine)
+pool_sampler.register("sqlalchemy", lambda: sqlalchemy_pool_stats(engine.pool))
 
 
 setup_users(app)
@@ -51,17 +64,30 @@ app.include_router(file.router)
 app.include_router(middleware.router)
 app.include_router(email.router)
 app.include_router(additional_function.router)
+app.include_router(search.router)
+app.include_router(monitoring.router)
 
 add_pagination(app)
 
 
 @app.on_event("startup")
 async def startup():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    if SCHEMA_VERSION_CHECK:
+        await check_schema_version()
     await redis_cache.init_cache()
+    await http_clients.init()
+    notification_worker.start()
+    search_indexer.start()
+    achievement_worker.start()
+    pool_sampler.start()
 
 
 @app.on_event("shutdown")
 async def shutdown():
-    await redis_cache.wait_closed()
+    await notification_worker.stop()
+    await search_indexer.stop()
+    await achievement_worker.stop()
+    await pool_sampler.stop()
+    await http_clients.close()
+    await es.close()
+    await redis_cache.close()
@@ -0,0 +1,11 @@
+from aioredis import BlockingConnectionPool
+from aioredis.sentinel import SentinelConnectionPool
+
+
+class BlockingSentinelConnectionPool(SentinelConnectionPool, BlockingConnectionPool):
+    """Sentinel-managed pool that waits for a free connection.
+
+    The stock SentinelConnectionPool raises once ``max_connections`` is
+    reached; under load this pool queues callers for up to ``timeout``
+    seconds instead, like BlockingConnectionPool does in direct mode.
+    """
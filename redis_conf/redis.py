@@ -1,84 +1,205 @@
-from typing import Optional
-from app.config import REDIS_HOST, REDIS_PORT, REDIS_PASSWORD
-from aioredis import Redis
-import redis
-import aioredis.sentinel
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
+from app.config import (
+    REDIS_CONNECT_TIMEOUT,
+    REDIS_HEALTH_CHECK_INTERVAL,
+    REDIS_HOST,
+    REDIS_MAX_CONNECTIONS,
+    REDIS_PASSWORD,
+    REDIS_POOL_TIMEOUT,
+    REDIS_PORT,
+    REDIS_READ_FROM_REPLICAS,
+    REDIS_SENTINEL_MASTER,
+    REDIS_SENTINELS,
+    REDIS_SOCKET_TIMEOUT,
+)
 
+if TYPE_CHECKING:
+    from aioredis import Redis
+
+from app.monitoring.instruments import instrument_methods
+
+
+@instrument_methods("redis", exclude=("init_cache", "close"))
 class RedisCache:
-    def __init__(self, password=None):
-        self.redis_cache: Optional[Redis] = None
+    """The application's single async Redis client.
+
+    With ``sentinels`` the master is resolved through Sentinel on every new
+    connection, and a connection that hits a demoted master (READONLY) is
+    dropped, so the pool follows a failover without a restart. Without
+    sentinels it connects to ``host:port`` directly. Both modes use a
+    bounded pool, where callers wait up to ``pool_timeout`` for a free
+    connection, with periodic health checks.
+
+    Cache lookups (``get``, ``hget``, ``hmget_many``) go to a replica when
+    ``read_from_replicas`` is set and may lag the master by the
+    replication delay; everything else goes to the master.
+    """
+
+    def __init__(
+        self,
+        password=None,
+        sentinels: Optional[List[Tuple[str, int]]] = None,
+        service_name: str = "mymaster",
+        host: str = "localhost",
+        port: int = 6379,
+        max_connections: int = 50,
+        pool_timeout: float = 5,
+        socket_timeout: float = 5,
+        connect_timeout: float = 2,
+        health_check_interval: int = 30,
+        read_from_replicas: bool = False,
+    ):
+        self.redis_cache: Optional["Redis"] = None
+        self.replica: Optional["Redis"] = None
         self._password = password
+        self._sentinels = sentinels
+        self._sentinel = None
+        self._service_name = service_name
+        self._host = host
+        self._port = port
+        self._read_from_replicas = read_from_replicas
+        self._options = {
+            "max_connections": max_connections,
+            "timeout": pool_timeout,
+            "socket_timeout": socket_timeout,
+            "socket_connect_timeout": connect_timeout,
+            "health_check_interval": health_check_interval,
+            "retry_on_timeout": True,
+        }
 
     async def init_cache(self):
-
-        sentinel = aioredis.sentinel.Sentinel(
-            [
-                ("sentinel-0.sentinel.default.svc.cluster.local", 5000),
-                ("sentinel-2.sentinel.default.svc.cluster.local", 5000),
-                ("sentinel-1.sentinel.default.svc.cluster.local", 5000),
-            ]
+        import aioredis
+        import aioredis.sentinel
+
+        from redis_conf.pools import BlockingSentinelConnectionPool
+
+        if not self._sentinels:
+            pool = aioredis.BlockingConnectionPool(
+                host=self._host,
+                port=self._port,
+                password=self._password,
+                **self._options,
+            )
+            self.redis_cache = aioredis.Redis(connection_pool=pool)
+            self.replica = self.redis_cache
+            return
+
+        self._sentinel = aioredis.sentinel.Sentinel(
+            self._sentinels,
+            sentinel_kwargs={
+                "socket_timeout": self._options["socket_timeout"],
+                "socket_connect_timeout": self._options["socket_connect_timeout"],
+            },
+        )
+        self.redis_cache = self._sentinel.master_for(
+            self._service_name,
+            connection_pool_class=BlockingSentinelConnectionPool,
+            password=self._password,
+            **self._options,
         )
-        self.redis_cache = sentinel.master_for('mymaster')
+        self.replica = self.redis_cache
+        if self._read_from_replicas:
+            self.replica = self._sentinel.slave_for(
+                self._service_name,
+                connection_pool_class=BlockingSentinelConnectionPool,
+                password=self._password,
+                **self._options,
+            )
+
+    async def ping(self):
+        return await self.redis_cache.ping()
 
     async def keys(self, pattern):
         return await self.redis_cache.keys(pattern)
 
-    async def set(self, key, value):
-        return await self.redis_cache.set(key, value)
+    async def set(self, key, value, ex=None):
+        return await self.redis_cache.set(key, value, ex=ex)
 
-    async def hset(self, name, mapping):
-        return await self.redis_cache.hset(name, mapping=mapping)
+    async def delete(self, *keys):
+        return await self.redis_cache.delete(*keys)
 
-    async def hget(self, name, key):
-        return await self.redis_cache.hget(name, key)
+    async def exists(self, *keys):
+        return await self.redis_cache.exists(*keys)
 
-    async def get(self, key):
-        return await self.redis_cache.get(key)
+    async def expire(self, key, seconds):
+        return await self.redis_cache.expire(key, seconds)
 
-    async def close(self):
-        self.redis_cache.close()
-        await self.redis_cache.wait_closed()
+    async def sadd(self, name, *values):
+        return await self.redis_cache.sadd(name, *values)
+
+    async def smembers(self, name):
+        return await self.redis_cache.smembers(name)
 
+    async def hset(self, name, mapping):
+        return await self.redis_cache.hset(name, mapping=mapping)
 
-redis_cache = RedisCache(password=REDIS_PASSWORD)
+    async def hgetall(self, name):
+        return await self.redis_cache.hgetall(name)
 
+    async def hget(self, name, key):
+        return await self.replica.hget(name, key)
 
-class RedisPublisher:
-    def __init__(self, host='redis', port=6380, password=None, username="default"):
-        self._host = host
-        self._port = port
-        self._password = password
-        self._username = username
-        self._conn = self.init_redis_connection()
-
-    def init_redis_connection(self):
-        """Initialize redis_conf connection"""
-        return redis.Redis(
-            host=self._host,
-            port=self._port,
-            password=self._password,
-            username=self._username,
-        )
+    async def get(self, key):
+        return await self.replica.get(key)
 
-    def keys(self, pattern):
-        return self._conn.keys(pattern)
+    async def hmget_many(self, names, keys):
+        async with self.replica.pipeline(transaction=False) as pipe:
+            for name in names:
+                pipe.hmget(name, *keys)
+            return await pipe.execute()
 
-    def set(self, key, value):
-        return self._conn.set(key, value)
+    async def xadd(self, name, fields, maxlen=None):
+        return await self.redis_cache.xadd(
+            name, fields, maxlen=maxlen, approximate=True
+        )
 
-    def hset(self, name, mapping):
-        return self._conn.hset(name, mapping=mapping)
+    async def xgroup_create(self, name, groupname, id="$", mkstream=False):
+        return await self.redis_cache.xgroup_create(
+            name, groupname, id=id, mkstream=mkstream
+        )
 
-    def hget(self, name, key):
-        return self._conn.hget(name, key)
+    async def xreadgroup(
+        self, groupname, consumername, streams, count=None, block=None
+    ):
+        return await self.redis_cache.xreadgroup(
+            groupname, consumername, streams, count=count, block=block
+        )
 
-    def get(self, key):
-        return self._conn.get(key)
+    async def xack(self, name, groupname, *ids):
+        return await self.redis_cache.xack(name, groupname, *ids)
 
-    def __del__(self):
-        """Disconnect"""
-        return self._conn.connection_pool.disconnect()
+    async def xpending_range(self, name, groupname, min, max, count):
+        return await self.redis_cache.xpending_range(name, groupname, min, max, count)
 
+    async def xclaim(
+        self, name, groupname, consumername, min_idle_time, message_ids
+    ):
+        return await self.redis_cache.xclaim(
+            name, groupname, consumername, min_idle_time, message_ids
+        )
 
-redis_pub = RedisPublisher(host=REDIS_HOST, port=REDIS_PORT, password=REDIS_PASSWORD)
+    async def close(self):
+        clients = {id(client): client for client in (self.redis_cache, self.replica)}
+        if self._sentinel is not None:
+            clients.update((id(client), client) for client in self._sentinel.sentinels)
+        self.redis_cache = self.replica = self._sentinel = None
+        for client in clients.values():
+            if client is not None:
+                await client.close()
+                await client.connection_pool.disconnect()
+
+
+redis_cache = RedisCache(
+    password=REDIS_PASSWORD,
+    sentinels=REDIS_SENTINELS,
+    service_name=REDIS_SENTINEL_MASTER,
+    host=REDIS_HOST,
+    port=int(REDIS_PORT),
+    max_connections=REDIS_MAX_CONNECTIONS,
+    pool_timeout=REDIS_POOL_TIMEOUT,
+    socket_timeout=REDIS_SOCKET_TIMEOUT,
+    connect_timeout=REDIS_CONNECT_TIMEOUT,
+    health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+    read_from_replicas=REDIS_READ_FROM_REPLICAS,
+)